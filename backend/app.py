@@ -1,12 +1,36 @@
 # app.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
-from routers import pokemon, etl_pipeline, pokemon_analysis
+from routers import pokemon, etl_pipeline, pokemon_analysis, matchups
+from routers.responses import FastJSONResponse
+from routers.single_flight import coalescer
+from middleware import CompressionMiddleware
+from data_processing.replica import refresh_replica
+from constants import COMPRESSION_MINIMUM_SIZE, COMPRESSION_LEVEL, DATABASE_FILE
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the in-memory read replica before the first request (replica mode only)
+    refresh_replica(DATABASE_FILE)
+    yield
 
 
 # Create FastAPI instance
-app = FastAPI(title="Pokelytics Backend API")
+app = FastAPI(
+    title="Pokelytics Backend API",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+
+# Negotiate Brotli/gzip compression for larger responses
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    level=COMPRESSION_LEVEL
+)
 
 # Configure CORS
 app.add_middleware(
@@ -17,15 +41,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(pokemon.router)
 app.include_router(etl_pipeline.router)
 app.include_router(pokemon_analysis.router)
+app.include_router(matchups.router)
+# Included last: its "/pokemon/{name_or_id}" route would shadow the others
+app.include_router(pokemon.router)
 
 # Root endpoint
 @app.get("/")
 def read_root():
     return {"message": "Hello, FastAPI! AI Agent is ready."}
 
+# Request coalescing counters per endpoint
+@app.get("/metrics/single-flight")
+def single_flight_metrics():
+    return {"endpoints": coalescer.metrics(), "in_flight": coalescer.in_flight()}
+
 # Run the application
 if __name__ == "__main__":
     uvicorn.run(
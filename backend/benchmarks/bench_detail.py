@@ -0,0 +1,45 @@
+# benchmarks/bench_detail.py
+"""
+Compare the latency of a single detail lookup with a batch lookup.
+
+Usage (from backend/):
+    python -m benchmarks.bench_detail --pokemon 1000 --batch 100
+"""
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+from benchmarks.bench_responses import build_database
+from data_processing.detail import fetch_pokemon_document, fetch_pokemon_documents
+from data_processing.load import create_connection
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pokemon", type=int, default=1000, help="number of synthetic Pokémon")
+    parser.add_argument("--batch", type=int, default=100, help="ids per batch lookup")
+    parser.add_argument("--repeat", type=int, default=50, help="timing repetitions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        build_database(db_file, args.pokemon)
+        conn = create_connection(db_file)
+
+        rng = random.Random(1)
+        ids = rng.sample(range(1, args.pokemon + 1), args.batch)
+
+        single = min(timeit.repeat(lambda: fetch_pokemon_document(conn, str(ids[0])), number=1, repeat=args.repeat))
+        batch = min(timeit.repeat(lambda: fetch_pokemon_documents(conn, ids), number=1, repeat=args.repeat))
+        loop = min(timeit.repeat(lambda: [fetch_pokemon_document(conn, str(i)) for i in ids], number=1, repeat=5))
+        conn.close()
+
+    print(f"single lookup            : {single * 1e3:8.2f} ms")
+    print(f"batch of {args.batch:<4} (1 query)  : {batch * 1e3:8.2f} ms")
+    print(f"{args.batch:<4} single lookups (N+1): {loop * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
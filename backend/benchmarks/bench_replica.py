@@ -0,0 +1,100 @@
+# benchmarks/bench_replica.py
+"""
+Compare per-request read latency against the database file and against
+the in-memory replica under concurrent load.
+
+Each simulated request does what a read route does: open a read
+connection, run its query, close. Requests are spread over a thread pool,
+and the percentiles are of per-request wall time.
+
+Usage (from backend/):
+    python -m benchmarks.bench_replica --pokemon 1000 --requests 2000 --threads 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmarks.bench_responses import build_database, TYPES
+from data_processing.documents import get_pokemon_document
+from data_processing.replica import read_connection, refresh_replica
+
+FILTER_QUERY = """
+    SELECT DISTINCT p.name, s_hp.base_stat AS hp
+    FROM pokemon p
+    LEFT JOIN pokemon_stats s_hp ON p.id = s_hp.pokemon_id AND s_hp.stat_name = 'hp'
+    LEFT JOIN pokemon_types pt ON p.id = pt.pokemon_id
+    WHERE s_hp.base_stat >= ? AND pt.type_name = ?
+    ORDER BY p.id
+"""
+
+
+def run_load(db_file: str, requests: int, threads: int, pokemon: int) -> np.ndarray:
+    rng = random.Random(3)
+    work = [
+        ("detail", str(rng.randint(1, pokemon))) if rng.random() < 0.7
+        else ("filter", (rng.randint(20, 120), rng.choice(TYPES)))
+        for _ in range(requests)
+    ]
+
+    def request(item):
+        kind, argument = item
+        start = time.perf_counter()
+        conn = read_connection(db_file)
+        try:
+            if kind == "detail":
+                get_pokemon_document(conn, argument)
+            else:
+                conn.execute(FILTER_QUERY, argument).fetchall()
+        finally:
+            conn.close()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return np.array(list(executor.map(request, work)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pokemon", type=int, default=1000, help="number of synthetic Pokémon")
+    parser.add_argument("--requests", type=int, default=2000, help="simulated requests per mode")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent request threads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        build_database(db_file, args.pokemon)
+
+        results = {}
+        with patch("data_processing.replica.READ_REPLICA", False):
+            run_load(db_file, 100, args.threads, args.pokemon)  # warm the page cache
+            started = time.perf_counter()
+            results["file"] = (run_load(db_file, args.requests, args.threads, args.pokemon),
+                               time.perf_counter() - started)
+
+        with patch("data_processing.replica.READ_REPLICA", True):
+            copy_started = time.perf_counter()
+            refresh_replica(db_file)
+            copy_ms = (time.perf_counter() - copy_started) * 1e3
+            run_load(db_file, 100, args.threads, args.pokemon)
+            started = time.perf_counter()
+            results["in-memory"] = (run_load(db_file, args.requests, args.threads, args.pokemon),
+                                    time.perf_counter() - started)
+
+    print(f"{args.requests} requests on {args.threads} threads, {args.pokemon} Pokémon "
+          f"(replica copy took {copy_ms:.1f} ms)")
+    header = f"{'mode':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for mode, (latencies, elapsed) in results.items():
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1e3
+        print(f"{mode:<12}{p50:>9.3f}{p95:>9.3f}{p99:>9.3f}{len(latencies) / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
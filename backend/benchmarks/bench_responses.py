@@ -0,0 +1,115 @@
+# benchmarks/bench_responses.py
+"""
+Micro-benchmark of JSON encode time and wire bytes per read endpoint.
+
+Builds a synthetic database, fetches every endpoint once, then measures:
+  - encode time of the decoded payload with stdlib json vs orjson
+  - response size uncompressed, gzip and Brotli
+
+Usage (from backend/):
+    python -m benchmarks.bench_responses --pokemon 1000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from app import app
+from constants import COMPRESSION_LEVEL
+from data_processing.load import create_connection, create_tables, load_pokemons
+from data_processing.snapshots import start_etl_run, materialize_analysis_snapshot
+from routers.responses import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENDPOINTS = [
+    "/pokemon/",
+    "/pokemon/filter_pokemons",
+    "/pokemon/filter_pokemons?type_name=fire&hp_min=50",
+    "/pokemon/analysis",
+    "/pokemon/analysis/moves_frequency",
+]
+
+TYPES = ["normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison", "ground",
+         "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy"]
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+
+def build_database(path: str, count: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    moves = [f"move-{i}" for i in range(600)]
+    abilities = [f"ability-{i}" for i in range(250)]
+
+    conn = create_connection(path)
+    create_tables(conn)
+    for pokemon_id in range(1, count + 1):
+        load_pokemons(conn, {
+            "main": {"id": pokemon_id, "name": f"pokemon-{pokemon_id}", "is_evolved": rng.random() < 0.5},
+            "types": rng.sample(TYPES, rng.choice([1, 2])),
+            "abilities": rng.sample(abilities, rng.randint(1, 3)),
+            "moves": rng.sample(moves, rng.randint(20, 90)),
+            "stats": [{"stat_name": s, "base_stat": rng.randint(20, 160)} for s in STATS],
+        })
+    materialize_analysis_snapshot(conn, start_etl_run(conn))
+    conn.close()
+
+
+def measure(client: TestClient, url: str, repeat: int) -> dict:
+    body = client.get(url, headers={"Accept-Encoding": "identity"}).content
+    payload = json.loads(body)
+
+    def stdlib():
+        json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")
+
+    def fast():
+        dumps(payload)
+
+    return {
+        "url": url,
+        "stdlib_us": min(timeit.repeat(stdlib, number=1, repeat=repeat)) * 1e6,
+        "orjson_us": min(timeit.repeat(fast, number=1, repeat=repeat)) * 1e6,
+        "raw_bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, COMPRESSION_LEVEL)),
+        "br_bytes": len(brotli.compress(body, quality=COMPRESSION_LEVEL)) if brotli else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pokemon", type=int, default=1000, help="number of synthetic Pokémon")
+    parser.add_argument("--repeat", type=int, default=50, help="timing repetitions per endpoint")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "bench.db")
+        build_database(db_file, args.pokemon)
+
+        with patch("routers.pokemon.DATABASE_FILE", db_file), \
+                patch("routers.pokemon_analysis.DATABASE_FILE", db_file):
+            client = TestClient(app)
+            results = [measure(client, url, args.repeat) for url in ENDPOINTS]
+
+    header = f"{'endpoint':<52}{'json µs':>10}{'orjson µs':>11}{'raw B':>10}{'gzip B':>9}{'br B':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        br = r["br_bytes"] if r["br_bytes"] is not None else "n/a"
+        print(f"{r['url']:<52}{r['stdlib_us']:>10.1f}{r['orjson_us']:>11.1f}"
+              f"{r['raw_bytes']:>10}{r['gzip_bytes']:>9}{br:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,43 @@ POKEAPI_BASE_URL = "https://pokeapi.co/api/v2"
 POKEMON_ENDPOINT = "pokemon"
 SPECIES_ENDPOINT = "pokemon-species"
 EVOLUTION_CHAIN_ENDPOINT = "evolution-chain"
+TYPE_ENDPOINT = "type"
+MOVE_ENDPOINT = "move"
+ABILITY_ENDPOINT = "ability"
 API_DELAY = 0.5          
 DATABASE_FILE = "db/pokemon_database.db"
 POKEMON_TO_FETCH = 10           
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
-LOG_LEVEL = "INFO"
\ No newline at end of file
+LOG_LEVEL = "INFO"
+COMPRESSION_MINIMUM_SIZE = 500    # bytes; smaller responses are sent uncompressed
+COMPRESSION_LEVEL = 6
+BATCH_MAX_IDS = 100                # maximum ids per POST /pokemon/batch request
+DOCUMENT_COMPRESSION = None        # None or "gzip"; encoding of stored pokemon_documents
+EXPORT_CHUNK_SIZE = 500            # rows fetched and streamed per export chunk
+MINHASH_PERMUTATIONS = 128         # hash functions per move-set MinHash sketch
+LSH_BANDS = 32                     # LSH bands per sketch (4 rows each, ~0.42 Jaccard threshold)
+MOVESET_PAIR_THRESHOLD = 0.6       # minimum Jaccard stored by the all-pairs job
+TEAM_SIZE = 6
+TEAM_SEARCH_WORKERS = 4            # processes used by the team coverage search
+TEAM_SEARCH_NODE_LIMIT = 500_000   # partial teams each search worker explores before giving up on exhaustiveness
+CRAWLER_WORKERS = 8                # threads fetching move/ability details
+CRAWLER_RATE_LIMIT = 10            # requests per second across all crawler threads
+COOCCURRENCE_MIN_SUPPORT = 0.25    # share of Pokémon an itemset needs to count as frequent
+COOCCURRENCE_TOP_N = 20            # pairs / itemsets kept per co-occurrence graph
+COOCCURRENCE_MAX_ITEMSET = 4       # largest itemset mined by FP-growth
+CLUSTER_COUNT = 6                  # k of the stat archetype k-means clustering
+CLUSTER_SEED = 42                  # fixed seed so every ETL run clusters identically
+CLUSTER_MAX_ITERATIONS = 100       # Lloyd iterations before k-means stops without converging
+ETL_BLUE_GREEN = False             # default ETL mode: build into a separate file and swap it in
+READ_REPLICA = False               # serve read requests from an in-memory copy of the database
+SHARED_CACHE = False               # share precomputed read data across worker processes via an mmap file
+STATS_SNAPSHOT = True              # also write the stats as a memory-mappable .npy snapshot next to the database
+ANALYSIS_MAX_STALENESS = 60        # seconds a superseded analysis body may still be served while it is recomputed (0 disables)
+ANALYSIS_WARM_ON_ETL = True        # re-render every analysis graph in the background after an ETL run
+ANALYSIS_WORKERS = 6               # threads computing the dashboard graphs in parallel, each on its own connection (1 = serial)
+ANALYSIS_LRU_SIZE = 256            # filtered / top_n analysis bodies kept, least recently used evicted first
+SKETCH_ANALYTICS = False           # loader maintains Count-Min / Space-Saving / HyperLogLog sketches for approx=true analysis
+SKETCH_CMS_WIDTH = 2048            # Count-Min counters per row (overcount <= e / width of all pairs)
+SKETCH_CMS_DEPTH = 4               # Count-Min rows (bound fails with probability e^-depth)
+SKETCH_TOP_K = 256                 # Space-Saving counters per frequency graph
+SKETCH_HLL_PRECISION = 12          # HyperLogLog uses 2^precision registers (~1.6% relative error)
@@ -1,24 +1,134 @@
+import os
 import sqlite3
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from collections import Counter
 
+from data_processing.cache import get_dataset_generation
+from constants import ANALYSIS_WORKERS
 
-def get_pokemon_stats_average(conn) -> Dict[str, float]:
+
+# Stats a scope can restrict by range
+SCOPE_STATS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+# Graphs that take a top_n, with the number of entries they show by default
+DEFAULT_TOP_N = {"abilities_frequency": 10, "moves_frequency": 15}
+
+
+def parse_stat_range(value: str) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Parse a "stat:min:max" range, e.g. "hp:50:100", "speed:100:" or
+    "attack::60"; either bound may be left empty, but not both.
+    Raises ValueError for unknown stats or malformed bounds.
+    """
+    parts = value.split(":")
+    if len(parts) != 3:
+        raise ValueError(f"Invalid stat range '{value}', expected stat:min:max")
+    stat_name, low, high = parts[0].lower(), parts[1].strip(), parts[2].strip()
+    if stat_name not in SCOPE_STATS:
+        raise ValueError(f"Unknown stat '{parts[0]}' in stat range. Valid stats: {', '.join(SCOPE_STATS)}")
+    try:
+        low = int(low) if low else None
+        high = int(high) if high else None
+    except ValueError:
+        raise ValueError(f"Invalid bounds in stat range '{value}'")
+    if low is None and high is None:
+        raise ValueError(f"Stat range '{value}' has no bounds")
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"Stat range '{value}' has min above max")
+    return stat_name, low, high
+
+
+def analysis_scope(type_name: str = None, is_evolved: bool = None, stat_ranges=()) -> Optional[tuple]:
+    """
+    Normalized, hashable description of the Pokémon an analysis covers:
+    those of one type, of one evolution status and with stats inside the
+    given parse_stat_range ranges. None when nothing is restricted.
+    """
+    ranges = tuple(sorted(set(stat_ranges), key=repr))
+    if not type_name and is_evolved is None and not ranges:
+        return None
+    return type_name.lower() if type_name else None, is_evolved, ranges
+
+
+def _scope_where(scope: Optional[tuple], column: str = "pokemon_id", keyword: str = "WHERE") -> Tuple[str, list]:
+    """
+    SQL condition (prefixed with keyword) restricting column, a Pokémon id,
+    to the scope, with its parameters. Empty for the unrestricted scope.
     """
-    Calculate average stats across all Pokémon for the radar chart.
+    if scope is None:
+        return "", []
+
+    type_name, is_evolved, ranges = scope
+    conditions, params = [], []
+    if type_name:
+        conditions.append("SELECT pokemon_id FROM pokemon_types WHERE type_name = ?")
+        params.append(type_name)
+    if is_evolved is not None:
+        conditions.append("SELECT id FROM pokemon WHERE is_evolved = ?")
+        params.append(1 if is_evolved else 0)
+    for stat_name, low, high in ranges:
+        bounds = "".join((" AND base_stat >= ?" if low is not None else "", " AND base_stat <= ?" if high is not None else ""))
+        conditions.append(f"SELECT pokemon_id FROM pokemon_stats WHERE stat_name = ?{bounds}")
+        params.extend(value for value in (stat_name, low, high) if value is not None)
+
+    return f"{keyword} " + " AND ".join(f"{column} IN ({sql})" for sql in conditions), params
+
+
+def _read_counter_table(cursor, table: str, key: str, top_n: int = -1) -> List[tuple]:
+    """
+    Read (name, count) rows from a trigger-maintained counter table,
+    most frequent first. An empty result means the counters are not populated,
+    or that the table does not exist in a database built before them.
+    """
+    try:
+        cursor.execute(
+            f"SELECT {key}, count FROM {table} WHERE count > 0 ORDER BY count DESC, {key} LIMIT ?",
+            (top_n,)
+        )
+        return cursor.fetchall()
+    except sqlite3.OperationalError:
+        return []
+
+
+def _read_stat_sums(cursor) -> List[tuple]:
+    """
+    Read (stat_name, average) rows from the trigger-maintained stat_sums table;
+    empty if it is not populated or does not exist.
+    """
+    try:
+        cursor.execute("SELECT stat_name, CAST(total AS REAL) / count FROM stat_sums WHERE count > 0")
+        return cursor.fetchall()
+    except sqlite3.OperationalError:
+        return []
+
+
+def get_pokemon_stats_average(conn, scope: tuple = None) -> Dict[str, float]:
+    """
+    Calculate average stats across all Pokémon (or those in scope) for the radar chart.
     Returns dict with stat names and their average values.
+    Reads the trigger-maintained stat_sums table, falling back to a full scan.
     """
     if not conn:
         return {}
     
     try:
         cursor = conn.cursor()
-        query = """
+        if scope is None:
+            results = _read_stat_sums(cursor)
+            if results:
+                cursor.close()
+                return {row[0]: round(row[1], 2) for row in results}
+
+        where, params = _scope_where(scope)
+        query = f"""
             SELECT stat_name, AVG(base_stat) as avg_stat
             FROM pokemon_stats
+            {where}
             GROUP BY stat_name
         """
-        cursor.execute(query)
+        cursor.execute(query, params)
         results = cursor.fetchall()
         
         stats = {row[0]: round(row[1], 2) for row in results}
@@ -28,23 +138,32 @@ def get_pokemon_stats_average(conn) -> Dict[str, float]:
         return {}
 
 
-def get_type_distribution(conn) -> Dict[str, int]:
+def get_type_distribution(conn, scope: tuple = None) -> Dict[str, int]:
     """
-    Get the count of Pokémon for each type for the pie chart.
+    Get the count of Pokémon (in scope) for each type for the pie chart.
     Returns dict with type names and their counts.
+    Reads the trigger-maintained type_counts table, falling back to a full scan.
     """
     if not conn:
         return {}
     
     try:
         cursor = conn.cursor()
-        query = """
+        if scope is None:
+            results = _read_counter_table(cursor, "type_counts", "type_name")
+            if results:
+                cursor.close()
+                return {row[0]: row[1] for row in results}
+
+        where, params = _scope_where(scope)
+        query = f"""
             SELECT type_name, COUNT(DISTINCT pokemon_id) as count
             FROM pokemon_types
+            {where}
             GROUP BY type_name
             ORDER BY count DESC
         """
-        cursor.execute(query)
+        cursor.execute(query, params)
         results = cursor.fetchall()
         
         distribution = {row[0]: row[1] for row in results}
@@ -54,24 +173,33 @@ def get_type_distribution(conn) -> Dict[str, int]:
         return {}
 
 
-def get_abilities_frequency(conn, top_n: int = 10) -> Dict[str, int]:
+def get_abilities_frequency(conn, top_n: int = DEFAULT_TOP_N["abilities_frequency"], scope: tuple = None) -> Dict[str, int]:
     """
-    Get the most common abilities and their frequency for bar chart.
+    Get the most common abilities (among Pokémon in scope) and their frequency for bar chart.
     Returns dict with ability names and their counts.
+    Reads the trigger-maintained ability_counts table, falling back to a full scan.
     """
     if not conn:
         return {}
     
     try:
         cursor = conn.cursor()
-        query = """
+        if scope is None:
+            results = _read_counter_table(cursor, "ability_counts", "ability_name", top_n)
+            if results:
+                cursor.close()
+                return {row[0]: row[1] for row in results}
+
+        where, params = _scope_where(scope)
+        query = f"""
             SELECT ability_name, COUNT(DISTINCT pokemon_id) as count
             FROM pokemon_abilities
+            {where}
             GROUP BY ability_name
             ORDER BY count DESC
             LIMIT ?
         """
-        cursor.execute(query, (top_n,))
+        cursor.execute(query, (*params, top_n))
         results = cursor.fetchall()
         
         abilities = {row[0]: row[1] for row in results}
@@ -81,24 +209,33 @@ def get_abilities_frequency(conn, top_n: int = 10) -> Dict[str, int]:
         return {}
 
 
-def get_moves_frequency(conn, top_n: int = 15) -> Dict[str, int]:
+def get_moves_frequency(conn, top_n: int = DEFAULT_TOP_N["moves_frequency"], scope: tuple = None) -> Dict[str, int]:
     """
-    Get the most common moves and their frequency for bar chart.
+    Get the most common moves (among Pokémon in scope) and their frequency for bar chart.
     Returns dict with move names and their counts.
+    Reads the trigger-maintained move_counts table, falling back to a full scan.
     """
     if not conn:
         return {}
     
     try:
         cursor = conn.cursor()
-        query = """
+        if scope is None:
+            results = _read_counter_table(cursor, "move_counts", "move_name", top_n)
+            if results:
+                cursor.close()
+                return {row[0]: row[1] for row in results}
+
+        where, params = _scope_where(scope)
+        query = f"""
             SELECT move_name, COUNT(DISTINCT pokemon_id) as count
             FROM pokemon_moves
+            {where}
             GROUP BY move_name
             ORDER BY count DESC
             LIMIT ?
         """
-        cursor.execute(query, (top_n,))
+        cursor.execute(query, (*params, top_n))
         results = cursor.fetchall()
         
         moves = {row[0]: row[1] for row in results}
@@ -108,9 +245,9 @@ def get_moves_frequency(conn, top_n: int = 15) -> Dict[str, int]:
         return {}
 
 
-def get_evolution_stage_distribution(conn) -> Dict[str, int]:
+def get_evolution_stage_distribution(conn, scope: tuple = None) -> Dict[str, int]:
     """
-    Get the count of evolved vs non-evolved Pokémon for pie/bar chart.
+    Get the count of evolved vs non-evolved Pokémon (in scope) for pie/bar chart.
     Returns dict with evolution status and their counts.
     """
     if not conn:
@@ -118,14 +255,16 @@ def get_evolution_stage_distribution(conn) -> Dict[str, int]:
     
     try:
         cursor = conn.cursor()
-        query = """
+        where, params = _scope_where(scope, column="id")
+        query = f"""
             SELECT 
                 CASE WHEN is_evolved = 1 THEN 'Evolved' ELSE 'Not Evolved' END as status,
                 COUNT(*) as count
             FROM pokemon
+            {where}
             GROUP BY is_evolved
         """
-        cursor.execute(query)
+        cursor.execute(query, params)
         results = cursor.fetchall()
         
         distribution = {row[0]: row[1] for row in results}
@@ -135,9 +274,9 @@ def get_evolution_stage_distribution(conn) -> Dict[str, int]:
         return {}
 
 
-def get_type_combination_distribution(conn) -> Dict[str, int]:
+def get_type_combination_distribution(conn, scope: tuple = None) -> Dict[str, int]:
     """
-    Get the count of single-type vs dual-type Pokémon for bar chart.
+    Get the count of single-type vs dual-type Pokémon (in scope) for bar chart.
     Returns dict with type combination counts.
     """
     if not conn:
@@ -145,7 +284,8 @@ def get_type_combination_distribution(conn) -> Dict[str, int]:
     
     try:
         cursor = conn.cursor()
-        query = """
+        where, params = _scope_where(scope)
+        query = f"""
             SELECT 
                 CASE 
                     WHEN type_count = 1 THEN 'Single Type'
@@ -156,12 +296,13 @@ def get_type_combination_distribution(conn) -> Dict[str, int]:
             FROM (
                 SELECT pokemon_id, COUNT(*) as type_count
                 FROM pokemon_types
+                {where}
                 GROUP BY pokemon_id
             )
             GROUP BY combination
             ORDER BY count DESC
         """
-        cursor.execute(query)
+        cursor.execute(query, params)
         results = cursor.fetchall()
         
         distribution = {row[0]: row[1] for row in results}
@@ -171,45 +312,119 @@ def get_type_combination_distribution(conn) -> Dict[str, int]:
         return {}
 
 
-def generate_all_analysis(conn) -> Dict[str, Any]:
+# Title and chart type for every dashboard graph, keyed by graph name.
+GRAPH_METADATA = {
+    "pokemon_stats": {"title": "Average Pokémon Stats", "type": "radar"},
+    "type_distribution": {"title": "Type Distribution", "type": "pie"},
+    "abilities_frequency": {"title": f"Top {DEFAULT_TOP_N['abilities_frequency']} Most Common Abilities", "type": "bar"},
+    "moves_frequency": {"title": f"Top {DEFAULT_TOP_N['moves_frequency']} Most Common Moves", "type": "bar"},
+    "evolution_distribution": {"title": "Evolution Stage Distribution", "type": "pie"},
+    "type_combination": {"title": "Type Combination Distribution", "type": "bar"},
+}
+
+
+# Function computing each dashboard graph from one connection
+GRAPH_FUNCTIONS: Dict[str, Callable] = {
+    "pokemon_stats": get_pokemon_stats_average,
+    "type_distribution": get_type_distribution,
+    "abilities_frequency": get_abilities_frequency,
+    "moves_frequency": get_moves_frequency,
+    "evolution_distribution": get_evolution_stage_distribution,
+    "type_combination": get_type_combination_distribution,
+}
+
+
+def _timed(function: Callable, conn) -> tuple:
+    start = perf_counter()
+    data = function(conn)
+    return data, (perf_counter() - start) * 1000
+
+
+def _compute_graph_on_own_connection(db_file: str, function: Callable) -> tuple:
+    target = db_file if db_file.startswith("file:") else f"file:{db_file}?mode=ro"
+    conn = sqlite3.connect(target, uri=True)
+    try:
+        return _timed(function, conn)
+    finally:
+        conn.close()
+
+
+def _analysis_workers() -> int:
+    # More threads than cores only adds contention to the same total work
+    return min(ANALYSIS_WORKERS, len(GRAPH_FUNCTIONS), os.cpu_count() or 1)
+
+
+def _compute_graphs_parallel(db_file: str, workers: int):
+    """
+    Compute every graph on its own read-only connection, one thread each.
+    sqlite3 releases the GIL while SQLite runs a statement, so the queries
+    overlap. Separate connections cannot share one read transaction, so
+    the dataset generation is compared before and after: if the file was
+    written meanwhile the results may mix two datasets and None is returned.
+    """
+    generation = get_dataset_generation(db_file)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(_compute_graph_on_own_connection, db_file, function)
+                for name, function in GRAPH_FUNCTIONS.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+    except sqlite3.Error:
+        return None
+    if get_dataset_generation(db_file) != generation:
+        return None
+    return results
+
+
+def _compute_graphs_serial(conn) -> Dict[str, tuple]:
+    # One read transaction, so every graph sees the same data
+    began = False
+    if not conn.in_transaction:
+        try:
+            conn.execute("BEGIN")
+            began = True
+        except sqlite3.Error:
+            pass
+    try:
+        return {name: _timed(function, conn) for name, function in GRAPH_FUNCTIONS.items()}
+    finally:
+        if began:
+            conn.rollback()
+
+
+def generate_all_analysis(conn, db_file: str = None, timings: Dict[str, float] = None) -> Dict[str, Any]:
     """
     Generate all analysis data for the dashboard.
     Returns a dictionary with all 6 graph data.
+
+    With db_file (a path or the URI conn was opened with) and more than one
+    worker (ANALYSIS_WORKERS, capped at the CPU count), the graphs are
+    computed in parallel on separate read connections, so the total takes
+    about as long as the slowest graph; otherwise they run one after
+    another on conn. If timings is given, it is filled with each graph's
+    compute time in milliseconds.
     """
     if not conn:
         return {}
     
+    results = None
+    workers = _analysis_workers()
+    if db_file and workers > 1:
+        results = _compute_graphs_parallel(db_file, workers)
+    if results is None:
+        results = _compute_graphs_serial(conn)
+
+    if timings is not None:
+        timings.update({name: elapsed for name, (_, elapsed) in results.items()})
+    
     analysis_data = {
-        "pokemon_stats": {
-            "data": get_pokemon_stats_average(conn),
-            "title": "Average Pokémon Stats",
-            "type": "radar"
-        },
-        "type_distribution": {
-            "data": get_type_distribution(conn),
-            "title": "Type Distribution",
-            "type": "pie"
-        },
-        "abilities_frequency": {
-            "data": get_abilities_frequency(conn, top_n=10),
-            "title": "Top 10 Most Common Abilities",
-            "type": "bar"
-        },
-        "moves_frequency": {
-            "data": get_moves_frequency(conn, top_n=15),
-            "title": "Top 15 Most Common Moves",
-            "type": "bar"
-        },
-        "evolution_distribution": {
-            "data": get_evolution_stage_distribution(conn),
-            "title": "Evolution Stage Distribution",
-            "type": "pie"
-        },
-        "type_combination": {
-            "data": get_type_combination_distribution(conn),
-            "title": "Type Combination Distribution",
-            "type": "bar"
+        name: {
+            "data": data,
+            "title": GRAPH_METADATA[name]["title"],
+            "type": GRAPH_METADATA[name]["type"]
         }
+        for name, (data, _) in results.items()
     }
     
-    return analysis_data
\ No newline at end of file
+    return analysis_data
@@ -0,0 +1,144 @@
+# data_processing/build.py
+import logging
+import os
+import sqlite3
+
+from data_processing.etl import run_etl_pipeline
+from data_processing.shared_cache import build_shared_cache, shared_cache_file_for
+from data_processing.stats_snapshot import move_stats_snapshot, snapshot_paths
+from constants import DATABASE_FILE, SHARED_CACHE, STATS_SNAPSHOT
+
+# Suffix of the file a blue/green build writes next to the live database.
+# It lives in the same directory so the final rename never crosses filesystems.
+BUILD_SUFFIX = ".build"
+
+
+def build_file_for(db_file: str) -> str:
+    return db_file + BUILD_SUFFIX
+
+
+def seed_build_database(live_file: str, build_file: str) -> bool:
+    """
+    Start the build file as a copy of the live database, so incremental ETL
+    steps (type matchups, move/ability details) only fetch what is new.
+    The copy uses SQLite's online backup API, which gives a consistent
+    snapshot while readers keep using the live file.
+    """
+    remove_build_database(build_file)
+    if not os.path.exists(live_file):
+        return True
+
+    source = target = None
+    try:
+        source = sqlite3.connect(f"file:{live_file}?mode=ro", uri=True)
+        target = sqlite3.connect(build_file)
+        source.backup(target)
+        return True
+    except sqlite3.Error:
+        return False
+    finally:
+        for conn in (source, target):
+            if conn:
+                try:
+                    conn.close()
+                except:
+                    pass
+
+
+def verify_database(db_file: str) -> bool:
+    """
+    Refresh the query planner statistics of a freshly built database and
+    check it is fit to serve: integrity_check must pass, no foreign key may
+    dangle and at least one Pokémon must be loaded.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(db_file)
+        conn.execute("ANALYZE")
+        conn.commit()
+        if conn.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+            return False
+        if conn.execute("PRAGMA foreign_key_check").fetchone() is not None:
+            return False
+        return conn.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0] > 0
+    except sqlite3.Error:
+        return False
+    finally:
+        if conn:
+            try:
+                conn.close()
+            except:
+                pass
+
+
+def swap_database(build_file: str, live_file: str) -> None:
+    """
+    Atomically replace the live database with the build file.
+    Connections already open keep reading the old file until they close;
+    every connection opened afterwards sees the new one.
+    """
+    with open(build_file, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(build_file, live_file)
+
+    # Persist the rename itself (not supported on every platform)
+    try:
+        dir_fd = os.open(os.path.dirname(os.path.abspath(live_file)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def remove_build_database(build_file: str) -> None:
+    for path in (build_file, build_file + "-journal", shared_cache_file_for(build_file), *snapshot_paths(build_file)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def run_blue_green_build(db_file: str = DATABASE_FILE) -> bool:
+    """
+    Run the ETL pipeline into a separate build file next to db_file, verify
+    it, and swap it in atomically. The live database is never written, so
+    readers never see a half-loaded dataset; if any step fails the live
+    database stays as it was and the build file is discarded.
+    """
+    build_file = build_file_for(db_file)
+    try:
+        if not seed_build_database(db_file, build_file):
+            logging.error("Failed to copy the live database into the build file.")
+            return False
+
+        if not run_etl_pipeline(build_file):
+            logging.error("ETL build failed; live database left unchanged.")
+            return False
+
+        if not verify_database(build_file):
+            logging.error("Built database failed verification; live database left unchanged.")
+            return False
+
+        swap_database(build_file, db_file)
+        logging.info(f"Swapped freshly built database into {db_file}")
+
+        # The swap changes the dataset generation, so the cache the ETL
+        # built for the build file is of no use; build the live one now
+        if SHARED_CACHE and not build_shared_cache(db_file):
+            logging.warning("Failed to build the shared read cache.")
+        if STATS_SNAPSHOT and not move_stats_snapshot(build_file, db_file):
+            logging.warning("Failed to move the binary stats snapshot next to the live database.")
+        return True
+    except OSError as e:
+        logging.error(f"Failed to swap in the built database: {e}")
+        return False
+    finally:
+        remove_build_database(build_file)
+
+
+if __name__ == "__main__":
+    run_blue_green_build()
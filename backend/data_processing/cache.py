@@ -0,0 +1,142 @@
+import os
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+from constants import DATABASE_FILE
+
+
+def get_dataset_generation(db_file: str = DATABASE_FILE) -> str:
+    """
+    Return a token that changes whenever the database file is written or replaced.
+    Derived from the file's inode, modification time and size, so it costs a
+    single stat() call and never opens SQLite.
+    """
+    try:
+        st = os.stat(db_file)
+    except OSError:
+        return "0"
+    return f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+class GenerationCache:
+    """
+    Values tagged with the dataset generation they were computed from.
+    A lookup under a different generation misses, so nothing needs to be
+    invalidated explicitly after an ETL run.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, generation: str):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] != generation:
+            return None
+        return entry[1]
+
+    def set(self, key, generation: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (generation, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class StaleWhileRevalidateCache(GenerationCache):
+    """
+    GenerationCache whose superseded entries can still be served while a
+    fresh value is computed. An entry counts as stale from the moment the
+    cache first sees a newer generation, whichever key that lookup or store
+    was for, and is served stale for at most max_stale seconds after that;
+    past the cap callers must wait for the recompute like on a plain miss.
+    """
+
+    def __init__(self, max_stale: float):
+        super().__init__()
+        self.max_stale = max_stale
+        self._generation = None
+        # Generation -> when a newer one was first seen
+        self._superseded_at = {}
+
+    def _observe(self, generation: str) -> None:
+        # Caller holds the lock
+        if generation == self._generation:
+            return
+        if self._generation is not None:
+            self._superseded_at.setdefault(self._generation, monotonic())
+        self._generation = generation
+        self._superseded_at.pop(generation, None)
+        live = {entry[0] for entry in self._entries.values()}
+        for old in [g for g in self._superseded_at if g not in live]:
+            del self._superseded_at[old]
+
+    def get(self, key, generation: str):
+        with self._lock:
+            self._observe(generation)
+        return super().get(key, generation)
+
+    def get_stale(self, key, generation: str):
+        """
+        The value of an older generation stored under key, if it is within
+        the staleness cap. None on a miss, a fresh entry or an expired one.
+        """
+        if self.max_stale <= 0:
+            return None
+        with self._lock:
+            self._observe(generation)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] == generation:
+                return None
+            since = self._superseded_at.setdefault(entry[0], monotonic())
+        return entry[1] if monotonic() - since <= self.max_stale else None
+
+    def set(self, key, generation: str, value) -> None:
+        with self._lock:
+            self._observe(generation)
+            self._entries[key] = (generation, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+            self._superseded_at.clear()
+
+
+class LRUCache:
+    """
+    Mapping holding at most maxsize entries; storing one more evicts the
+    least recently used. For results keyed by request parameters, where
+    the key space is too large to cache every combination.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,217 @@
+import json
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from data_processing.distributions import load_stats_rows
+from constants import CLUSTER_COUNT, CLUSTER_SEED, CLUSTER_MAX_ITERATIONS
+
+CLUSTER_GRAPH_METADATA = {
+    "stat_clusters": {"title": "Stat Archetype Clusters", "type": "scatter"},
+}
+
+# Centroid z-score a stat needs to be named in a cluster's label
+_STRENGTH_THRESHOLD = 0.5
+
+
+def cluster_table_definitions():
+    """
+    DDL for the k-means cluster tables, in the (name, sql) format used by create_tables.
+    """
+    return [
+        ("stat_clusters", """
+            CREATE TABLE IF NOT EXISTS stat_clusters (
+                cluster_id INTEGER PRIMARY KEY,
+                label TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                centroid TEXT NOT NULL
+            );
+        """),
+        ("pokemon_clusters", """
+            CREATE TABLE IF NOT EXISTS pokemon_clusters (
+                pokemon_id INTEGER PRIMARY KEY,
+                cluster_id INTEGER NOT NULL,
+                distance REAL NOT NULL,
+                FOREIGN KEY (pokemon_id) REFERENCES pokemon (id),
+                FOREIGN KEY (cluster_id) REFERENCES stat_clusters (cluster_id)
+            );
+        """),
+        ("idx_pokemon_clusters_cluster", """
+            CREATE INDEX IF NOT EXISTS idx_pokemon_clusters_cluster
+            ON pokemon_clusters (cluster_id);
+        """),
+    ]
+
+
+def _squared_distances(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, for every (point, centroid) pair at once
+    distances = (
+        (points * points).sum(axis=1)[:, None]
+        - 2.0 * points @ centroids.T
+        + (centroids * centroids).sum(axis=1)[None, :]
+    )
+    return np.maximum(distances, 0.0)
+
+
+def _kmeans_plus_plus(points: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    # Each next seed is drawn with probability proportional to its squared
+    # distance from the nearest seed chosen so far
+    centroids = [points[rng.integers(len(points))]]
+    closest = _squared_distances(points, np.array(centroids))[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            index = rng.integers(len(points))
+        else:
+            index = rng.choice(len(points), p=closest / total)
+        centroids.append(points[index])
+        closest = np.minimum(closest, _squared_distances(points, points[index][None, :])[:, 0])
+    return np.array(centroids)
+
+
+def kmeans(
+    points: np.ndarray,
+    k: int,
+    seed: int = CLUSTER_SEED,
+    max_iterations: int = CLUSTER_MAX_ITERATIONS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lloyd's k-means with k-means++ initialization. Each iteration assigns
+    every point in one vectorized distance computation; the same seed
+    always gives the same clustering.
+    Returns (labels, centroids).
+    """
+    rng = np.random.default_rng(seed)
+    centroids = _kmeans_plus_plus(points, k, rng)
+    labels = np.full(len(points), -1)
+
+    for _ in range(max_iterations):
+        distances = _squared_distances(points, centroids)
+        new_labels = distances.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        counts = np.bincount(labels, minlength=k)
+        for cluster in np.flatnonzero(counts == 0):
+            # Re-seed an empty cluster on the point farthest from its centroid
+            farthest = distances[np.arange(len(points)), labels].argmax()
+            labels[farthest] = cluster
+            distances[farthest, cluster] = 0.0
+            counts = np.bincount(labels, minlength=k)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, points)
+        centroids = sums / counts[:, None]
+
+    return labels, centroids
+
+
+def _describe_centroid(stat_names: List[str], z_centroid: np.ndarray) -> str:
+    order = np.argsort(-z_centroid, kind="stable")
+    strengths = [stat_names[j] for j in order[:2] if z_centroid[j] >= _STRENGTH_THRESHOLD]
+    if strengths:
+        return "high " + " & ".join(strengths)
+    if z_centroid.max() < -_STRENGTH_THRESHOLD:
+        return "low overall"
+    return "balanced"
+
+
+def rebuild_stat_clusters(conn, k: int = CLUSTER_COUNT, seed: int = CLUSTER_SEED) -> bool:
+    """
+    Cluster every Pokémon with a complete stat line by its z-score
+    normalized base stats and store each Pokémon's cluster and every
+    cluster's centroid (in raw base stat units). Clusters are numbered by
+    descending size so ids stay stable when the data does not change.
+    Runs at the end of each ETL run, swapping the results in one transaction.
+    """
+    if not conn:
+        return False
+
+    cursor = None
+    try:
+        pokemon_ids, stat_names, stats, _, _ = load_stats_rows(conn)
+        cluster_rows, member_rows = [], []
+        if len(pokemon_ids):
+            std = stats.std(axis=0)
+            points = (stats - stats.mean(axis=0)) / np.where(std > 0, std, 1.0)
+            # Never ask for more clusters than there are distinct stat lines
+            labels, centroids = kmeans(points, min(k, len(np.unique(points, axis=0))), seed)
+
+            counts = np.bincount(labels, minlength=len(centroids))
+            order = sorted(range(len(centroids)), key=lambda c: (-counts[c], centroids[c].tolist()))
+            cluster_id = {old: new for new, old in enumerate(order)}
+            distances = np.sqrt(_squared_distances(points, centroids)[np.arange(len(points)), labels])
+
+            for old in order:
+                raw_centroid = stats[labels == old].mean(axis=0)
+                cluster_rows.append((
+                    cluster_id[old],
+                    _describe_centroid(stat_names, centroids[old]),
+                    int(counts[old]),
+                    json.dumps(dict(zip(stat_names, np.round(raw_centroid, 2).tolist())))
+                ))
+            member_rows = [
+                (int(pokemon_id), cluster_id[int(label)], round(float(distance), 4))
+                for pokemon_id, label, distance in zip(pokemon_ids, labels, distances)
+            ]
+
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM pokemon_clusters")
+        cursor.execute("DELETE FROM stat_clusters")
+        cursor.executemany(
+            "INSERT INTO stat_clusters (cluster_id, label, size, centroid) VALUES (?, ?, ?, ?)",
+            cluster_rows
+        )
+        cursor.executemany(
+            "INSERT INTO pokemon_clusters (pokemon_id, cluster_id, distance) VALUES (?, ?, ?)",
+            member_rows
+        )
+        conn.commit()
+        return True
+    except Exception:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def get_stat_clusters(conn) -> Dict[str, Any]:
+    """
+    The stored clusters for the stat_clusters graph: every cluster's label,
+    size, centroid and the three members closest to it.
+    Returns {} on error or before the first clustering run.
+    """
+    if not conn:
+        return {}
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT cluster_id, label, size, centroid FROM stat_clusters ORDER BY cluster_id")
+        clusters = [
+            {"cluster": row[0], "label": row[1], "size": row[2], "centroid": json.loads(row[3]), "examples": []}
+            for row in cursor.fetchall()
+        ]
+        cursor.execute("""
+            SELECT cluster_id, name FROM (
+                SELECT pc.cluster_id, p.name,
+                       ROW_NUMBER() OVER (PARTITION BY pc.cluster_id ORDER BY pc.distance, p.id) AS position
+                FROM pokemon_clusters pc
+                JOIN pokemon p ON p.id = pc.pokemon_id
+            )
+            WHERE position <= 3
+            ORDER BY cluster_id, position
+        """)
+        for cluster_id, name in cursor.fetchall():
+            clusters[cluster_id]["examples"].append(name)
+        return {"clusters": clusters} if clusters else {}
+    except Exception:
+        return {}
+    finally:
+        if cursor:
+            cursor.close()
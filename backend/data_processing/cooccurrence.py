@@ -0,0 +1,222 @@
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from constants import COOCCURRENCE_MIN_SUPPORT, COOCCURRENCE_TOP_N, COOCCURRENCE_MAX_ITEMSET
+
+try:
+    from scipy import sparse
+except ImportError:  # pragma: no cover - scipy is optional
+    sparse = None
+
+COOCCURRENCE_GRAPH_METADATA = {
+    "move_cooccurrence": {"title": "Moves Learned Together", "type": "network"},
+    "ability_cooccurrence": {"title": "Abilities Found Together", "type": "network"},
+}
+
+# Graph name -> (junction table, item column) it is mined from
+_SOURCES = {
+    "move_cooccurrence": ("pokemon_moves", "move_name"),
+    "ability_cooccurrence": ("pokemon_abilities", "ability_name"),
+}
+
+
+def load_incidence(conn, junction: str, column: str) -> Tuple[List[int], List[str], Any]:
+    """
+    Pokémon x item incidence matrix of a junction table: entry (p, i) is 1
+    when Pokémon p has item i. The matrix is a scipy CSR matrix when scipy
+    is installed and a dense NumPy array otherwise.
+    Returns (pokemon_ids, item_names, matrix).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT pokemon_id, {column} FROM {junction} ORDER BY pokemon_id")
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    pokemon_ids = sorted({row[0] for row in rows})
+    item_names = sorted({row[1] for row in rows})
+    row_of = {pokemon_id: i for i, pokemon_id in enumerate(pokemon_ids)}
+    column_of = {name: i for i, name in enumerate(item_names)}
+
+    r = np.fromiter((row_of[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+    c = np.fromiter((column_of[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+    shape = (len(pokemon_ids), len(item_names))
+
+    if sparse is not None:
+        matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (r, c)), shape=shape)
+    else:
+        matrix = np.zeros(shape, dtype=np.int32)
+        matrix[r, c] = 1
+    return pokemon_ids, item_names, matrix
+
+
+def pair_counts(matrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Co-occurrence count of every item pair from one matrix product: entry
+    (i, j) of X^T X is the number of Pokémon having both item i and item j.
+    Returns (i, j, count) arrays over the non-zero pairs with i < j.
+    """
+    if sparse is not None and sparse.issparse(matrix):
+        counts = sparse.triu(matrix.T @ matrix, k=1).tocoo()
+        return counts.row, counts.col, counts.data
+    counts = np.triu(matrix.T @ matrix, k=1)
+    i, j = np.nonzero(counts)
+    return i, j, counts[i, j]
+
+
+def _transactions(matrix) -> List[List[int]]:
+    # Item indices of each Pokémon, read straight from the CSR structure
+    if sparse is not None and sparse.issparse(matrix):
+        return [
+            matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]].tolist()
+            for row in range(matrix.shape[0])
+        ]
+    return [np.flatnonzero(row).tolist() for row in matrix]
+
+
+class _FPNode:
+    __slots__ = ("item", "count", "parent", "children")
+
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = {}
+
+
+def _build_fp_tree(transactions: List[Tuple[List[int], int]], min_count: int):
+    counts = Counter()
+    for items, count in transactions:
+        for item in items:
+            counts[item] += count
+    frequent = {item: count for item, count in counts.items() if count >= min_count}
+
+    # Items are inserted most frequent first so shared prefixes collapse
+    root = _FPNode(None, None)
+    header = {item: [] for item in frequent}
+    for items, count in transactions:
+        node = root
+        for item in sorted((i for i in items if i in frequent), key=lambda i: (-frequent[i], i)):
+            child = node.children.get(item)
+            if child is None:
+                child = node.children[item] = _FPNode(item, node)
+                header[item].append(child)
+            child.count += count
+            node = child
+    return frequent, header
+
+
+def _mine_fp_tree(transactions, min_count: int, max_length: int, suffix: tuple, found: list) -> None:
+    frequent, header = _build_fp_tree(transactions, min_count)
+    for item in sorted(frequent, key=lambda i: (frequent[i], i)):
+        itemset = (item,) + suffix
+        found.append((itemset, frequent[item]))
+        if len(itemset) >= max_length:
+            continue
+
+        # Conditional pattern base: the prefix path above every node of item
+        conditional = []
+        for node in header[item]:
+            path = []
+            parent = node.parent
+            while parent.item is not None:
+                path.append(parent.item)
+                parent = parent.parent
+            if path:
+                conditional.append((path, node.count))
+        if conditional:
+            _mine_fp_tree(conditional, min_count, max_length, itemset, found)
+
+
+def fp_growth(transactions: List[List[int]], min_count: int, max_length: int = COOCCURRENCE_MAX_ITEMSET) -> List[Tuple[tuple, int]]:
+    """
+    Frequent itemsets by FP-growth: transactions are compressed into a
+    prefix tree once and itemsets are grown from conditional trees, so no
+    candidate sets are generated and the data is not rescanned per level.
+    Returns list of (sorted item tuple, count) for every itemset of at most
+    max_length items present in at least min_count transactions.
+    """
+    found = []
+    _mine_fp_tree([(items, 1) for items in transactions if items], max(1, min_count), max_length, (), found)
+    return [(tuple(sorted(itemset)), count) for itemset, count in found]
+
+
+def compute_cooccurrence(
+    conn,
+    junction: str,
+    column: str,
+    min_support: float = COOCCURRENCE_MIN_SUPPORT,
+    top_n: int = COOCCURRENCE_TOP_N,
+    max_length: int = COOCCURRENCE_MAX_ITEMSET
+) -> Dict[str, Any]:
+    """
+    Co-occurrence analysis of the items in one junction table.
+    pairs: the top_n item pairs held by the most Pokémon, with support
+    (share of Pokémon) and lift (how much more often the pair occurs than
+    if the items were independent).
+    itemsets: the top_n frequent itemsets of three or more items with
+    support >= min_support.
+    """
+    pokemon_ids, item_names, matrix = load_incidence(conn, junction, column)
+    total = len(pokemon_ids)
+    result = {"pokemon_count": total, "min_support": min_support, "pairs": [], "itemsets": []}
+    if total == 0:
+        return result
+
+    min_count = max(1, int(np.ceil(min_support * total)))
+    item_counts = np.asarray(matrix.sum(axis=0)).ravel()
+
+    i, j, counts = pair_counts(matrix)
+    keep = counts >= min_count
+    i, j, counts = i[keep], j[keep], counts[keep]
+    order = np.lexsort((j, i, -counts))[:top_n]
+    result["pairs"] = [
+        {
+            "items": [item_names[i[k]], item_names[j[k]]],
+            "count": int(counts[k]),
+            "support": round(float(counts[k]) / total, 4),
+            "lift": round(float(counts[k]) * total / (float(item_counts[i[k]]) * float(item_counts[j[k]])), 4)
+        }
+        for k in order
+    ]
+
+    itemsets = [
+        (itemset, count)
+        for itemset, count in fp_growth(_transactions(matrix), min_count, max_length)
+        if len(itemset) >= 3
+    ]
+    itemsets.sort(key=lambda entry: (-entry[1], -len(entry[0]), entry[0]))
+    result["itemsets"] = [
+        {
+            "items": [item_names[item] for item in itemset],
+            "count": count,
+            "support": round(count / total, 4)
+        }
+        for itemset, count in itemsets[:top_n]
+    ]
+    return result
+
+
+def generate_cooccurrence_analysis(conn) -> Dict[str, Any]:
+    """
+    Compute every co-occurrence graph, in the {"data", "title", "type"}
+    format of generate_all_analysis.
+    Returns {} on error.
+    """
+    if not conn:
+        return {}
+
+    try:
+        return {
+            name: {
+                "data": compute_cooccurrence(conn, *_SOURCES[name]),
+                "title": metadata["title"],
+                "type": metadata["type"]
+            }
+            for name, metadata in COOCCURRENCE_GRAPH_METADATA.items()
+        }
+    except Exception:
+        return {}
@@ -0,0 +1,189 @@
+from sqlite3 import Error
+from typing import Dict, List, Tuple
+
+# Junction table -> counter table maintained by triggers on that junction table.
+# Each junction row is a unique (pokemon_id, name) pair, so the row count per
+# name equals COUNT(DISTINCT pokemon_id) of the analysis queries.
+COUNTER_DEFINITIONS = {
+    "type_counts": ("pokemon_types", "type_name"),
+    "ability_counts": ("pokemon_abilities", "ability_name"),
+    "move_counts": ("pokemon_moves", "move_name"),
+}
+
+
+def counter_table_definitions() -> List[Tuple[str, str]]:
+    """
+    DDL for the aggregate counter tables and the triggers that keep them
+    up to date as the loader inserts or deletes junction rows.
+    Returns (name, sql) pairs in the format used by create_tables.
+    """
+    definitions = []
+
+    for counter_table, (junction_table, key) in COUNTER_DEFINITIONS.items():
+        definitions.extend([
+            (counter_table, f"""
+                CREATE TABLE IF NOT EXISTS {counter_table} (
+                    {key} TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL DEFAULT 0
+                );
+            """),
+            (f"idx_{counter_table}_count", f"""
+                CREATE INDEX IF NOT EXISTS idx_{counter_table}_count
+                ON {counter_table} (count DESC);
+            """),
+            (f"trg_{junction_table}_insert", f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{junction_table}_insert
+                AFTER INSERT ON {junction_table}
+                BEGIN
+                    INSERT OR IGNORE INTO {counter_table} ({key}, count) VALUES (NEW.{key}, 0);
+                    UPDATE {counter_table} SET count = count + 1 WHERE {key} = NEW.{key};
+                END;
+            """),
+            (f"trg_{junction_table}_delete", f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{junction_table}_delete
+                AFTER DELETE ON {junction_table}
+                BEGIN
+                    UPDATE {counter_table} SET count = count - 1 WHERE {key} = OLD.{key};
+                    DELETE FROM {counter_table} WHERE {key} = OLD.{key} AND count <= 0;
+                END;
+            """),
+        ])
+
+    definitions.extend([
+        ("stat_sums", """
+            CREATE TABLE IF NOT EXISTS stat_sums (
+                stat_name TEXT PRIMARY KEY,
+                total INTEGER NOT NULL DEFAULT 0,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+        """),
+        ("trg_pokemon_stats_insert", """
+            CREATE TRIGGER IF NOT EXISTS trg_pokemon_stats_insert
+            AFTER INSERT ON pokemon_stats
+            BEGIN
+                INSERT OR IGNORE INTO stat_sums (stat_name, total, count) VALUES (NEW.stat_name, 0, 0);
+                UPDATE stat_sums
+                SET total = total + NEW.base_stat, count = count + 1
+                WHERE stat_name = NEW.stat_name;
+            END;
+        """),
+        ("trg_pokemon_stats_delete", """
+            CREATE TRIGGER IF NOT EXISTS trg_pokemon_stats_delete
+            AFTER DELETE ON pokemon_stats
+            BEGIN
+                UPDATE stat_sums
+                SET total = total - OLD.base_stat, count = count - 1
+                WHERE stat_name = OLD.stat_name;
+                DELETE FROM stat_sums WHERE stat_name = OLD.stat_name AND count <= 0;
+            END;
+        """),
+        ("trg_pokemon_stats_update", """
+            CREATE TRIGGER IF NOT EXISTS trg_pokemon_stats_update
+            AFTER UPDATE OF base_stat ON pokemon_stats
+            BEGIN
+                UPDATE stat_sums
+                SET total = total - OLD.base_stat + NEW.base_stat
+                WHERE stat_name = NEW.stat_name;
+            END;
+        """),
+    ])
+
+    return definitions
+
+
+def _recompute_queries() -> Dict[str, str]:
+    """
+    Queries computing each counter table's expected content from scratch.
+    """
+    queries = {
+        counter_table: f"""
+            SELECT {key}, COUNT(DISTINCT pokemon_id)
+            FROM {junction_table}
+            GROUP BY {key}
+        """
+        for counter_table, (junction_table, key) in COUNTER_DEFINITIONS.items()
+    }
+    queries["stat_sums"] = """
+        SELECT stat_name, SUM(base_stat), COUNT(*)
+        FROM pokemon_stats
+        GROUP BY stat_name
+    """
+    return queries
+
+
+def missing_counter_tables(cursor) -> List[str]:
+    """
+    Counter tables not yet present in the database.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+    return [table for table in _recompute_queries() if table not in existing]
+
+
+def seed_counters(cursor, counter_tables: List[str]) -> None:
+    """
+    Fill the given counter tables from their source tables, within the
+    caller's transaction. Raises sqlite3.Error for the caller to roll back.
+    """
+    queries = _recompute_queries()
+    for counter_table in counter_tables:
+        cursor.execute(f"DELETE FROM {counter_table}")
+        cursor.execute(f"INSERT INTO {counter_table} {queries[counter_table]}")
+
+
+def check_counters(conn) -> Dict[str, int]:
+    """
+    Recompute every counter table from the junction tables and compare.
+    Returns dict of counter table -> number of mismatching rows
+    (empty dict when all counters are consistent).
+    Raises sqlite3.Error if the tables cannot be read.
+    """
+    if not conn:
+        return {}
+
+    mismatches = {}
+    cursor = conn.cursor()
+    try:
+        for counter_table, query in _recompute_queries().items():
+            cursor.execute(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM (
+                        SELECT * FROM ({query}) EXCEPT SELECT * FROM {counter_table}
+                    ))
+                    +
+                    (SELECT COUNT(*) FROM (
+                        SELECT * FROM {counter_table} EXCEPT SELECT * FROM ({query})
+                    ))
+            """)
+            drift = cursor.fetchone()[0]
+            if drift:
+                mismatches[counter_table] = drift
+    finally:
+        cursor.close()
+
+    return mismatches
+
+
+def rebuild_counters(conn) -> bool:
+    """
+    Recompute every counter table from scratch, e.g. for a database that was
+    populated before the counter triggers existed.
+    """
+    if not conn:
+        return False
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        seed_counters(cursor, list(_recompute_queries()))
+        conn.commit()
+        return True
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
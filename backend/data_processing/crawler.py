@@ -0,0 +1,62 @@
+# data_processing/crawler.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+from typing import Dict, Iterable
+
+import requests
+
+from constants import CRAWLER_WORKERS, CRAWLER_RATE_LIMIT
+
+
+class RateLimiter:
+    """
+    Spaces calls to wait() at least 1/rate seconds apart across all threads.
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            sleep(slot - now)
+
+
+def _fetch_json(url: str, limiter: RateLimiter):
+    """Fetch one URL once its rate-limit slot comes up. Returns None on failure."""
+    limiter.wait()
+    try:
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException:
+        return None
+    except ValueError:
+        return None
+
+
+def crawl_resources(
+    urls: Iterable[str],
+    max_workers: int = CRAWLER_WORKERS,
+    rate: float = CRAWLER_RATE_LIMIT
+) -> Dict[str, dict]:
+    """
+    Fetch every distinct URL exactly once, using a thread pool of
+    max_workers and at most `rate` requests per second overall.
+    Returns dict of url -> parsed JSON; URLs that failed map to None.
+    """
+    unique_urls = list(dict.fromkeys(url for url in urls if url))
+    if not unique_urls:
+        return {}
+
+    limiter = RateLimiter(rate)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = executor.map(lambda url: _fetch_json(url, limiter), unique_urls)
+        return dict(zip(unique_urls, results))
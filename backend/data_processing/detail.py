@@ -0,0 +1,81 @@
+import json
+from typing import Dict, List
+
+# Assembles each Pokémon's full record as a JSON document inside SQLite.
+# Junction rows are aggregated in insertion (rowid) order, which keeps the
+# PokeAPI slot order of types and abilities.
+_DOCUMENT_QUERY = """
+    SELECT
+        p.id,
+        json_object(
+            'id', p.id,
+            'name', p.name,
+            'is_evolved', json(CASE WHEN p.is_evolved THEN 'true' ELSE 'false' END),
+            'types', (
+                SELECT json_group_array(type_name) FROM (
+                    SELECT type_name FROM pokemon_types
+                    WHERE pokemon_id = p.id ORDER BY rowid
+                )
+            ),
+            'abilities', (
+                SELECT json_group_array(ability_name) FROM (
+                    SELECT ability_name FROM pokemon_abilities
+                    WHERE pokemon_id = p.id ORDER BY rowid
+                )
+            ),
+            'moves', (
+                SELECT json_group_array(move_name) FROM (
+                    SELECT move_name FROM pokemon_moves
+                    WHERE pokemon_id = p.id ORDER BY rowid
+                )
+            ),
+            'stats', (
+                SELECT json_group_object(stat_name, base_stat) FROM (
+                    SELECT stat_name, base_stat FROM pokemon_stats
+                    WHERE pokemon_id = p.id ORDER BY rowid
+                )
+            )
+        )
+    FROM pokemon p
+"""
+
+
+def fetch_pokemon_documents(conn, pokemon_ids: List[int]) -> Dict[int, str]:
+    """
+    Fetch the full record (types, abilities, moves, stats) of many Pokémon
+    in a single query. The ids are bound as one JSON array, so the statement
+    is the same however many ids are requested.
+    Returns dict of id -> JSON document string; unknown ids are omitted.
+    """
+    if not conn or not pokemon_ids:
+        return {}
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            _DOCUMENT_QUERY + " WHERE p.id IN (SELECT value FROM json_each(?))",
+            (json.dumps([int(i) for i in pokemon_ids]),)
+        )
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def fetch_pokemon_document(conn, name_or_id: str):
+    """
+    Fetch one Pokémon's full record by name or id in a single query.
+    Returns the JSON document string, or None if not found.
+    """
+    if not conn or not name_or_id:
+        return None
+
+    cursor = conn.cursor()
+    try:
+        if str(name_or_id).isdigit():
+            cursor.execute(_DOCUMENT_QUERY + " WHERE p.id = ?", (int(name_or_id),))
+        else:
+            cursor.execute(_DOCUMENT_QUERY + " WHERE p.name = ?", (str(name_or_id).lower(),))
+        row = cursor.fetchone()
+        return row[1] if row else None
+    finally:
+        cursor.close()
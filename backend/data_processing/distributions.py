@@ -0,0 +1,168 @@
+import sqlite3
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from data_processing.cache import GenerationCache
+from data_processing.shared_cache import get_shared_cache
+from data_processing.replica import read_only_connection
+
+DISTRIBUTION_GRAPH_METADATA = {
+    "stat_histograms": {"title": "Base Stat Distributions", "type": "histogram"},
+    "stat_quartiles": {"title": "Base Stat Quartiles and Spread", "type": "box"},
+    "stat_by_type": {"title": "Average Base Stats by Type", "type": "heatmap"},
+    "stat_correlation": {"title": "Base Stat Correlation Matrix", "type": "heatmap"},
+}
+
+HISTOGRAM_BINS = 10
+
+_distribution_cache = GenerationCache()
+
+
+def load_stats_matrix(conn) -> Tuple[List[str], np.ndarray, List[str], np.ndarray]:
+    """
+    Load every Pokémon's base stats as one (pokemon x stat) matrix, plus a
+    boolean (pokemon x type) membership matrix. Pokémon missing any stat
+    are left out so every column covers the same population.
+    Returns (stat_names, stats, type_names, membership).
+    """
+    _, stat_names, stats, type_names, membership = load_stats_rows(conn)
+    return stat_names, stats, type_names, membership
+
+
+def load_stats_rows(conn) -> Tuple[np.ndarray, List[str], np.ndarray, List[str], np.ndarray]:
+    """
+    Same as load_stats_matrix, but also returns the Pokémon id of each row.
+    Returns (pokemon_ids, stat_names, stats, type_names, membership).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT name FROM stats ORDER BY rowid")
+        stat_names = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT pokemon_id, stat_name, base_stat FROM pokemon_stats")
+        stat_rows = cursor.fetchall()
+        cursor.execute("SELECT pokemon_id, type_name FROM pokemon_types")
+        type_rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    pokemon_ids = sorted({row[0] for row in stat_rows})
+    row_of = {pokemon_id: i for i, pokemon_id in enumerate(pokemon_ids)}
+    column_of = {name: j for j, name in enumerate(stat_names)}
+
+    stats = np.full((len(pokemon_ids), len(stat_names)), np.nan)
+    if stat_rows:
+        rows = np.array([row_of[r[0]] for r in stat_rows])
+        columns = np.array([column_of[r[1]] for r in stat_rows])
+        stats[rows, columns] = [r[2] for r in stat_rows]
+
+    type_names = sorted({row[1] for row in type_rows})
+    type_column = {name: j for j, name in enumerate(type_names)}
+    membership = np.zeros((len(pokemon_ids), len(type_names)), dtype=bool)
+    typed = [(row_of[r[0]], type_column[r[1]]) for r in type_rows if r[0] in row_of]
+    if typed:
+        rows, columns = zip(*typed)
+        membership[list(rows), list(columns)] = True
+
+    complete = ~np.isnan(stats).any(axis=1)
+    ids = np.array(pokemon_ids, dtype=np.int64)
+    return ids[complete], stat_names, stats[complete], type_names, membership[complete]
+
+
+def empty_stats_rows() -> Tuple[np.ndarray, List[str], np.ndarray, List[str], np.ndarray]:
+    """
+    load_stats_rows' result for a database without Pokémon.
+    """
+    return np.empty(0, dtype=np.int64), [], np.empty((0, 0)), [], np.zeros((0, 0), dtype=bool)
+
+
+def _histograms(stats: np.ndarray, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Equal-width bins per column, counted for all columns with one bincount
+    low, high = stats.min(axis=0), stats.max(axis=0)
+    width = np.where(high > low, (high - low) / bins, 1.0)
+    index = np.clip(((stats - low) / width).astype(int), 0, bins - 1)
+    offsets = index + np.arange(stats.shape[1]) * bins
+    counts = np.bincount(offsets.ravel(), minlength=bins * stats.shape[1]).reshape(stats.shape[1], bins)
+    edges = low[:, None] + width[:, None] * np.arange(bins + 1)
+    return counts, edges
+
+
+def _round(values) -> List:
+    # JSON has no NaN: undefined values (e.g. correlation with a constant stat) become null
+    return [None if not np.isfinite(v) else round(float(v), 2) for v in values]
+
+
+def compute_stat_distributions(
+    stat_names: List[str],
+    stats: np.ndarray,
+    type_names: List[str],
+    membership: np.ndarray,
+    bins: int = HISTOGRAM_BINS
+) -> Dict[str, Any]:
+    """
+    Compute histograms, quartiles, standard deviations, per-type averages
+    and the stat correlation matrix from the stats matrix, each as a
+    whole-matrix NumPy operation. Returns dict keyed by graph name.
+    """
+    if stats.size == 0:
+        return {name: {} for name in DISTRIBUTION_GRAPH_METADATA}
+
+    counts, edges = _histograms(stats, bins)
+    quartiles = np.percentile(stats, [0, 25, 50, 75, 100], axis=0)
+    means = stats.mean(axis=0)
+    stds = stats.std(axis=0)
+
+    type_counts = membership.sum(axis=0)
+    type_means = (membership.T.astype(float) @ stats) / np.maximum(type_counts, 1)[:, None]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlation = np.atleast_2d(np.corrcoef(stats, rowvar=False))
+
+    return {
+        "stat_histograms": {
+            stat: {"bin_edges": _round(edges[j]), "counts": counts[j].tolist()}
+            for j, stat in enumerate(stat_names)
+        },
+        "stat_quartiles": {
+            stat: dict(zip(
+                ["min", "q1", "median", "q3", "max", "mean", "std"],
+                _round(np.append(quartiles[:, j], [means[j], stds[j]]))
+            ))
+            for j, stat in enumerate(stat_names)
+        },
+        "stat_by_type": {
+            type_name: {"count": int(type_counts[t]), **dict(zip(stat_names, _round(type_means[t])))}
+            for t, type_name in enumerate(type_names)
+        },
+        "stat_correlation": {
+            "stats": stat_names,
+            "matrix": [_round(row) for row in correlation]
+        },
+    }
+
+
+def get_stat_distributions(db_file: str, generation: str) -> Dict[str, Any]:
+    """
+    Return every distribution graph for the given dataset generation.
+    The stats matrix is loaded (from the shared cache when enabled) and
+    analysed once per generation.
+    """
+    distributions = _distribution_cache.get("distributions", generation)
+    if distributions is None:
+        shared = get_shared_cache(db_file, generation)
+        if shared is not None:
+            _, stat_names, stats, type_names, membership = shared.stats_rows()
+            distributions = compute_stat_distributions(stat_names, stats, type_names, membership)
+        else:
+            try:
+                conn = read_only_connection(db_file)
+            except sqlite3.OperationalError:
+                # No database yet: every graph is empty
+                distributions = compute_stat_distributions(*empty_stats_rows()[1:])
+            else:
+                try:
+                    distributions = compute_stat_distributions(*load_stats_matrix(conn))
+                finally:
+                    conn.close()
+        _distribution_cache.set("distributions", generation, distributions)
+    return distributions
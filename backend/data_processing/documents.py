@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from data_processing.detail import fetch_pokemon_document, fetch_pokemon_documents
+from constants import DOCUMENT_COMPRESSION
+
+
+def _encode_document(document: str, compression) -> Tuple[str, bytes]:
+    body = document.encode("utf-8")
+    if compression == "gzip":
+        # mtime=0 keeps the compressed bytes stable for identical content
+        return "gzip", gzip.compress(body, mtime=0)
+    return "identity", body
+
+
+def decode_document(encoding: str, body: bytes) -> bytes:
+    """
+    Return the uncompressed JSON bytes of a stored document.
+    """
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    return bytes(body)
+
+
+def write_pokemon_documents(conn, pokemon_ids: List[int], compression=DOCUMENT_COMPRESSION) -> int:
+    """
+    Render the final API JSON of the given Pokémon and store it in
+    pokemon_documents. Documents whose content hash is unchanged are skipped,
+    so re-loading an unchanged Pokémon never rewrites its row.
+    Runs inside the caller's transaction (no commit).
+    Returns the number of documents written.
+    """
+    if not conn or not pokemon_ids:
+        return 0
+
+    documents = fetch_pokemon_documents(conn, pokemon_ids)
+    if not documents:
+        return 0
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT pokemon_id, content_hash, encoding FROM pokemon_documents
+            WHERE pokemon_id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(list(documents)),)
+        )
+        existing = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        rows = []
+        target_encoding = "gzip" if compression == "gzip" else "identity"
+        for pokemon_id, document in documents.items():
+            content_hash = hashlib.sha256(document.encode("utf-8")).hexdigest()
+            if existing.get(pokemon_id) == (content_hash, target_encoding):
+                continue
+            encoding, body = _encode_document(document, compression)
+            rows.append((pokemon_id, content_hash, encoding, body, updated_at))
+
+        if rows:
+            cursor.executemany(
+                """
+                INSERT INTO pokemon_documents (pokemon_id, content_hash, encoding, body, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (pokemon_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    encoding = excluded.encoding,
+                    body = excluded.body,
+                    updated_at = excluded.updated_at
+                """,
+                rows
+            )
+        return len(rows)
+    finally:
+        cursor.close()
+
+
+def get_pokemon_document(conn, name_or_id: str):
+    """
+    Get one Pokémon's API JSON by name or id.
+    Returns (encoding, body) straight from pokemon_documents, where encoding is
+    "identity" or "gzip", falling back to live assembly for Pokémon without a
+    stored document. Returns None if the Pokémon does not exist.
+    """
+    if not conn or not name_or_id:
+        return None
+
+    cursor = conn.cursor()
+    try:
+        if str(name_or_id).isdigit():
+            cursor.execute(
+                "SELECT encoding, body FROM pokemon_documents WHERE pokemon_id = ?",
+                (int(name_or_id),)
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT d.encoding, d.body
+                FROM pokemon p JOIN pokemon_documents d ON d.pokemon_id = p.id
+                WHERE p.name = ?
+                """,
+                (str(name_or_id).lower(),)
+            )
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    if row:
+        return row[0], bytes(row[1])
+
+    document = fetch_pokemon_document(conn, name_or_id)
+    if document is None:
+        return None
+    return "identity", document.encode("utf-8")
+
+
+def get_pokemon_documents(conn, pokemon_ids: List[int]) -> Dict[int, bytes]:
+    """
+    Get the uncompressed API JSON of many Pokémon, reading stored documents
+    and assembling only the ones without a stored document.
+    Returns dict of id -> JSON bytes; unknown ids are omitted.
+    """
+    if not conn or not pokemon_ids:
+        return {}
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT pokemon_id, encoding, body FROM pokemon_documents
+            WHERE pokemon_id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps([int(i) for i in pokemon_ids]),)
+        )
+        documents = {row[0]: decode_document(row[1], row[2]) for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+    missing = [i for i in pokemon_ids if i not in documents]
+    if missing:
+        for pokemon_id, document in fetch_pokemon_documents(conn, missing).items():
+            documents[pokemon_id] = document.encode("utf-8")
+
+    return documents
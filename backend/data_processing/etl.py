@@ -3,9 +3,33 @@ import sqlite3
 from time import sleep
 import logging
 
-from data_processing.extract import extract_pokemons
-from data_processing.transform import transform_pokemons
-from data_processing.load import create_connection, create_tables, load_pokemons
+from data_processing.extract import extract_pokemons, extract_type_relations, extract_resource_details
+from data_processing.transform import (
+    transform_pokemons,
+    transform_type_relations,
+    transform_move_details,
+    transform_ability_details,
+)
+from data_processing.load import (
+    create_connection,
+    create_tables,
+    load_pokemons,
+    load_type_effectiveness,
+    get_missing_resource_details,
+    load_resource_details,
+)
+from data_processing.counters import check_counters, rebuild_counters
+from data_processing.ranks import rebuild_stat_ranks
+from data_processing.clustering import rebuild_stat_clusters
+from data_processing.movesets import backfill_move_signatures, materialize_move_set_pairs
+from data_processing.shared_cache import build_shared_cache
+from data_processing.stats_snapshot import write_stats_snapshot
+from data_processing.sketches import load_sketches, rebuild_sketches, save_sketches, sketches_current
+from data_processing.snapshots import (
+    start_etl_run,
+    finish_etl_run,
+    materialize_analysis_snapshot,
+)
 
 from constants import (
     DATABASE_FILE,
@@ -13,22 +37,34 @@ from constants import (
     API_DELAY,
     LOG_FORMAT,
     LOG_LEVEL,
+    MOVE_ENDPOINT,
+    ABILITY_ENDPOINT,
+    SHARED_CACHE,
+    STATS_SNAPSHOT,
+    SKETCH_ANALYTICS,
 )
 
 logging.basicConfig(level=getattr(logging, LOG_LEVEL), format=LOG_FORMAT)
 
 
-def run_etl_pipeline():
-    """Run the full ETL pipeline: Extract → Transform → Load."""
+def run_etl_pipeline(db_file: str = None):
+    """
+    Run the full ETL pipeline: Extract → Transform → Load into db_file
+    (the live DATABASE_FILE by default; see data_processing.build for
+    building into a separate file and swapping it in).
+    """
+    db_file = db_file or DATABASE_FILE
     
     conn = None
+    run_id = None
+    sketches = None
     success_count = 0
     failure_count = 0
 
     try:
         # === 1. Database Setup ===
         logging.info("Starting ETL pipeline setup...")
-        conn = create_connection(DATABASE_FILE)
+        conn = create_connection(db_file)
         if not conn:
             logging.critical("Failed to connect to database.")
             raise Exception("Failed to connect to database.")
@@ -36,6 +72,22 @@ def run_etl_pipeline():
         if not create_tables(conn):
             logging.warning("Some tables failed to create. Continuing anyway...")
 
+        # The loader only folds in what this run inserts, so sketches that
+        # miss rows (never built, or loaded while analytics were off) are
+        # rebuilt from the tables first
+        if SKETCH_ANALYTICS:
+            if sketches_current(conn):
+                sketches = load_sketches(conn)
+            elif rebuild_sketches(conn):
+                logging.info("Analytics sketches rebuilt from existing data")
+                sketches = load_sketches(conn)
+            else:
+                logging.warning("Failed to build analytics sketches. They will not be updated.")
+
+        run_id = start_etl_run(conn)
+        if run_id is None:
+            logging.warning("Failed to register ETL run. Analysis snapshot will be skipped.")
+
         logging.info(f"Starting ETL for first {POKEMON_TO_FETCH} Pokémon")
 
         # === 2. Main ETL Loop ===
@@ -66,7 +118,7 @@ def run_etl_pipeline():
                     continue
 
                 # --- LOAD ---
-                if load_pokemons(conn, transformed_data):
+                if load_pokemons(conn, transformed_data, sketches):
                     success_count += 1
                     logging.info(f"✓ Successfully loaded: {pokemon_name}")
                 else:
@@ -80,7 +132,108 @@ def run_etl_pipeline():
             # Respect API rate limit
             sleep(API_DELAY)
 
-        # === 3. Summary ===
+        # === 3. Type Matchups ===
+        # Each type resource is fetched once, and only until its damage
+        # relations are stored; later runs request only newly seen types.
+        try:
+            known_types = {row[0] for row in conn.execute("SELECT DISTINCT attacking_type FROM type_effectiveness")}
+            new_types = {row[0] for row in conn.execute("SELECT name FROM types")} - known_types
+            if new_types:
+                relations = extract_type_relations(new_types, known_types)
+                if load_type_effectiveness(conn, transform_type_relations(relations), list(relations)):
+                    logging.info(f"Stored damage relations for {len(relations)} types")
+                else:
+                    logging.error("Failed to store type damage relations.")
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update type matchups: {e}")
+
+        # === 4. Move & Ability Details ===
+        # The loop above only records names. Every move/ability still
+        # without details is fetched exactly once, concurrently through the
+        # rate-limited crawler; rows filled by earlier runs are skipped.
+        for table, endpoint, transform in (
+            ("moves", MOVE_ENDPOINT, transform_move_details),
+            ("abilities", ABILITY_ENDPOINT, transform_ability_details),
+        ):
+            missing = get_missing_resource_details(conn, table)
+            if not missing:
+                continue
+            fetched = extract_resource_details(endpoint, missing)
+            details = [row for row in map(transform, fetched.values()) if row]
+            if load_resource_details(conn, table, details):
+                logging.info(f"Stored details for {len(details)}/{len(missing)} {table}")
+            else:
+                logging.error(f"Failed to store {table} details.")
+
+        # === 5. Verify Aggregate Counters ===
+        # Counters drift only if rows were written without the triggers
+        # (e.g. a database created before they existed); rebuild them then.
+        try:
+            drift = check_counters(conn)
+            if drift:
+                logging.warning(f"Aggregate counters out of sync {drift}. Rebuilding...")
+                if not rebuild_counters(conn):
+                    logging.error("Failed to rebuild aggregate counters.")
+        except sqlite3.Error as e:
+            logging.error(f"Failed to verify aggregate counters: {e}")
+
+        # === 6. Precompute Stat Ranks ===
+        if rebuild_stat_ranks(conn):
+            logging.info("Stat leaderboards and percentiles rebuilt")
+        else:
+            logging.warning("Failed to rebuild stat ranks.")
+
+        # === 7. Stat Archetype Clusters ===
+        if rebuild_stat_clusters(conn):
+            logging.info("Stat archetype clusters rebuilt")
+        else:
+            logging.warning("Failed to rebuild stat clusters.")
+
+        # === 8. Move-set Similarity Pairs ===
+        if backfill_move_signatures(conn) < 0:
+            logging.warning("Failed to backfill move-set signatures.")
+        pair_count = materialize_move_set_pairs(conn)
+        if pair_count >= 0:
+            logging.info(f"Stored {pair_count} similar move-set pairs")
+        else:
+            logging.warning("Failed to compute move-set similarity pairs.")
+
+        # === 9. Materialize Analysis ===
+        if run_id is not None:
+            finish_etl_run(conn, run_id, success_count, failure_count)
+            if materialize_analysis_snapshot(conn, run_id):
+                logging.info(f"Analysis snapshot stored for run {run_id}")
+            else:
+                logging.warning(f"Failed to store analysis snapshot for run {run_id}")
+
+        # === 10. Shared Read Cache ===
+        # Built once here so API worker processes map it instead of each
+        # recomputing the stats matrix, name table and analysis bodies
+        if SHARED_CACHE:
+            if build_shared_cache(db_file):
+                logging.info("Shared read cache rebuilt")
+            else:
+                logging.warning("Failed to build the shared read cache.")
+
+        # === 11. Binary Stats Snapshot ===
+        # Fixed-layout records services and notebooks can np.load with
+        # mmap_mode="r" instead of querying SQLite on every start
+        if STATS_SNAPSHOT:
+            if write_stats_snapshot(conn, db_file):
+                logging.info("Binary stats snapshot written")
+            else:
+                logging.warning("Failed to write the binary stats snapshot.")
+
+        # === 12. Analytics Sketches ===
+        # Maintained in memory during the loop and stored once; a run that
+        # fails before here leaves them stale, and the next run rebuilds them
+        if sketches is not None:
+            if save_sketches(conn, sketches):
+                logging.info("Analytics sketches saved")
+            else:
+                logging.warning("Failed to save analytics sketches.")
+
+        # === 13. Summary ===
         total = success_count + failure_count
         logging.info("=" * 50)
         logging.info("ETL PIPELINE COMPLETE")
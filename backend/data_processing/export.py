@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+from typing import Iterator, List
+
+from data_processing.detail import fetch_pokemon_documents
+from data_processing.documents import decode_document
+from data_processing.replica import read_only_connection
+from constants import EXPORT_CHUNK_SIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pq = None
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_LIST_COLUMNS = ["types", "abilities", "moves"]
+
+
+def _open_export_connection(db_file: str):
+    # Streaming responses advance the generator from worker threads, so the
+    # connection must not be pinned to the creating thread
+    return read_only_connection(db_file, check_same_thread=False)
+
+
+def iter_document_chunks(conn, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[bytes]]:
+    """
+    Yield the API JSON of every Pokémon in id order, chunk_size documents at a time.
+    Rows are pulled from one cursor with fetchmany, so memory stays bounded by
+    the chunk size. Stored documents are used as-is; Pokémon without one are
+    assembled per chunk in a single query.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT p.id, d.encoding, d.body
+            FROM pokemon p
+            LEFT JOIN pokemon_documents d ON d.pokemon_id = p.id
+            ORDER BY p.id
+        """)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+
+            missing = [row[0] for row in rows if row[2] is None]
+            assembled = fetch_pokemon_documents(conn, missing) if missing else {}
+
+            chunk = []
+            for pokemon_id, encoding, body in rows:
+                if body is None:
+                    chunk.append(assembled[pokemon_id].encode("utf-8"))
+                else:
+                    chunk.append(decode_document(encoding, body))
+            yield chunk
+    finally:
+        cursor.close()
+
+
+def _stat_names(conn) -> List[str]:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT name FROM stats ORDER BY rowid")
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def stream_ndjson(db_file: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream the dataset as newline-delimited JSON, one Pokémon per line.
+    """
+    conn = _open_export_connection(db_file)
+    try:
+        for chunk in iter_document_chunks(conn, chunk_size):
+            yield b"\n".join(chunk) + b"\n"
+    finally:
+        conn.close()
+
+
+def stream_csv(db_file: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream the dataset as CSV with one column per stat; types, abilities
+    and moves are "|"-joined.
+    """
+    conn = _open_export_connection(db_file)
+    try:
+        stat_names = _stat_names(conn)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(["id", "name", "is_evolved"] + _LIST_COLUMNS + stat_names)
+        yield buffer.getvalue().encode("utf-8")
+
+        for chunk in iter_document_chunks(conn, chunk_size):
+            buffer.seek(0)
+            buffer.truncate()
+            for body in chunk:
+                doc = json.loads(body)
+                writer.writerow(
+                    [doc["id"], doc["name"], doc["is_evolved"]]
+                    + ["|".join(doc[column]) for column in _LIST_COLUMNS]
+                    + [doc["stats"].get(stat) for stat in stat_names]
+                )
+            yield buffer.getvalue().encode("utf-8")
+    finally:
+        conn.close()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file object that collects bytes until they are drained,
+    letting ParquetWriter output be streamed one row group at a time.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_parquet(db_file: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream the dataset as a Parquet file, writing one row group per chunk.
+    Requires pyarrow (see export_format_available).
+    """
+    conn = _open_export_connection(db_file)
+    try:
+        stat_names = _stat_names(conn)
+        schema = pa.schema(
+            [("id", pa.int64()), ("name", pa.string()), ("is_evolved", pa.bool_())]
+            + [(column, pa.list_(pa.string())) for column in _LIST_COLUMNS]
+            + [(stat, pa.int64()) for stat in stat_names]
+        )
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        try:
+            for chunk in iter_document_chunks(conn, chunk_size):
+                docs = [json.loads(body) for body in chunk]
+                columns = {
+                    "id": [doc["id"] for doc in docs],
+                    "name": [doc["name"] for doc in docs],
+                    "is_evolved": [doc["is_evolved"] for doc in docs],
+                }
+                for column in _LIST_COLUMNS:
+                    columns[column] = [doc[column] for doc in docs]
+                for stat in stat_names:
+                    columns[stat] = [doc["stats"].get(stat) for doc in docs]
+
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+    finally:
+        conn.close()
+
+
+def export_format_available(export_format: str) -> bool:
+    """
+    Check whether an export format can be produced with the installed packages.
+    """
+    if export_format == "parquet":
+        return pq is not None
+    return export_format in EXPORT_FORMATS
+
+
+def stream_export(db_file: str, export_format: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Stream the dataset in one of EXPORT_FORMATS.
+    """
+    streams = {
+        "ndjson": stream_ndjson,
+        "csv": stream_csv,
+        "parquet": stream_parquet,
+    }
+    return streams[export_format](db_file, chunk_size)
@@ -1,9 +1,11 @@
 # data_processing/extract.py
 import requests
 from time import sleep
+from data_processing.crawler import crawl_resources
 from constants import (
     POKEAPI_BASE_URL,
     POKEMON_ENDPOINT,
+    TYPE_ENDPOINT,
     API_DELAY,
 )
 
@@ -90,3 +92,59 @@ def extract_pokemons(pokemon_id):
     }
 
     return pokemon
+
+
+def extract_type_relations(type_names, known_types=()):
+    """
+    Fetch the damage relations of the given types from PokeAPI.
+    Each type resource is requested at most once; types named in a
+    response's relations that are neither requested nor in known_types
+    are fetched as well, so the result covers every type reachable from
+    the input.
+    Returns dict of type name -> {"double_damage_to", "half_damage_to",
+    "no_damage_to"} name lists. Types that fail to download are omitted.
+    """
+    relations = {}
+    pending = sorted({name for name in type_names if isinstance(name, str) and name})
+    requested = set(pending) | set(known_types)
+
+    while pending:
+        type_name = pending.pop(0)
+        url = f"{POKEAPI_BASE_URL}/{TYPE_ENDPOINT}/{type_name}/"
+        try:
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+            damage = response.json()["damage_relations"]
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError):
+            continue
+
+        relations[type_name] = {
+            key: [t["name"] for t in damage.get(key, [])]
+            for key in ("double_damage_to", "half_damage_to", "no_damage_to")
+        }
+        for names in relations[type_name].values():
+            for name in names:
+                if name not in requested:
+                    requested.add(name)
+                    pending.append(name)
+
+        sleep(API_DELAY)
+
+    return relations
+
+
+def extract_resource_details(endpoint: str, names):
+    """
+    Fetch the PokeAPI resource of each named move/ability/... under endpoint.
+    Names are deduplicated so every resource is requested exactly once; the
+    requests run concurrently through the rate-limited crawler.
+    Returns dict of name -> raw resource JSON. Names that fail to download
+    are omitted, so they are retried on the next run.
+    """
+    urls = {
+        f"{POKEAPI_BASE_URL}/{endpoint}/{name}/": name
+        for name in names
+        if isinstance(name, str) and name
+    }
+    fetched = crawl_resources(urls)
+    return {urls[url]: data for url, data in fetched.items() if isinstance(data, dict)}
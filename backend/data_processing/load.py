@@ -1,7 +1,16 @@
 # data_processing/load.py
+import json
 import sqlite3
+from datetime import datetime, timezone
 from sqlite3 import Error
 
+from data_processing.counters import counter_table_definitions, missing_counter_tables, seed_counters
+from data_processing.ranks import stat_rank_table_definitions
+from data_processing.documents import write_pokemon_documents
+from data_processing.movesets import move_signature_table_definitions, write_move_signatures
+from data_processing.clustering import cluster_table_definitions
+from data_processing.sketches import sketch_table_definitions, update_sketches
+
 def create_connection(db_file):
     """
     Create a connection to SQLite database with error handling.
@@ -11,7 +20,8 @@ def create_connection(db_file):
 
     conn = None
     try:
-        conn = sqlite3.connect(db_file)
+        # "file:" URIs name e.g. the in-memory read replica
+        conn = sqlite3.connect(db_file, uri=db_file.startswith("file:"))
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
     except sqlite3.Error:
@@ -26,6 +36,25 @@ def create_connection(db_file):
     return None
 
 
+# Detail columns filled in by the move/ability crawler; NULL details_fetched_at
+# marks a row whose resource has not been fetched yet
+RESOURCE_DETAIL_COLUMNS = {
+    "moves": [
+        ("power", "INTEGER"),
+        ("accuracy", "INTEGER"),
+        ("pp", "INTEGER"),
+        ("type_name", "TEXT"),
+        ("damage_class", "TEXT"),
+        ("details_fetched_at", "TEXT"),
+    ],
+    "abilities": [
+        ("short_effect", "TEXT"),
+        ("generation", "TEXT"),
+        ("details_fetched_at", "TEXT"),
+    ],
+}
+
+
 def create_tables(conn):
     """
     Create all required tables in the SQLite database.
@@ -97,15 +126,66 @@ def create_tables(conn):
                 FOREIGN KEY (pokemon_id) REFERENCES pokemon (id),
                 FOREIGN KEY (stat_name) REFERENCES stats (name)
             );
+        """),
+        ("etl_runs", """
+            CREATE TABLE IF NOT EXISTS etl_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT,
+                success_count INTEGER NOT NULL DEFAULT 0,
+                failure_count INTEGER NOT NULL DEFAULT 0
+            );
+        """),
+        ("analysis_snapshots", """
+            CREATE TABLE IF NOT EXISTS analysis_snapshots (
+                run_id INTEGER,
+                graph_name TEXT,
+                title TEXT NOT NULL,
+                chart_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, graph_name),
+                FOREIGN KEY (run_id) REFERENCES etl_runs (id)
+            );
+        """),
+        ("type_effectiveness", """
+            CREATE TABLE IF NOT EXISTS type_effectiveness (
+                attacking_type TEXT NOT NULL,
+                defending_type TEXT NOT NULL,
+                multiplier REAL NOT NULL,
+                PRIMARY KEY (attacking_type, defending_type)
+            );
+        """),
+        ("pokemon_documents", """
+            CREATE TABLE IF NOT EXISTS pokemon_documents (
+                pokemon_id INTEGER PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                encoding TEXT NOT NULL,
+                body BLOB NOT NULL,
+                updated_at TEXT NOT NULL,
+                FOREIGN KEY (pokemon_id) REFERENCES pokemon (id)
+            );
         """)
     ]
 
+    # Aggregate counters kept up to date by triggers on the junction tables
+    table_definitions.extend(counter_table_definitions())
+    # Per-stat rank arrays, rebuilt at the end of each ETL run
+    table_definitions.extend(stat_rank_table_definitions())
+    # Move-set bitsets / MinHash sketches, written by the loader
+    table_definitions.extend(move_signature_table_definitions())
+    # Stat archetype clusters, rebuilt at the end of each ETL run
+    table_definitions.extend(cluster_table_definitions())
+    # Approximate analytics sketches, saved at the end of each ETL run
+    table_definitions.extend(sketch_table_definitions())
+
     cursor = None
     success_count = 0
     total_tables = len(table_definitions)
 
     try:
         cursor = conn.cursor()
+        new_counters = missing_counter_tables(cursor)
         for table_name, sql in table_definitions:
             sql = sql.strip()
             try:
@@ -114,6 +194,26 @@ def create_tables(conn):
             except Error:
                 pass
 
+        # Databases created before a column existed get it added in place
+        for table_name, columns in RESOURCE_DETAIL_COLUMNS.items():
+            try:
+                cursor.execute(f"PRAGMA table_info({table_name})")
+                existing = {row[1] for row in cursor.fetchall()}
+                for column, column_type in columns:
+                    if column not in existing:
+                        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type}")
+            except Error:
+                success_count -= 1
+
+        # Counter tables added to an already-populated database start empty,
+        # and the triggers would make them look authoritative after one insert;
+        # they are filled before anything else writes through this connection
+        if new_counters:
+            try:
+                seed_counters(cursor, new_counters)
+            except Error:
+                success_count -= 1
+
         if success_count == total_tables:
             conn.commit()
         else:
@@ -137,10 +237,14 @@ def create_tables(conn):
             cursor.close()
 
 
-def load_pokemons(conn, transformed_data: dict):
+def load_pokemons(conn, transformed_data: dict, sketches: dict = None):
     """
     Load one Pokémon's transformed data into the database.
-    Idempotent using INSERT OR IGNORE.
+    Idempotent using INSERT OR IGNORE. Also refreshes the Pokémon's
+    pre-rendered document in pokemon_documents when its content changed
+    and its move-set signature in pokemon_move_signatures. Given the ETL
+    run's in-memory analytics sketches, folds its newly inserted rows into
+    them once the load has committed.
     """
     if not conn:
         return False
@@ -180,12 +284,20 @@ def load_pokemons(conn, transformed_data: dict):
                 "INSERT OR IGNORE INTO pokemon (id, name, is_evolved) VALUES (?, ?, ?)",
                 (main["id"], main["name"], main["is_evolved"])
             )
+            is_new_pokemon = cursor.rowcount == 1
         except Error:
             conn.rollback()
             return False
 
         # === 3. Insert Junction Tables ===
         try:
+            if sketches is not None:
+                # Rows that already exist are ignored below and must not be counted again
+                cursor.execute("SELECT move_name FROM pokemon_moves WHERE pokemon_id = ?", (pokemon_id,))
+                known_moves = {row[0] for row in cursor.fetchall()}
+                cursor.execute("SELECT ability_name FROM pokemon_abilities WHERE pokemon_id = ?", (pokemon_id,))
+                known_abilities = {row[0] for row in cursor.fetchall()}
+
             type_data = [(pokemon_id, t) for t in transformed_data.get("types", [])]
             if type_data:
                 cursor.executemany("INSERT OR IGNORE INTO pokemon_types (pokemon_id, type_name) VALUES (?, ?)", type_data)
@@ -205,7 +317,31 @@ def load_pokemons(conn, transformed_data: dict):
             conn.rollback()
             return False
 
+        # === 4. Pre-render API Document ===
+        try:
+            if pokemon_id is not None:
+                write_pokemon_documents(conn, [pokemon_id])
+        except Error:
+            conn.rollback()
+            return False
+
+        # === 5. Move-set Signature ===
+        try:
+            if pokemon_id is not None:
+                write_move_signatures(conn, [pokemon_id])
+        except Error:
+            conn.rollback()
+            return False
+
         conn.commit()
+
+        # === 6. Analytics Sketches ===
+        # Only after the commit, so rolled-back rows are never counted
+        if sketches is not None:
+            update_sketches(sketches, pokemon_id if is_new_pokemon else None, {
+                "moves_frequency": set(transformed_data.get("moves", [])) - known_moves,
+                "abilities_frequency": set(transformed_data.get("abilities", [])) - known_abilities,
+            })
         return True
     except Exception:
         try:
@@ -215,4 +351,122 @@ def load_pokemons(conn, transformed_data: dict):
         return False
     finally:
         if cursor:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
+
+
+def load_type_effectiveness(conn, matchups: list, attacking_types: list) -> bool:
+    """
+    Store the damage multipliers of the given attacking types.
+    matchups holds the non-neutral (attacking_type, defending_type, multiplier)
+    rows; every other pair between known types is stored as 1.0, so the table
+    always holds a full type x type matrix.
+    """
+    if not conn:
+        return False
+    if not attacking_types:
+        return True
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT attacking_type FROM type_effectiveness")
+        attackers = {row[0] for row in cursor.fetchall()} | set(attacking_types)
+        defenders = attackers | {row[1] for row in matchups}
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO types (name) VALUES (?)",
+            [(name,) for name in sorted(defenders)]
+        )
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO type_effectiveness (attacking_type, defending_type, multiplier)
+            VALUES (?, ?, 1.0)
+            """,
+            [(a, d) for a in sorted(attackers) for d in sorted(defenders)]
+        )
+        # Freshly fetched attackers are rewritten in full, so a matchup that
+        # became neutral does not keep its old multiplier
+        cursor.execute(
+            """
+            UPDATE type_effectiveness SET multiplier = 1.0
+            WHERE attacking_type IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(sorted(set(attacking_types))),)
+        )
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO type_effectiveness (attacking_type, defending_type, multiplier)
+            VALUES (?, ?, ?)
+            """,
+            [row for row in matchups if row[0] in attackers]
+        )
+        conn.commit()
+        return True
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def get_missing_resource_details(conn, table: str) -> list:
+    """
+    Names in moves/abilities whose details have not been fetched yet.
+    Returns list of names, or [] on error.
+    """
+    if not conn or table not in RESOURCE_DETAIL_COLUMNS:
+        return []
+
+    try:
+        return [
+            row[0] for row in conn.execute(
+                f"SELECT name FROM {table} WHERE details_fetched_at IS NULL ORDER BY name"
+            )
+        ]
+    except Error:
+        return []
+
+
+def load_resource_details(conn, table: str, details: list) -> bool:
+    """
+    Store transformed move/ability details (dicts keyed by column name,
+    see RESOURCE_DETAIL_COLUMNS) and stamp them as fetched, so re-runs
+    skip them.
+    """
+    if not conn or table not in RESOURCE_DETAIL_COLUMNS:
+        return False
+    if not details:
+        return True
+
+    columns = [name for name, _ in RESOURCE_DETAIL_COLUMNS[table] if name != "details_fetched_at"]
+    assignments = ", ".join(f"{column} = :{column}" for column in columns)
+    fetched_at = datetime.now(timezone.utc).isoformat()
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(
+            f"""
+            UPDATE {table} SET {assignments}, details_fetched_at = :details_fetched_at
+            WHERE name = :name
+            """,
+            [
+                {**{column: row.get(column) for column in columns}, "name": row["name"], "details_fetched_at": fetched_at}
+                for row in details
+            ]
+        )
+        conn.commit()
+        return True
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
@@ -0,0 +1,376 @@
+import heapq
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from data_processing.cache import GenerationCache
+from data_processing.replica import read_only_connection
+from constants import TEAM_SIZE, TEAM_SEARCH_WORKERS, TEAM_SEARCH_NODE_LIMIT
+
+# Below this many candidate typings the search finishes faster than a process pool starts
+_PARALLEL_MIN_CANDIDATES = 40
+
+_chart_cache = GenerationCache()
+
+
+def _shared_weakness_threshold(team_size: int) -> int:
+    # A weakness is "shared" once at least half the team has it
+    return (team_size + 1) // 2
+
+
+class TypeChart:
+    """
+    Type effectiveness matrix (attacking x defending) with vectorized team
+    coverage scoring. A Pokémon's typing is a profile of two type indices;
+    mono-typed Pokémon use the neutral pseudo-type len(type_names) as
+    their second type.
+    """
+
+    def __init__(self, type_names: List[str], matrix):
+        self.type_names = list(type_names)
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.index = {name: i for i, name in enumerate(self.type_names)}
+
+        size = len(self.type_names)
+        # Pseudo-type row of zeros never wins a max; column of ones is neutral in a product
+        self._attack = np.vstack([self.matrix, np.zeros((1, size))])
+        self._defend = np.hstack([self.matrix, np.ones((size, 1))])
+
+    def __len__(self) -> int:
+        return len(self.type_names)
+
+    def profile(self, types: List[str]) -> Tuple[int, int]:
+        known = sorted(self.index[t] for t in types if t in self.index)[:2]
+        known += [len(self)] * (2 - len(known))
+        return tuple(known)
+
+    def offense(self, profiles) -> np.ndarray:
+        """Best same-type attack multiplier of each profile against each defending type."""
+        profiles = np.asarray(profiles).reshape(-1, 2)
+        return np.maximum(self._attack[profiles[:, 0]], self._attack[profiles[:, 1]])
+
+    def defense(self, profiles) -> np.ndarray:
+        """Damage multiplier each profile takes from each attacking type."""
+        profiles = np.asarray(profiles).reshape(-1, 2)
+        return (self._defend[:, profiles[:, 0]] * self._defend[:, profiles[:, 1]]).T
+
+    def score_teams(self, teams) -> Dict[str, np.ndarray]:
+        """
+        Score many teams at once. teams is an (n_teams x team_size x 2) array
+        of profiles. Per team:
+            offensive: share of defending types some member hits super-effectively
+            defensive: share of attacking types some member resists
+            shared_weakness: share of attacking types at least half the team is weak to
+            score: offensive + defensive - shared_weakness
+        """
+        teams = np.asarray(teams)
+        n_teams, team_size = teams.shape[:2]
+        offense = self.offense(teams).reshape(n_teams, team_size, len(self)).max(axis=1)
+        defense = self.defense(teams).reshape(n_teams, team_size, len(self))
+
+        offensive = (offense >= 2).mean(axis=1)
+        defensive = (defense < 1).any(axis=1).mean(axis=1)
+        shared = ((defense > 1).sum(axis=1) >= _shared_weakness_threshold(team_size)).mean(axis=1)
+        return {
+            "offensive": offensive,
+            "defensive": defensive,
+            "shared_weakness": shared,
+            "score": offensive + defensive - shared,
+        }
+
+    def team_report(self, member_types: List[List[str]]) -> Dict:
+        """
+        Coverage breakdown of one team given each member's types.
+        """
+        profiles = np.array([[self.profile(types) for types in member_types]])
+        scores = {key: round(float(value[0]), 4) for key, value in self.score_teams(profiles).items()}
+
+        offense = self.offense(profiles).max(axis=0)
+        defense = self.defense(profiles)
+        weak_counts = (defense > 1).sum(axis=0)
+        return {
+            **scores,
+            "super_effective_against": [t for t, m in zip(self.type_names, offense) if m >= 2],
+            "not_covered": [t for t, m in zip(self.type_names, offense) if m < 2],
+            "resisted": [t for t, r in zip(self.type_names, (defense < 1).any(axis=0)) if r],
+            "weaknesses": {t: int(c) for t, c in zip(self.type_names, weak_counts) if c},
+        }
+
+    def masks(self, profiles) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Offense, resistance and weakness of each profile as bitmasks over
+        type indices, for the combinatorial team search.
+        """
+        bits = 1 << np.arange(len(self), dtype=np.int64)
+        offense = self.offense(profiles) >= 2
+        defense = self.defense(profiles)
+        return (
+            (offense.astype(np.int64) @ bits).tolist(),
+            ((defense < 1).astype(np.int64) @ bits).tolist(),
+            ((defense > 1).astype(np.int64) @ bits).tolist(),
+        )
+
+
+def load_type_chart(conn) -> TypeChart:
+    """
+    Build the TypeChart from type_effectiveness. Pairs missing from the
+    table are neutral (1.0).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT attacking_type, defending_type, multiplier FROM type_effectiveness")
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    type_names = sorted({row[0] for row in rows})
+    index = {name: i for i, name in enumerate(type_names)}
+    matrix = np.ones((len(type_names), len(type_names)))
+    for attacking_type, defending_type, multiplier in rows:
+        if defending_type in index:
+            matrix[index[attacking_type], index[defending_type]] = multiplier
+    return TypeChart(type_names, matrix)
+
+
+def load_pokemon_types(conn) -> Dict[str, List[str]]:
+    """
+    Map each Pokémon name to its types in slot order.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT p.name, pt.type_name
+            FROM pokemon p
+            JOIN pokemon_types pt ON pt.pokemon_id = p.id
+            ORDER BY p.id, pt.rowid
+        """)
+        types_of = {}
+        for name, type_name in cursor.fetchall():
+            types_of.setdefault(name, []).append(type_name)
+        return types_of
+    finally:
+        cursor.close()
+
+
+def get_matchup_data(db_file: str, generation: str) -> Tuple[TypeChart, Dict[str, List[str]]]:
+    """
+    Return (TypeChart, Pokémon types) for the given dataset generation.
+    """
+    data = _chart_cache.get("matchups", generation)
+    if data is None:
+        try:
+            conn = read_only_connection(db_file)
+        except sqlite3.OperationalError:
+            # No database yet: an empty chart, reported as not loaded
+            data = (TypeChart([], np.empty((0, 0))), {})
+        else:
+            try:
+                data = (load_type_chart(conn), load_pokemon_types(conn))
+            finally:
+                conn.close()
+        _chart_cache.set("matchups", generation, data)
+    return data
+
+
+def _add_weakness(levels: Tuple[int, ...], weak: int) -> Tuple[int, ...]:
+    # levels[j] is the set of types at least j+1 members are weak to
+    return tuple(
+        levels[j] | (weak if j == 0 else levels[j - 1] & weak)
+        for j in range(len(levels))
+    )
+
+
+def _mask_score(state) -> int:
+    off_mask, res_mask, levels = state
+    return off_mask.bit_count() + res_mask.bit_count() - levels[-1].bit_count()
+
+
+def _beam_search(off, res, weak, base, slots: int, k: int, width: int = 32) -> List[Tuple[int, Tuple[int, ...]]]:
+    """
+    Quick approximate search keeping the best `width` partial teams per step.
+    Its top k teams seed the exact search, so that search only explores
+    branches that can beat them and always has an answer if it stops early.
+    """
+    beam = [(base, ())]
+    for _ in range(slots):
+        expanded = []
+        for (off_mask, res_mask, levels), chosen in beam:
+            start = chosen[-1] + 1 if chosen else 0
+            for i in range(start, len(off)):
+                state = (off_mask | off[i], res_mask | res[i], _add_weakness(levels, weak[i]))
+                expanded.append((state, chosen + (i,)))
+        expanded.sort(key=lambda item: -_mask_score(item[0]))
+        beam = expanded[:max(width, k)]
+    return [(_mask_score(state), chosen) for state, chosen in beam[:k]]
+
+
+def _search_task(payload) -> Tuple[List[Tuple[int, Tuple[int, ...]]], bool]:
+    """
+    Branch-and-bound over teams whose first chosen candidate is one of
+    payload["first"]. Runs in a worker process.
+    Returns (top-k (score, candidate indices) pairs, whether the search was exhaustive).
+    """
+    off, res, weak = payload["off"], payload["res"], payload["weak"]
+    slots, k, node_limit = payload["slots"], payload["k"], payload["node_limit"]
+    count = len(off)
+
+    # suffix_*[i]: union of the masks of candidates i.. — the most any completion can add
+    suffix_off = [0] * (count + 1)
+    suffix_res = [0] * (count + 1)
+    for i in range(count - 1, -1, -1):
+        suffix_off[i] = suffix_off[i + 1] | off[i]
+        suffix_res[i] = suffix_res[i + 1] | res[i]
+
+    heap = list(payload["seed"])
+    heapq.heapify(heap)
+    in_heap = {team for _, team in heap}
+    nodes = 0
+    exhaustive = True
+
+    def consider(i, off_mask, res_mask, levels, chosen, remaining):
+        # Add candidate i to the partial team; remaining counts i itself
+        nonlocal nodes, exhaustive
+        nodes += 1
+        if nodes > node_limit:
+            exhaustive = False
+            return
+
+        o, r, lv = off_mask | off[i], res_mask | res[i], _add_weakness(levels, weak[i])
+        penalty = lv[-1].bit_count()
+        if remaining > 1:
+            bound = (o | suffix_off[i + 1]).bit_count() + (r | suffix_res[i + 1]).bit_count() - penalty
+        else:
+            bound = o.bit_count() + r.bit_count() - penalty
+        if len(heap) == k and bound <= heap[0][0]:
+            return
+
+        team = chosen + (i,)
+        if remaining > 1:
+            for j in range(i + 1, count - remaining + 2):
+                consider(j, o, r, lv, team, remaining - 1)
+                if not exhaustive:
+                    return
+        elif team not in in_heap:
+            in_heap.add(team)
+            if len(heap) < k:
+                heapq.heappush(heap, (bound, team))
+            else:
+                in_heap.discard(heapq.heapreplace(heap, (bound, team))[1])
+
+    base = payload["base"]
+    for first in payload["first"]:
+        consider(first, *base, (), slots)
+        if not exhaustive:
+            break
+
+    return heap, exhaustive
+
+
+def search_teams(
+    chart: TypeChart,
+    pokemon_types: Dict[str, List[str]],
+    required: List[str] = (),
+    pool: List[str] = None,
+    limit: int = 5,
+    team_size: int = TEAM_SIZE,
+    workers: int = TEAM_SEARCH_WORKERS,
+    node_limit: int = TEAM_SEARCH_NODE_LIMIT
+) -> Dict:
+    """
+    Find the teams with the best coverage score (see TypeChart.score_teams)
+    that contain every required Pokémon, filled from pool (default: every
+    Pokémon). Members are compared by typing, so no two members share the
+    same type profile.
+
+    The search enumerates type profiles with branch-and-bound on bitmasks:
+    a partial team is dropped once even adding every remaining candidate's
+    coverage could not beat the current k-th best, starting from the teams
+    of a quick beam search. Top-level branches are spread over worker
+    processes. Each worker stops after node_limit partial teams; the best
+    teams found so far are returned with exhaustive=False in that case.
+    """
+    required_names: Dict[Tuple[int, int], List[str]] = {}
+    for name in required:
+        required_names.setdefault(chart.profile(pokemon_types.get(name, [])), []).append(name)
+    required_profiles = list(required_names)
+
+    names_of: Dict[Tuple[int, int], List[str]] = {}
+    for name in (pool if pool is not None else pokemon_types):
+        profile = chart.profile(pokemon_types.get(name, []))
+        if profile not in required_profiles:
+            names_of.setdefault(profile, []).append(name)
+
+    candidates = sorted(names_of)
+    slots = min(team_size - len(required_profiles), len(candidates))
+    result = {"teams": [], "candidates": len(candidates), "exhaustive": True}
+    if team_size - len(required_profiles) < 0 or limit <= 0:
+        return result
+
+    levels = (0,) * _shared_weakness_threshold(len(required_profiles) + slots)
+    off_mask = res_mask = 0
+    if required_profiles:
+        req_off, req_res, req_weak = chart.masks(required_profiles)
+        for o, r, w in zip(req_off, req_res, req_weak):
+            off_mask, res_mask, levels = off_mask | o, res_mask | r, _add_weakness(levels, w)
+
+    found = []
+    if slots > 0:
+        off, res, weak = chart.masks(candidates)
+        seed = _beam_search(off, res, weak, (off_mask, res_mask, levels), slots, limit)
+        first = list(range(len(candidates) - slots + 1))
+        if len(candidates) < _PARALLEL_MIN_CANDIDATES:
+            workers = 1
+        workers = max(1, min(workers, os.cpu_count() or 1, len(first)))
+        payloads = [
+            {
+                "off": off, "res": res, "weak": weak,
+                "base": (off_mask, res_mask, levels),
+                "first": first[w::workers],
+                "slots": slots,
+                "k": limit,
+                "seed": seed,
+                "node_limit": node_limit,
+            }
+            for w in range(workers)
+        ]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(_search_task, payloads))
+        else:
+            outcomes = [_search_task(payloads[0])]
+
+        for heap, exhaustive in outcomes:
+            found.extend(heap)
+            result["exhaustive"] &= exhaustive
+        # Every worker starts from the same seed teams
+        found = sorted(set(found), key=lambda item: (-item[0], item[1]))[:limit]
+    elif required_profiles:
+        found = [(None, ())]
+
+    if not found:
+        return result
+
+    # Final scores come from the matrix engine, so they match /team/coverage exactly
+    teams = np.array([required_profiles + [candidates[i] for i in chosen] for _, chosen in found])
+    scores = chart.score_teams(teams.reshape(len(found), -1, 2))
+    for t, (_, chosen) in enumerate(found):
+        members = [
+            {"types": _profile_types(chart, p), "pokemon": required_names[p], "required": True}
+            for p in required_profiles
+        ]
+        members += [
+            {"types": _profile_types(chart, candidates[i]), "pokemon": names_of[candidates[i]]}
+            for i in chosen
+        ]
+        result["teams"].append({
+            **{key: round(float(value[t]), 4) for key, value in scores.items()},
+            "members": members,
+        })
+    return result
+
+
+def _profile_types(chart: TypeChart, profile: Tuple[int, int]) -> List[str]:
+    return [chart.type_names[i] for i in profile if i < len(chart)]
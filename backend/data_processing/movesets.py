@@ -0,0 +1,309 @@
+import json
+import sqlite3
+from collections import defaultdict
+from functools import lru_cache
+from sqlite3 import Error
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from data_processing.cache import GenerationCache
+from data_processing.replica import read_only_connection
+from constants import MINHASH_PERMUTATIONS, LSH_BANDS, MOVESET_PAIR_THRESHOLD
+
+# MinHash uses h(x) = (a*x + b) mod p over move rowids. With p < 2^31 the
+# products fit in uint64, and the fixed seed keeps stored signatures
+# comparable across processes and ETL runs.
+_PRIME = (1 << 31) - 1
+_MINHASH_SEED = 2024
+
+_index_cache = GenerationCache()
+
+
+@lru_cache(maxsize=None)
+def _hash_parameters(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(_MINHASH_SEED)
+    a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(move_ids: List[int], num_perm: int = MINHASH_PERMUTATIONS) -> np.ndarray:
+    """
+    MinHash sketch of a set of move ids: the minimum of num_perm hash
+    functions over the set. Two sketches agree in a given position with
+    probability equal to the Jaccard similarity of the sets.
+    """
+    if not move_ids:
+        return np.full(num_perm, _PRIME, dtype=np.uint32)
+    a, b = _hash_parameters(num_perm)
+    x = np.asarray(move_ids, dtype=np.uint64)
+    return ((a[:, None] * x[None, :] + b[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def move_bitset(move_ids: List[int]) -> bytes:
+    """
+    Bitset over move ids (bit i set when the move with rowid i is learnable),
+    stored little-endian so it round-trips through int.from_bytes.
+    """
+    bits = 0
+    for move_id in move_ids:
+        bits |= 1 << move_id
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def move_signature_table_definitions():
+    """
+    DDL for the per-Pokémon move-set signatures, in the (name, sql) format
+    used by create_tables.
+    """
+    return [
+        ("pokemon_move_signatures", """
+            CREATE TABLE IF NOT EXISTS pokemon_move_signatures (
+                pokemon_id INTEGER PRIMARY KEY,
+                move_count INTEGER NOT NULL,
+                bitset BLOB NOT NULL,
+                minhash BLOB NOT NULL,
+                FOREIGN KEY (pokemon_id) REFERENCES pokemon (id)
+            );
+        """),
+        ("move_set_pairs", """
+            CREATE TABLE IF NOT EXISTS move_set_pairs (
+                pokemon_a INTEGER NOT NULL,
+                pokemon_b INTEGER NOT NULL,
+                shared_moves INTEGER NOT NULL,
+                jaccard REAL NOT NULL,
+                PRIMARY KEY (pokemon_a, pokemon_b)
+            );
+        """),
+    ]
+
+
+def write_move_signatures(conn, pokemon_ids: List[int]) -> int:
+    """
+    Compute the move bitset and MinHash sketch of the given Pokémon and
+    store them in pokemon_move_signatures.
+    Runs inside the caller's transaction (no commit).
+    Returns the number of signatures written.
+    """
+    if not conn or not pokemon_ids:
+        return 0
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT pm.pokemon_id, m.rowid
+            FROM pokemon_moves pm
+            JOIN moves m ON m.name = pm.move_name
+            WHERE pm.pokemon_id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps([int(i) for i in pokemon_ids]),)
+        )
+        moves_of = defaultdict(list)
+        for pokemon_id, move_id in cursor.fetchall():
+            moves_of[pokemon_id].append(move_id)
+
+        rows = [
+            (
+                int(pokemon_id),
+                len(moves_of[pokemon_id]),
+                move_bitset(moves_of[pokemon_id]),
+                minhash_signature(moves_of[pokemon_id]).tobytes()
+            )
+            for pokemon_id in pokemon_ids
+        ]
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO pokemon_move_signatures (pokemon_id, move_count, bitset, minhash)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows
+        )
+        return len(rows)
+    finally:
+        cursor.close()
+
+
+def backfill_move_signatures(conn) -> int:
+    """
+    Write signatures for Pokémon loaded before signatures existed.
+    Returns the number of signatures written, or -1 on error.
+    """
+    if not conn:
+        return -1
+
+    try:
+        missing = [
+            row[0] for row in conn.execute("""
+                SELECT id FROM pokemon
+                WHERE id NOT IN (SELECT pokemon_id FROM pokemon_move_signatures)
+            """)
+        ]
+        written = write_move_signatures(conn, missing)
+        conn.commit()
+        return written
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return -1
+
+
+class MoveSetIndex:
+    """
+    Locality-sensitive index over MinHash move-set sketches.
+    Sketches are cut into LSH_BANDS bands; Pokémon sharing any band land in
+    the same bucket and become candidates, which are then scored exactly
+    with a popcount over their move bitsets. Pairs with high Jaccard
+    similarity collide with high probability, dissimilar ones rarely do.
+    """
+
+    def __init__(self, rows: List[Tuple[int, str, int, bytes, bytes]], bands: int = LSH_BANDS):
+        rows = [row for row in rows if row[2] > 0]
+        self.ids = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        self.bitsets = [int.from_bytes(row[3], "little") for row in rows]
+        self._row_of = {pokemon_id: i for i, pokemon_id in enumerate(self.ids)}
+        self._row_of_name = {name: i for i, name in enumerate(self.names)}
+
+        self.buckets: List[Dict[bytes, List[int]]] = []
+        self._band_keys: List[List[bytes]] = []
+        if rows:
+            signatures = np.array([np.frombuffer(row[4], dtype=np.uint32) for row in rows])
+            for band in np.array_split(signatures, bands, axis=1):
+                keys = [band_row.tobytes() for band_row in band]
+                buckets = defaultdict(list)
+                for position, key in enumerate(keys):
+                    buckets[key].append(position)
+                self._band_keys.append(keys)
+                self.buckets.append(buckets)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row_of(self, name_or_id: str):
+        if str(name_or_id).isdigit():
+            return self._row_of.get(int(name_or_id))
+        return self._row_of_name.get(str(name_or_id).lower())
+
+    def candidates(self, position: int) -> set:
+        found = set()
+        for band, buckets in enumerate(self.buckets):
+            found.update(buckets[self._band_keys[band][position]])
+        found.discard(position)
+        return found
+
+    def _score(self, i: int, j: int) -> Tuple[int, float]:
+        shared = (self.bitsets[i] & self.bitsets[j]).bit_count()
+        return shared, shared / (self.bitsets[i] | self.bitsets[j]).bit_count()
+
+    def shares_most_moves(self, name_or_id: str, k: int = 10):
+        """
+        The k Pokémon whose move sets overlap most with the given one
+        (highest Jaccard similarity). LSH candidates are scored exactly;
+        if they are fewer than k the rest are filled in by a full scan.
+        Returns list of {id, name, shared_moves, jaccard}, or None if the
+        Pokémon has no moves indexed.
+        """
+        position = self.row_of(name_or_id)
+        if position is None:
+            return None
+
+        candidates = self.candidates(position)
+        if len(candidates) < k:
+            candidates = set(range(len(self.ids))) - {position}
+
+        scored = [(j, *self._score(position, j)) for j in candidates]
+        scored.sort(key=lambda item: (-item[2], -item[1], self.ids[item[0]]))
+        return [
+            {"id": self.ids[j], "name": self.names[j], "shared_moves": shared, "jaccard": round(jaccard, 4)}
+            for j, shared, jaccard in scored[:k]
+        ]
+
+    def similar_pairs(self, threshold: float = MOVESET_PAIR_THRESHOLD) -> List[Tuple[int, int, int, float]]:
+        """
+        All pairs with Jaccard similarity >= threshold, found by scoring only
+        pairs that share an LSH bucket instead of all n^2 pairs.
+        Returns list of (pokemon_a, pokemon_b, shared_moves, jaccard) with pokemon_a < pokemon_b.
+        """
+        seen = set()
+        pairs = []
+        for buckets in self.buckets:
+            for members in buckets.values():
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        pair = (members[x], members[y])
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        shared, jaccard = self._score(*pair)
+                        if jaccard >= threshold:
+                            a, b = sorted((self.ids[pair[0]], self.ids[pair[1]]))
+                            pairs.append((a, b, shared, jaccard))
+        return sorted(pairs)
+
+
+def build_move_set_index(conn) -> MoveSetIndex:
+    """
+    Build a MoveSetIndex from the stored move-set signatures.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT s.pokemon_id, p.name, s.move_count, s.bitset, s.minhash
+            FROM pokemon_move_signatures s
+            JOIN pokemon p ON p.id = s.pokemon_id
+            ORDER BY s.pokemon_id
+        """)
+        return MoveSetIndex(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def get_move_set_index(db_file: str, generation: str) -> MoveSetIndex:
+    """
+    Return the move-set index for the given dataset generation, rebuilt
+    once after each ETL run (or any other write).
+    """
+    index = _index_cache.get("movesets", generation)
+    if index is None:
+        try:
+            conn = read_only_connection(db_file)
+        except sqlite3.OperationalError:
+            # No database yet: every lookup misses
+            index = MoveSetIndex([])
+        else:
+            try:
+                index = build_move_set_index(conn)
+            finally:
+                conn.close()
+        _index_cache.set("movesets", generation, index)
+    return index
+
+
+def materialize_move_set_pairs(conn, threshold: float = MOVESET_PAIR_THRESHOLD) -> int:
+    """
+    Batch all-pairs job: store every pair of Pokémon whose move sets have
+    Jaccard similarity >= threshold in move_set_pairs.
+    Returns the number of pairs stored, or -1 on error.
+    """
+    if not conn:
+        return -1
+
+    try:
+        pairs = build_move_set_index(conn).similar_pairs(threshold)
+        conn.execute("DELETE FROM move_set_pairs")
+        conn.executemany(
+            "INSERT INTO move_set_pairs (pokemon_a, pokemon_b, shared_moves, jaccard) VALUES (?, ?, ?, ?)",
+            pairs
+        )
+        conn.commit()
+        return len(pairs)
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return -1
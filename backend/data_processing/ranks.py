@@ -0,0 +1,180 @@
+from sqlite3 import Error
+from typing import Dict, List
+
+# Pseudo-stat holding each Pokémon's base stat total
+STAT_TOTAL = "total"
+
+# type_name used for the ranking over every Pokémon
+ALL_TYPES = ""
+
+# Ranks every (stat, type) group once: position 1..n by value (ties broken by
+# id) and the percentage of the group whose value is at or below this one.
+# Each Pokémon is ranked once overall and once within each of its types.
+_RANKED_QUERY = f"""
+    WITH stat_values AS (
+        SELECT pokemon_id, stat_name, base_stat AS value FROM pokemon_stats
+        UNION ALL
+        SELECT pokemon_id, '{STAT_TOTAL}', SUM(base_stat) FROM pokemon_stats GROUP BY pokemon_id
+    ),
+    scoped AS (
+        SELECT pokemon_id, stat_name, '{ALL_TYPES}' AS type_name, value FROM stat_values
+        UNION ALL
+        SELECT v.pokemon_id, v.stat_name, pt.type_name, v.value
+        FROM stat_values v
+        JOIN pokemon_types pt ON pt.pokemon_id = v.pokemon_id
+    )
+    SELECT
+        stat_name,
+        type_name,
+        ROW_NUMBER() OVER (PARTITION BY stat_name, type_name ORDER BY value DESC, pokemon_id) AS rank,
+        pokemon_id,
+        value,
+        ROUND(100.0 * CUME_DIST() OVER (PARTITION BY stat_name, type_name ORDER BY value), 2) AS percentile
+    FROM scoped
+"""
+
+
+def stat_rank_table_definitions():
+    """
+    DDL for the precomputed rank table, in the (name, sql) format used by create_tables.
+    The primary key stores each group as a contiguous rank array, so a
+    top-N query is an index range scan instead of a sort.
+    """
+    return [
+        ("stat_ranks", """
+            CREATE TABLE IF NOT EXISTS stat_ranks (
+                stat_name TEXT NOT NULL,
+                type_name TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                pokemon_id INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                percentile REAL NOT NULL,
+                PRIMARY KEY (stat_name, type_name, rank)
+            ) WITHOUT ROWID;
+        """),
+        ("idx_stat_ranks_pokemon", """
+            CREATE INDEX IF NOT EXISTS idx_stat_ranks_pokemon
+            ON stat_ranks (pokemon_id, type_name);
+        """),
+    ]
+
+
+def rebuild_stat_ranks(conn) -> bool:
+    """
+    Recompute every stat ranking from pokemon_stats and pokemon_types.
+    Runs at the end of each ETL run; the swap happens in one transaction
+    so readers never see a half-built ranking.
+    """
+    if not conn:
+        return False
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM stat_ranks")
+        cursor.execute(
+            "INSERT INTO stat_ranks (stat_name, type_name, rank, pokemon_id, value, percentile) "
+            + _RANKED_QUERY
+        )
+        conn.commit()
+        return True
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def _ranks_source(cursor) -> str:
+    # Databases that have not finished an ETL run since stat_ranks was added
+    # are ranked on the fly with the same query
+    try:
+        cursor.execute("SELECT 1 FROM stat_ranks LIMIT 1")
+        if cursor.fetchone():
+            return "stat_ranks"
+    except Error:
+        pass
+    return f"({_RANKED_QUERY})"
+
+
+def get_leaderboard(conn, stat_name: str, type_name: str = None, limit: int = 20, offset: int = 0) -> List[Dict]:
+    """
+    Top Pokémon by one stat (or STAT_TOTAL), optionally within one type.
+    Reads positions offset+1 .. offset+limit of the precomputed rank array.
+    Returns list of {rank, id, name, value, percentile}.
+    """
+    if not conn or not stat_name or limit <= 0:
+        return []
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        source = _ranks_source(cursor)
+        cursor.execute(
+            f"""
+            SELECT r.rank, r.pokemon_id, p.name, r.value, r.percentile
+            FROM {source} r
+            JOIN pokemon p ON p.id = r.pokemon_id
+            WHERE r.stat_name = ? AND r.type_name = ? AND r.rank > ? AND r.rank <= ?
+            ORDER BY r.rank
+            """,
+            (stat_name.lower(), (type_name or ALL_TYPES).lower(), offset, offset + limit)
+        )
+        return [
+            {"rank": row[0], "id": row[1], "name": row[2], "value": row[3], "percentile": row[4]}
+            for row in cursor.fetchall()
+        ]
+    except Error:
+        return []
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def get_stat_percentiles(conn, name_or_id: str, type_name: str = None):
+    """
+    Rank and percentile of every stat of one Pokémon, among all Pokémon or
+    within one type. Returns {id, name, type, stats: {stat: {value, rank,
+    out_of, percentile}}}, or None if the Pokémon does not exist.
+    """
+    if not conn or not name_or_id:
+        return None
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        if str(name_or_id).isdigit():
+            cursor.execute("SELECT id, name FROM pokemon WHERE id = ?", (int(name_or_id),))
+        else:
+            cursor.execute("SELECT id, name FROM pokemon WHERE name = ?", (str(name_or_id).lower(),))
+        pokemon = cursor.fetchone()
+        if not pokemon:
+            return None
+
+        source = _ranks_source(cursor)
+        scope = (type_name or ALL_TYPES).lower()
+        cursor.execute(
+            f"""
+            SELECT r.stat_name, r.value, r.rank, r.percentile, (
+                SELECT MAX(g.rank) FROM {source} g
+                WHERE g.stat_name = r.stat_name AND g.type_name = r.type_name
+            )
+            FROM {source} r
+            WHERE r.pokemon_id = ? AND r.type_name = ?
+            """,
+            (pokemon[0], scope)
+        )
+        stats = {
+            row[0]: {"value": row[1], "rank": row[2], "out_of": row[4], "percentile": row[3]}
+            for row in cursor.fetchall()
+        }
+        return {"id": pokemon[0], "name": pokemon[1], "type": scope or None, "stats": stats}
+    except Error:
+        return None
+    finally:
+        if cursor:
+            cursor.close()
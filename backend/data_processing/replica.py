@@ -0,0 +1,141 @@
+# data_processing/replica.py
+import itertools
+import os
+import sqlite3
+import threading
+
+from data_processing.cache import get_dataset_generation
+from constants import READ_REPLICA
+
+_replica_names = itertools.count(1)
+
+
+class ReadReplica:
+    """
+    In-memory copy of a database file for read-only request traffic.
+
+    Each refresh copies the file with SQLite's backup API into a new
+    shared-cache in-memory database and then points new readers at it.
+    Readers still on the previous copy keep it alive through their own
+    connections, so a refresh never blocks or disturbs in-flight queries.
+    The previous copy is also held open until the next refresh, so a
+    reader that looked up its URI just before a swap still finds it.
+    The copy is refreshed whenever the file's dataset generation changes,
+    i.e. after every ETL commit or blue/green swap.
+    """
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self.uri = None
+        self.generation = None
+        # Keep the current and previous in-memory databases alive between requests
+        self._anchor = None
+        self._retired = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> bool:
+        """
+        Copy the database file into a fresh in-memory database if it
+        changed since the last copy. Returns False if there is nothing to copy.
+        """
+        generation = get_dataset_generation(self.db_file)
+        if generation == self.generation:
+            return True
+
+        with self._lock:
+            if generation == self.generation:
+                return True
+            if not os.path.exists(self.db_file):
+                return False
+
+            uri = f"file:replica-{next(_replica_names)}?mode=memory&cache=shared"
+            anchor = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            source = None
+            try:
+                source = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True)
+                source.backup(anchor)
+            except sqlite3.Error:
+                anchor.close()
+                return False
+            finally:
+                if source:
+                    source.close()
+
+            expired = self._retired
+            self._retired = self._anchor
+            self._anchor, self.uri, self.generation = anchor, uri, generation
+
+        if expired:
+            expired.close()
+        return True
+
+    def target(self) -> str:
+        """
+        Database readers should open: the in-memory copy, or the file itself
+        if it could not be copied.
+        """
+        if self.refresh() and self.uri:
+            return self.uri
+        return self.db_file
+
+    def close(self) -> None:
+        with self._lock:
+            for anchor in (self._anchor, self._retired):
+                if anchor:
+                    anchor.close()
+            self._anchor = self._retired = self.uri = self.generation = None
+
+
+_replicas = {}
+_replicas_lock = threading.Lock()
+
+
+def get_replica(db_file: str) -> ReadReplica:
+    with _replicas_lock:
+        replica = _replicas.get(db_file)
+        if replica is None:
+            replica = _replicas[db_file] = ReadReplica(db_file)
+        return replica
+
+
+def refresh_replica(db_file: str) -> bool:
+    """
+    Load (or reload) the in-memory replica of db_file now, e.g. at startup
+    or right after an ETL run, instead of on the next request.
+    No-op returning False when replica mode is off.
+    """
+    if not READ_REPLICA:
+        return False
+    return get_replica(db_file).refresh()
+
+
+def read_database(db_file: str) -> str:
+    """
+    The database request handlers should read: the in-memory replica URI
+    in replica mode, db_file itself otherwise. Pass it to read_connection
+    or create_connection, which both accept either.
+    """
+    if not READ_REPLICA:
+        return db_file
+    return get_replica(db_file).target()
+
+
+def read_connection(db_file: str) -> sqlite3.Connection:
+    """
+    Open a connection for a read-only request against db_file, served from
+    the in-memory replica in replica mode.
+    """
+    target = read_database(db_file)
+    return sqlite3.connect(target, uri=target.startswith("file:"))
+
+
+def read_only_connection(db_file: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Like read_connection, but outside replica mode the file is opened
+    read-only, so a missing database raises sqlite3.OperationalError
+    instead of being created empty.
+    """
+    target = read_database(db_file)
+    if not target.startswith("file:"):
+        target = f"file:{target}?mode=ro"
+    return sqlite3.connect(target, uri=True, check_same_thread=check_same_thread)
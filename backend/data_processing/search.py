@@ -0,0 +1,175 @@
+import sqlite3
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from data_processing.cache import GenerationCache
+from data_processing.shared_cache import get_shared_cache
+from data_processing.replica import read_only_connection
+
+# Match tiers, best first
+PREFIX, SUBSTRING, FUZZY = "prefix", "substring", "fuzzy"
+_TIER_RANK = {PREFIX: 0, SUBSTRING: 1, FUZZY: 2}
+
+_index_cache = GenerationCache()
+
+
+def _normalize(text: str) -> str:
+    return "-".join(text.strip().lower().split())
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _bounded_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Edit distance between a and b, or max_distance + 1 once it is certain
+    to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            )
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _max_typos(query: str) -> int:
+    if len(query) <= 4:
+        return 1
+    if len(query) <= 8:
+        return 2
+    return 3
+
+
+class NameIndex:
+    """
+    In-memory name index supporting prefix, substring and typo-tolerant search.
+    Prefix lookups bisect a sorted name list; substring and fuzzy lookups
+    narrow candidates through a trigram inverted index before verifying.
+    """
+
+    def __init__(self, rows: List[Tuple[int, str]]):
+        entries = sorted((name.lower(), pokemon_id) for pokemon_id, name in rows)
+        self.names = [name for name, _ in entries]
+        self.ids = [pokemon_id for _, pokemon_id in entries]
+        self.postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for gram in _trigrams(name):
+                self.postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_matches(self, query: str) -> List[int]:
+        start = bisect_left(self.names, query)
+        end = bisect_left(self.names, query + "\uffff")
+        return list(range(start, end))
+
+    def _substring_matches(self, query: str) -> List[int]:
+        if len(query) < 3:
+            return [i for i, name in enumerate(self.names) if query in name]
+
+        # Inner trigrams only: padded edge trigrams would demand a prefix/suffix
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        postings = sorted((self.postings.get(g, []) for g in grams), key=len)
+        if not postings or not postings[0]:
+            return []
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [i for i in candidates if query in self.names[i]]
+
+    def _fuzzy_matches(self, query: str, max_candidates: int = 200) -> Dict[int, int]:
+        shared = Counter()
+        for gram in _trigrams(query):
+            shared.update(self.postings.get(gram, ()))
+
+        max_distance = _max_typos(query)
+        matches = {}
+        for position, _ in shared.most_common(max_candidates):
+            distance = _bounded_levenshtein(query, self.names[position], max_distance)
+            if distance <= max_distance:
+                matches[position] = distance
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Ranked search: prefix matches first, then substring matches, then
+        names within a small edit distance. Shorter names rank first within a tier.
+        """
+        query = _normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        results = {}
+        for position in self._prefix_matches(query):
+            results[position] = (PREFIX, 1.0)
+        for position in self._substring_matches(query):
+            results.setdefault(position, (SUBSTRING, len(query) / len(self.names[position])))
+        if len(results) < limit:
+            for position, distance in self._fuzzy_matches(query).items():
+                score = 1 - distance / max(len(query), len(self.names[position]))
+                results.setdefault(position, (FUZZY, score))
+
+        ranked = sorted(
+            results.items(),
+            key=lambda item: (_TIER_RANK[item[1][0]], -item[1][1], len(self.names[item[0]]), self.names[item[0]])
+        )
+        return [
+            {
+                "id": self.ids[position],
+                "name": self.names[position],
+                "match": tier,
+                "score": round(score, 3)
+            }
+            for position, (tier, score) in ranked[:limit]
+        ]
+
+
+def build_name_index(conn) -> NameIndex:
+    """
+    Build a NameIndex over every Pokémon name in the database.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id, name FROM pokemon")
+        return NameIndex(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def get_name_index(db_file: str, generation: str) -> NameIndex:
+    """
+    Return the name index for the given dataset generation. The name table
+    is only read (from the shared cache when enabled, else the database) to
+    rebuild it, once after each ETL run (or any other write).
+    """
+    index = _index_cache.get("names", generation)
+    if index is None:
+        shared = get_shared_cache(db_file, generation)
+        if shared is not None:
+            index = NameIndex(shared.name_rows())
+        else:
+            try:
+                conn = read_only_connection(db_file)
+            except sqlite3.OperationalError:
+                # No database yet: nothing to search
+                index = NameIndex([])
+            else:
+                try:
+                    index = build_name_index(conn)
+                finally:
+                    conn.close()
+        _index_cache.set("names", generation, index)
+    return index
@@ -0,0 +1,238 @@
+# data_processing/shared_cache.py
+import json
+import mmap
+import os
+import sqlite3
+import struct
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from data_processing.cache import get_dataset_generation, GenerationCache
+from data_processing.snapshots import (
+    load_analysis_snapshot,
+    render_analysis_snapshot,
+    render_graph_snapshot
+)
+from constants import SHARED_CACHE
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# File layout: magic, uint64 length of a JSON table of contents, the table
+# itself, then every array and blob at an aligned offset. Arrays are mapped
+# in place with np.frombuffer, so every worker process shares the same
+# page-cache pages instead of holding its own copy.
+_MAGIC = b"PKC1"
+_HEADER = struct.Struct("<4sQ")
+_ALIGNMENT = 64
+
+SHARED_CACHE_SUFFIX = ".cache"
+
+# Blob holding the full /pokemon/analysis response body
+ANALYSIS_ALL = "analysis"
+
+_mapped = GenerationCache()
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def shared_cache_file_for(db_file: str) -> str:
+    return db_file + SHARED_CACHE_SUFFIX
+
+
+def write_shared_cache(path: str, generation: str, arrays: Dict[str, np.ndarray], blobs: Dict[str, bytes], meta: Dict) -> None:
+    """
+    Write a cache file, replacing any previous one atomically. Processes
+    that mapped the previous file keep their mapping until they drop it.
+    """
+    toc = {"generation": generation, "meta": meta, "arrays": {}, "blobs": {}}
+    sections = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        offset = _align(offset)
+        toc["arrays"][name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        sections.append((offset, array.tobytes()))
+        offset += array.nbytes
+    for name, blob in blobs.items():
+        offset = _align(offset)
+        toc["blobs"][name] = {"offset": offset, "length": len(blob)}
+        sections.append((offset, blob))
+        offset += len(blob)
+
+    header = json.dumps(toc, ensure_ascii=False).encode("utf-8")
+    data_start = _align(_HEADER.size + len(header))
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(header)))
+            f.write(header)
+            for section_offset, data in sections:
+                f.seek(data_start + section_offset)
+                f.write(data)
+            f.truncate(data_start + offset)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class SharedCache:
+    """
+    Read-only view of a cache file mapped into this process.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a shared cache file")
+        toc = json.loads(self._mmap[_HEADER.size:_HEADER.size + length])
+        self._data_start = _align(_HEADER.size + length)
+        self.generation = toc["generation"]
+        self.meta = toc["meta"]
+        self._arrays = toc["arrays"]
+        self._blobs = toc["blobs"]
+
+    def array(self, name: str) -> np.ndarray:
+        spec = self._arrays[name]
+        shape = tuple(spec["shape"])
+        return np.frombuffer(
+            self._mmap,
+            dtype=np.dtype(spec["dtype"]),
+            count=int(np.prod(shape)),
+            offset=self._data_start + spec["offset"]
+        ).reshape(shape)
+
+    def blob(self, name: str):
+        spec = self._blobs.get(name)
+        if spec is None:
+            return None
+        start = self._data_start + spec["offset"]
+        return self._mmap[start:start + spec["length"]]
+
+    def stats_rows(self) -> Tuple[np.ndarray, List[str], np.ndarray, List[str], np.ndarray]:
+        """Same result as distributions.load_stats_rows, without querying SQLite."""
+        return (
+            self.array("stat_pokemon_ids"),
+            self.meta["stat_names"],
+            self.array("stats"),
+            self.meta["type_names"],
+            self.array("membership"),
+        )
+
+    def name_rows(self) -> List[Tuple[int, str]]:
+        """Every (id, name) in the pokemon table."""
+        return list(zip(self.array("name_ids").tolist(), self.blob("names").decode("utf-8").split("\0")))
+
+    def analysis_body(self, graph_name: str = None):
+        """
+        Pre-rendered /pokemon/analysis body, or that of one graph, from the
+        latest snapshot. None if it was not cached.
+        """
+        return self.blob(f"{ANALYSIS_ALL}/{graph_name}" if graph_name else ANALYSIS_ALL)
+
+
+def build_shared_cache(db_file: str) -> bool:
+    """
+    Precompute the stats matrix, the name table and the rendered analysis
+    snapshot of db_file and write them to its shared cache file, tagged
+    with the dataset generation they were read from.
+    """
+    # Imported here because distributions reads from this cache
+    from data_processing.distributions import load_stats_rows
+
+    generation = get_dataset_generation(db_file)
+    conn = None
+    try:
+        conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+        pokemon_ids, stat_names, stats, type_names, membership = load_stats_rows(conn)
+        name_rows = conn.execute("SELECT id, name FROM pokemon ORDER BY id").fetchall()
+        snapshot = load_analysis_snapshot(conn)
+    except sqlite3.Error:
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+    blobs = {"names": "\0".join(name for _, name in name_rows).encode("utf-8")}
+    if snapshot:
+        blobs[ANALYSIS_ALL] = render_analysis_snapshot(snapshot)
+        for graph_name, graph in snapshot.items():
+            blobs[f"{ANALYSIS_ALL}/{graph_name}"] = render_graph_snapshot(graph_name, graph)
+
+    try:
+        write_shared_cache(
+            shared_cache_file_for(db_file),
+            generation,
+            arrays={
+                "stat_pokemon_ids": pokemon_ids,
+                "stats": stats,
+                "membership": membership,
+                "name_ids": np.array([pokemon_id for pokemon_id, _ in name_rows], dtype=np.int64),
+            },
+            blobs=blobs,
+            meta={"stat_names": stat_names, "type_names": type_names}
+        )
+        return True
+    except OSError:
+        return False
+
+
+def _open_current(path: str, generation: str):
+    try:
+        cache = SharedCache(path)
+    except (OSError, ValueError):
+        return None
+    return cache if cache.generation == generation else None
+
+
+def _build_as_leader(db_file: str, path: str, generation: str):
+    # Only the worker holding the lock rebuilds; the others keep serving
+    # from their own computation until the new file appears
+    if fcntl is None:
+        return _open_current(path, generation) if build_shared_cache(db_file) else None
+
+    try:
+        lock = open(path + ".lock", "a")
+    except OSError:
+        return None
+    try:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return None
+        # Another leader may have finished while we waited for the lock
+        cache = _open_current(path, generation)
+        if cache is None and build_shared_cache(db_file):
+            cache = _open_current(path, generation)
+        return cache
+    finally:
+        lock.close()
+
+
+def get_shared_cache(db_file: str, generation: str):
+    """
+    The shared cache of db_file for the given dataset generation, mapped
+    read-only into this process. If the file is missing or from an older
+    generation, one worker rebuilds it while the others get None and fall
+    back to computing for themselves.
+    Returns None when shared caching is off.
+    """
+    if not SHARED_CACHE:
+        return None
+
+    cache = _mapped.get(db_file, generation)
+    if cache is None:
+        path = shared_cache_file_for(db_file)
+        cache = _open_current(path, generation) or _build_as_leader(db_file, path, generation)
+        if cache is not None:
+            _mapped.set(db_file, generation, cache)
+    return cache
@@ -0,0 +1,141 @@
+import sqlite3
+from typing import Dict, List
+
+import numpy as np
+
+from data_processing.cache import GenerationCache
+from data_processing.distributions import empty_stats_rows, load_stats_rows
+from data_processing.shared_cache import get_shared_cache
+from data_processing.replica import read_only_connection
+
+SIMILARITY_METRICS = ("euclidean", "manhattan", "cosine")
+
+_index_cache = GenerationCache()
+
+
+class StatIndex:
+    """
+    Nearest-neighbour index over z-score normalized base stat vectors.
+    A query computes the distance to every Pokémon in one vectorized pass
+    and selects the k closest with argpartition, so it never sorts the
+    whole dataset; at a few thousand 6-dim vectors no tree structure is needed.
+    """
+
+    def __init__(self, pokemon_ids, names: List[str], stat_names: List[str], stats, type_names: List[str], membership):
+        self.ids = np.asarray(pokemon_ids, dtype=np.int64)
+        self.names = names
+        self.stat_names = stat_names
+        self.stats = np.asarray(stats, dtype=float)
+        self.type_names = type_names
+        self.membership = membership
+        self._row_of = {int(pokemon_id): i for i, pokemon_id in enumerate(self.ids)}
+        self._row_of_name = {name: i for i, name in enumerate(names)}
+
+        # Normalize each stat so e.g. hp and speed weigh the same
+        mean, std = 0.0, 1.0
+        if len(self.stats):
+            mean, std = self.stats.mean(axis=0), self.stats.std(axis=0)
+        self.vectors = (self.stats - mean) / np.where(std > 0, std, 1.0)
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        self.unit_vectors = self.vectors / np.where(norms > 0, norms, 1.0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row_of(self, name_or_id: str):
+        if str(name_or_id).isdigit():
+            return self._row_of.get(int(name_or_id))
+        return self._row_of_name.get(str(name_or_id).lower())
+
+    def _distances(self, row: int, metric: str) -> np.ndarray:
+        if metric == "cosine":
+            return 1.0 - self.unit_vectors @ self.unit_vectors[row]
+        difference = self.vectors - self.vectors[row]
+        if metric == "manhattan":
+            return np.abs(difference).sum(axis=1)
+        return np.sqrt((difference * difference).sum(axis=1))
+
+    def similar(self, name_or_id: str, k: int = 10, metric: str = "euclidean", type_name: str = None):
+        """
+        The k Pokémon whose stat profile is closest to the given one,
+        optionally restricted to one type.
+        Returns list of {id, name, distance, stats}, closest first, or None
+        if the Pokémon is not indexed.
+        """
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'")
+
+        row = self.row_of(name_or_id)
+        if row is None:
+            return None
+
+        distances = self._distances(row, metric)
+        candidates = np.ones(len(self.ids), dtype=bool)
+        candidates[row] = False
+        if type_name:
+            if type_name.lower() not in self.type_names:
+                return []
+            candidates &= self.membership[:, self.type_names.index(type_name.lower())]
+
+        positions = np.flatnonzero(candidates)
+        k = min(k, len(positions))
+        if k <= 0:
+            return []
+
+        nearest = positions[np.argpartition(distances[positions], k - 1)[:k]]
+        nearest = nearest[np.lexsort((self.ids[nearest], distances[nearest]))]
+        return [
+            {
+                "id": int(self.ids[i]),
+                "name": self.names[i],
+                "distance": round(float(distances[i]), 4),
+                "stats": dict(zip(self.stat_names, self.stats[i].astype(int).tolist()))
+            }
+            for i in nearest
+        ]
+
+
+def build_stat_index(conn) -> StatIndex:
+    """
+    Build a StatIndex over every Pokémon with a complete stat line.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id, name FROM pokemon")
+        name_of: Dict[int, str] = dict(cursor.fetchall())
+    finally:
+        cursor.close()
+
+    return _stat_index_from_rows(load_stats_rows(conn), name_of)
+
+
+def _stat_index_from_rows(stats_rows, name_of: Dict[int, str]) -> StatIndex:
+    pokemon_ids, stat_names, stats, type_names, membership = stats_rows
+    names = [name_of[int(pokemon_id)] for pokemon_id in pokemon_ids]
+    return StatIndex(pokemon_ids, names, stat_names, stats, type_names, membership)
+
+
+def get_stat_index(db_file: str, generation: str) -> StatIndex:
+    """
+    Return the stat index for the given dataset generation. It is rebuilt
+    (from the shared cache when enabled) once after each ETL run (or any
+    other write) and reused until then.
+    """
+    index = _index_cache.get("stats", generation)
+    if index is None:
+        shared = get_shared_cache(db_file, generation)
+        if shared is not None:
+            index = _stat_index_from_rows(shared.stats_rows(), dict(shared.name_rows()))
+        else:
+            try:
+                conn = read_only_connection(db_file)
+            except sqlite3.OperationalError:
+                # No database yet: every lookup misses
+                index = _stat_index_from_rows(empty_stats_rows(), {})
+            else:
+                try:
+                    index = build_stat_index(conn)
+                finally:
+                    conn.close()
+        _index_cache.set("stats", generation, index)
+    return index
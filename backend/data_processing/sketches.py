@@ -0,0 +1,361 @@
+# data_processing/sketches.py
+import hashlib
+import heapq
+import json
+import math
+from sqlite3 import Error
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from constants import SKETCH_CMS_WIDTH, SKETCH_CMS_DEPTH, SKETCH_TOP_K, SKETCH_HLL_PRECISION
+
+# What each frequency graph counts: (pokemon, item) pairs of this junction table
+SKETCH_SOURCES = {
+    "moves_frequency": ("pokemon_moves", "move_name"),
+    "abilities_frequency": ("pokemon_abilities", "ability_name"),
+}
+
+
+def _hash128(item: str) -> Tuple[int, int]:
+    # Stable across processes, unlike hash()
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: depth rows of width counters. Estimates never
+    undercount, and overcount by more than epsilon * total with probability
+    at most delta, where epsilon = e / width and delta = e^-depth.
+    """
+
+    kind = "count_min"
+
+    def __init__(self, width: int = SKETCH_CMS_WIDTH, depth: int = SKETCH_CMS_DEPTH, counts: np.ndarray = None):
+        self.width = width
+        self.depth = depth
+        self.counts = counts if counts is not None else np.zeros((depth, width), dtype=np.uint32)
+
+    def _columns(self, item: str) -> np.ndarray:
+        # Kirsch-Mitzenmacher: row i uses h1 + i * h2
+        h1, h2 = _hash128(item)
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)])
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.counts[np.arange(self.depth), self._columns(item)] += count
+
+    def estimate(self, item: str) -> int:
+        return int(self.counts[np.arange(self.depth), self._columns(item)].min())
+
+    @property
+    def total(self) -> int:
+        return int(self.counts[0].sum())
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({"width": self.width, "depth": self.depth}).encode("utf-8") + b"\n" + self.counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "CountMinSketch":
+        header, counts = payload.split(b"\n", 1)
+        shape = json.loads(header)
+        return cls(
+            shape["width"], shape["depth"],
+            np.frombuffer(counts, dtype=np.uint32).reshape(shape["depth"], shape["width"]).copy()
+        )
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary keeping at most capacity counters. A new item
+    arriving when the summary is full replaces the smallest counter and
+    inherits its count as error, so each reported count c with error e
+    brackets the true count: c - e <= true <= c. Any item more frequent
+    than total / capacity is guaranteed to be kept.
+    """
+
+    kind = "space_saving"
+
+    def __init__(self, capacity: int = SKETCH_TOP_K, counters: Dict[str, List[int]] = None):
+        self.capacity = capacity
+        self.counters = counters if counters is not None else {}
+        self.total = sum(count for count, _ in self.counters.values())
+        # One (count, item) entry per counter; counts only grow, so an entry
+        # may be stale-low but never above the counter it stands for
+        self._heap = [(count, item) for item, (count, _) in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_smallest(self) -> str:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counters[item][0] == count:
+                return item
+            heapq.heappush(self._heap, (self.counters[item][0], item))
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.total += count
+        if item in self.counters:
+            self.counters[item][0] += count
+            return
+        if len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+        else:
+            floor = self.counters.pop(self._pop_smallest())[0]
+            self.counters[item] = [floor + count, floor]
+        heapq.heappush(self._heap, (self.counters[item][0], item))
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """The n largest (item, count, error) entries, largest first."""
+        ranked = sorted(self.counters.items(), key=lambda entry: (-entry[1][0], entry[0]))
+        return [(item, count, error) for item, (count, error) in ranked[:n]]
+
+    @property
+    def max_error(self) -> float:
+        return self.total / self.capacity
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({"capacity": self.capacity, "counters": self.counters}).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "SpaceSaving":
+        state = json.loads(payload)
+        return cls(state["capacity"], state["counters"])
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter with 2^precision one-byte registers.
+    Adding an item twice has no effect; the estimate's relative standard
+    error is 1.04 / sqrt(2^precision).
+    """
+
+    kind = "hyperloglog"
+
+    def __init__(self, precision: int = SKETCH_HLL_PRECISION, registers: np.ndarray = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, item: str) -> None:
+        value = _hash128(item)[0]
+        index = value >> (64 - self.precision)
+        rest = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.power(2.0, -self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "HyperLogLog":
+        return cls(payload[0], np.frombuffer(payload[1:], dtype=np.uint8).copy())
+
+
+SKETCH_KINDS = {cls.kind: cls for cls in (CountMinSketch, SpaceSaving, HyperLogLog)}
+
+
+def sketch_table_definitions():
+    """
+    DDL for the analytics sketch tables, in the (name, sql) format used by create_tables.
+    analysis_sketch_sources records the row count of each source table the
+    stored sketches were built at, so stale sketches can be detected.
+    """
+    return [
+        ("analysis_sketches", """
+            CREATE TABLE IF NOT EXISTS analysis_sketches (
+                name TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload BLOB NOT NULL
+            );
+        """),
+        ("analysis_sketch_sources", """
+            CREATE TABLE IF NOT EXISTS analysis_sketch_sources (
+                source TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL
+            );
+        """),
+    ]
+
+
+def empty_sketches() -> Dict[str, object]:
+    """
+    The full set of sketches, empty: per frequency graph a Count-Min sketch
+    of item counts, a Space-Saving top-k summary and a HyperLogLog of
+    distinct items, plus a HyperLogLog of distinct Pokémon.
+    """
+    sketches = {"distinct_pokemon": HyperLogLog()}
+    for graph_name in SKETCH_SOURCES:
+        sketches[f"{graph_name}/count_min"] = CountMinSketch()
+        sketches[f"{graph_name}/top"] = SpaceSaving()
+        sketches[f"{graph_name}/distinct"] = HyperLogLog()
+    return sketches
+
+
+def _source_row_counts(conn) -> Dict[str, int]:
+    tables = ["pokemon"] + [table for table, _ in SKETCH_SOURCES.values()]
+    return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+def load_sketches(conn):
+    """
+    Every stored sketch by name, or None if none were written yet.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT name, kind, payload FROM analysis_sketches")
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if not rows:
+        return None
+    return {name: SKETCH_KINDS[kind].from_bytes(payload) for name, kind, payload in rows}
+
+
+def sketches_current(conn) -> bool:
+    """
+    Check whether the stored sketches cover every row of their source
+    tables, i.e. no Pokémon was loaded without them since they were saved.
+    """
+    if not conn:
+        return False
+
+    try:
+        stored = dict(conn.execute("SELECT source, row_count FROM analysis_sketch_sources").fetchall())
+        return bool(stored) and stored == _source_row_counts(conn)
+    except Error:
+        return False
+
+
+def save_sketches(conn, sketches: Dict[str, object]) -> bool:
+    """
+    Replace the stored sketches, recording the source row counts they cover.
+    Call once the rows they count are committed.
+    """
+    if not conn:
+        return False
+
+    try:
+        conn.execute("DELETE FROM analysis_sketches")
+        conn.executemany(
+            "INSERT INTO analysis_sketches (name, kind, payload) VALUES (?, ?, ?)",
+            [(name, sketch.kind, sketch.to_bytes()) for name, sketch in sketches.items()]
+        )
+        conn.execute("DELETE FROM analysis_sketch_sources")
+        conn.executemany(
+            "INSERT INTO analysis_sketch_sources (source, row_count) VALUES (?, ?)",
+            _source_row_counts(conn).items()
+        )
+        conn.commit()
+        return True
+    except Error:
+        conn.rollback()
+        return False
+
+
+def _add_pairs(sketches: Dict[str, object], graph_name: str, items: Iterable[str]) -> None:
+    for item in items:
+        sketches[f"{graph_name}/count_min"].add(item)
+        sketches[f"{graph_name}/top"].add(item)
+        sketches[f"{graph_name}/distinct"].add(item)
+
+
+def update_sketches(sketches: Dict[str, object], pokemon_id, new_items: Dict[str, Iterable[str]]) -> None:
+    """
+    Fold one Pokémon's newly inserted rows into in-memory sketches.
+    pokemon_id is None if the Pokémon row itself already existed; new_items
+    maps each SKETCH_SOURCES graph to the items whose (pokemon, item) row
+    was just inserted, so reloading a Pokémon never counts it twice.
+    """
+    if pokemon_id is not None:
+        sketches["distinct_pokemon"].add(str(pokemon_id))
+    for graph_name, items in new_items.items():
+        _add_pairs(sketches, graph_name, items)
+
+
+def rebuild_sketches(conn) -> bool:
+    """
+    Recompute and store every sketch from the pokemon and junction tables,
+    e.g. when the stored sketches are missing or no longer current.
+    """
+    if not conn:
+        return False
+
+    try:
+        sketches = empty_sketches()
+        for (pokemon_id,) in conn.execute("SELECT id FROM pokemon"):
+            sketches["distinct_pokemon"].add(str(pokemon_id))
+        for graph_name, (table, column) in SKETCH_SOURCES.items():
+            _add_pairs(sketches, graph_name, (row[0] for row in conn.execute(f"SELECT {column} FROM {table}")))
+    except Error:
+        return False
+    return save_sketches(conn, sketches)
+
+
+def approximate_frequency(sketches: Dict[str, object], graph_name: str, top_n: int) -> Dict:
+    """
+    Top-n items of a frequency graph estimated from the sketches, with
+    error bounds. Each item's count is the tighter of its Space-Saving and
+    Count-Min estimates (both only overcount); its lower bound is the
+    Space-Saving count minus that counter's error.
+    """
+    count_min = sketches[f"{graph_name}/count_min"]
+    top = sketches[f"{graph_name}/top"]
+    distinct = sketches[f"{graph_name}/distinct"]
+
+    entries = []
+    for item, count, error in top.top(top.capacity):
+        estimate = min(count, count_min.estimate(item))
+        entries.append((item, estimate, max(count - error, 0)))
+    entries.sort(key=lambda entry: (-entry[1], entry[0]))
+    entries = entries[:top_n]
+
+    return {
+        "data": {item: estimate for item, estimate, _ in entries},
+        "error_bounds": {
+            "items": {item: {"low": low, "high": estimate} for item, estimate, low in entries},
+            "count_min": {
+                "epsilon": count_min.epsilon,
+                "delta": count_min.delta,
+                "max_overcount": count_min.epsilon * count_min.total,
+            },
+            "space_saving": {"capacity": top.capacity, "max_error": top.max_error},
+        },
+        "distinct_items": {"estimate": distinct.estimate(), "relative_error": distinct.relative_error},
+    }
+
+
+def approximate_distinct_counts(sketches: Dict[str, object]) -> Dict:
+    """
+    HyperLogLog estimates of the number of Pokémon, moves and abilities.
+    """
+    counters = {
+        "pokemon": sketches["distinct_pokemon"],
+        "moves": sketches["moves_frequency/distinct"],
+        "abilities": sketches["abilities_frequency/distinct"],
+    }
+    return {
+        name: {"estimate": counter.estimate(), "relative_error": counter.relative_error}
+        for name, counter in counters.items()
+    }
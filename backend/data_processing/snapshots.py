@@ -0,0 +1,184 @@
+import json
+from datetime import datetime, timezone
+from sqlite3 import Error
+from typing import Dict, Any
+
+from data_processing.analysis import generate_all_analysis, GRAPH_METADATA
+from data_processing.cooccurrence import generate_cooccurrence_analysis
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def start_etl_run(conn):
+    """
+    Register a new ETL run and return its id.
+    Returns None if the run could not be recorded.
+    """
+    if not conn:
+        return None
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO etl_runs (started_at) VALUES (?)", (_utc_now(),))
+        conn.commit()
+        return cursor.lastrowid
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return None
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def finish_etl_run(conn, run_id, success_count: int, failure_count: int) -> bool:
+    """
+    Record the outcome of an ETL run.
+    """
+    if not conn or run_id is None:
+        return False
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            UPDATE etl_runs
+            SET finished_at = ?, success_count = ?, failure_count = ?
+            WHERE id = ?
+            """,
+            (_utc_now(), success_count, failure_count, run_id)
+        )
+        conn.commit()
+        return True
+    except Error:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def materialize_analysis_snapshot(conn, run_id) -> bool:
+    """
+    Compute every dashboard graph, plus the co-occurrence graphs, once and
+    store them as pre-serialized JSON tagged with the given ETL run id.
+    """
+    if not conn or run_id is None:
+        return False
+
+    analysis_data = generate_all_analysis(conn)
+    if not analysis_data:
+        return False
+    # Co-occurrence graphs are mined here too, so requests never run FP-growth
+    analysis_data.update(generate_cooccurrence_analysis(conn))
+
+    created_at = _utc_now()
+    rows = [
+        (
+            run_id,
+            graph_name,
+            graph["title"],
+            graph["type"],
+            json.dumps(graph["data"], ensure_ascii=False, separators=(",", ":")),
+            created_at,
+        )
+        for graph_name, graph in analysis_data.items()
+    ]
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO analysis_snapshots
+                (run_id, graph_name, title, chart_type, payload, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+        conn.commit()
+        return True
+    except Exception:
+        try:
+            conn.rollback()
+        except:
+            pass
+        return False
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def load_analysis_snapshot(conn) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the analysis snapshot of the latest ETL run.
+    Returns dict of graph name -> {"title", "type", "payload"} where payload is
+    the graph data as a JSON string, or an empty dict if no complete snapshot
+    exists. A snapshot from an earlier run is never returned: a later run
+    may have loaded data and then failed before materializing its own.
+    """
+    if not conn:
+        return {}
+
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT graph_name, title, chart_type, payload
+            FROM analysis_snapshots
+            WHERE run_id = (SELECT MAX(id) FROM etl_runs)
+            """
+        )
+        snapshot = {
+            row[0]: {"title": row[1], "type": row[2], "payload": row[3]}
+            for row in cursor.fetchall()
+        }
+    except Exception:
+        return {}
+    finally:
+        if cursor:
+            cursor.close()
+
+    # A partial snapshot is never served; callers fall back to live computation
+    if any(name not in snapshot for name in GRAPH_METADATA):
+        return {}
+    return snapshot
+
+
+def render_analysis_snapshot(snapshot: Dict[str, Dict[str, Any]]) -> bytes:
+    """
+    Assemble the /pokemon/analysis response body from stored payloads
+    without decoding and re-encoding the graph data.
+    """
+    graphs = ",".join(
+        '{}:{{"data":{},"title":{},"type":{}}}'.format(
+            json.dumps(name),
+            snapshot[name]["payload"],
+            json.dumps(snapshot[name]["title"], ensure_ascii=False),
+            json.dumps(snapshot[name]["type"]),
+        )
+        for name in GRAPH_METADATA
+    )
+    return ('{"status":"success","data":{' + graphs + '}}').encode("utf-8")
+
+
+def render_graph_snapshot(graph_name: str, graph: Dict[str, Any]) -> bytes:
+    """
+    Assemble the /pokemon/analysis/{graph_name} response body from a stored payload.
+    """
+    body = '{{"status":"success","graph_name":{},"chart_type":{},"data":{}}}'.format(
+        json.dumps(graph_name),
+        json.dumps(graph["type"]),
+        graph["payload"],
+    )
+    return body.encode("utf-8")
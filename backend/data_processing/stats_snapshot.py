@@ -0,0 +1,208 @@
+# data_processing/stats_snapshot.py
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from sqlite3 import Error
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Bump whenever SNAPSHOT_DTYPE or the manifest layout changes; loaders
+# refuse snapshots written with another version
+STATS_SNAPSHOT_SCHEMA_VERSION = 1
+
+# The six base stats, in column order
+SNAPSHOT_STATS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+# Bits of the flags field
+FLAG_EVOLVED = 1
+
+# One fixed-size record per Pokémon. Missing stats and types are -1;
+# type ids index the manifest's "types" list and the name is the UTF-8
+# slice [name_offset, name_offset + name_length) of the names blob.
+SNAPSHOT_DTYPE = np.dtype([
+    ("id", "<i4"),
+    *[(stat.replace("-", "_"), "<i2") for stat in SNAPSHOT_STATS],
+    ("type1", "i1"),
+    ("type2", "i1"),
+    ("flags", "u1"),
+    ("name_offset", "<u4"),
+    ("name_length", "<u2"),
+])
+
+
+def snapshot_paths(db_file: str) -> Tuple[str, str, str]:
+    """
+    (records .npy, names blob, manifest) file paths of db_file's stats snapshot.
+    """
+    base = os.path.splitext(db_file)[0] + ".stats"
+    return base + ".npy", base + ".names", base + ".json"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_stats_records(conn) -> Tuple[np.ndarray, bytes, List[str]]:
+    """
+    Every Pokémon as one SNAPSHOT_DTYPE record, in id order.
+    Returns (records, names_blob, type_names).
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT id, name, is_evolved FROM pokemon ORDER BY id")
+        pokemon = cursor.fetchall()
+        cursor.execute("SELECT pokemon_id, stat_name, base_stat FROM pokemon_stats")
+        stat_rows = cursor.fetchall()
+        cursor.execute("SELECT pokemon_id, type_name FROM pokemon_types ORDER BY pokemon_id, rowid")
+        type_rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    type_names = sorted({row[1] for row in type_rows})
+    type_id = {name: i for i, name in enumerate(type_names)}
+    row_of = {row[0]: i for i, row in enumerate(pokemon)}
+
+    records = np.zeros(len(pokemon), dtype=SNAPSHOT_DTYPE)
+    for stat in SNAPSHOT_STATS:
+        records[stat.replace("-", "_")] = -1
+    records["type1"] = records["type2"] = -1
+
+    encoded = [row[1].encode("utf-8") for row in pokemon]
+    lengths = np.fromiter((len(name) for name in encoded), dtype=np.int64, count=len(encoded))
+    records["id"] = [row[0] for row in pokemon]
+    records["flags"] = [FLAG_EVOLVED if row[2] else 0 for row in pokemon]
+    records["name_length"] = lengths
+    records["name_offset"] = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(encoded) else []
+
+    for pokemon_id, stat_name, base_stat in stat_rows:
+        if stat_name in SNAPSHOT_STATS and pokemon_id in row_of:
+            records[stat_name.replace("-", "_")][row_of[pokemon_id]] = base_stat
+
+    slot = {}
+    for pokemon_id, type_name in type_rows:
+        if pokemon_id in row_of:
+            position = slot.get(pokemon_id, 0)
+            if position < 2:
+                records["type1" if position == 0 else "type2"][row_of[pokemon_id]] = type_id[type_name]
+                slot[pokemon_id] = position + 1
+
+    return records, b"".join(encoded), type_names
+
+
+def write_stats_snapshot(conn, db_file: str) -> bool:
+    """
+    Write the binary stats snapshot of the database next to db_file.
+    Data files are replaced first and the manifest last, so a manifest
+    always describes (and checksums) complete files.
+    """
+    if not conn:
+        return False
+
+    try:
+        records, names_blob, type_names = build_stats_records(conn)
+    except (Error, ValueError, TypeError):
+        return False
+
+    records_path, names_path, manifest_path = snapshot_paths(db_file)
+    try:
+        for path, write in (
+            (records_path, lambda f: np.save(f, records, allow_pickle=False)),
+            (names_path, lambda f: f.write(names_blob)),
+        ):
+            with open(path + ".tmp", "wb") as f:
+                write(f)
+            os.replace(path + ".tmp", path)
+
+        manifest = {
+            "schema_version": STATS_SNAPSHOT_SCHEMA_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "count": int(len(records)),
+            "dtype": SNAPSHOT_DTYPE.descr,
+            "stats": list(SNAPSHOT_STATS),
+            "types": type_names,
+            "flags": {"evolved": FLAG_EVOLVED},
+            "sha256": {"records": _sha256(records_path), "names": _sha256(names_path)},
+        }
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        return True
+    except OSError:
+        return False
+
+
+def move_stats_snapshot(source_db_file: str, target_db_file: str) -> bool:
+    """
+    Move a snapshot written for source_db_file (e.g. a blue/green build
+    file) to the paths of target_db_file, manifest last.
+    """
+    try:
+        for source, target in zip(snapshot_paths(source_db_file), snapshot_paths(target_db_file)):
+            os.replace(source, target)
+        return True
+    except OSError:
+        return False
+
+
+class StatsSnapshot:
+    """
+    A loaded stats snapshot. records is the memory-mapped structured array;
+    names are decoded from the names blob on demand.
+    """
+
+    def __init__(self, records: np.ndarray, names_blob: bytes, manifest: Dict):
+        self.records = records
+        self.names_blob = names_blob
+        self.manifest = manifest
+        self.types: List[str] = manifest["types"]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def name(self, position: int) -> str:
+        offset = int(self.records["name_offset"][position])
+        return self.names_blob[offset:offset + int(self.records["name_length"][position])].decode("utf-8")
+
+    def names(self) -> List[str]:
+        return [self.name(i) for i in range(len(self.records))]
+
+    def stats_matrix(self) -> np.ndarray:
+        """(pokemon x stat) view of the six stat columns, in SNAPSHOT_STATS order."""
+        return np.stack([self.records[stat.replace("-", "_")] for stat in SNAPSHOT_STATS], axis=1)
+
+
+def load_stats_snapshot(db_file: str, verify: bool = True):
+    """
+    Map db_file's stats snapshot without touching SQLite. The records are
+    opened with np.load(mmap_mode="r"), so only the pages actually read are
+    loaded. With verify, both files are checked against the manifest's
+    SHA-256 checksums first (a full read; skip it for the fastest load).
+    Returns a StatsSnapshot, or None if the snapshot is missing, from
+    another schema version, or fails verification.
+    """
+    records_path, names_path, manifest_path = snapshot_paths(db_file)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("schema_version") != STATS_SNAPSHOT_SCHEMA_VERSION:
+            return None
+        if verify:
+            for role, path in (("records", records_path), ("names", names_path)):
+                if _sha256(path) != manifest["sha256"].get(role):
+                    return None
+
+        records = np.load(records_path, mmap_mode="r", allow_pickle=False)
+        if records.dtype != SNAPSHOT_DTYPE or len(records) != manifest["count"]:
+            return None
+        with open(names_path, "rb") as f:
+            names_blob = f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return StatsSnapshot(records, names_blob, manifest)
@@ -87,3 +87,79 @@ def transform_pokemons(pokemon_data: dict) -> dict | None:
     
 
 
+# Multiplier applied by each PokeAPI damage relation
+DAMAGE_MULTIPLIERS = {
+    "double_damage_to": 2.0,
+    "half_damage_to": 0.5,
+    "no_damage_to": 0.0,
+}
+
+
+def transform_type_relations(relations: dict) -> list | None:
+    """
+    Transform extracted type damage relations into
+    (attacking_type, defending_type, multiplier) rows.
+    Only non-neutral matchups are listed; every other pair is 1.0.
+    Returns list on success, None on invalid input.
+    """
+    if not isinstance(relations, dict):
+        return None
+
+    rows = []
+    for attacking_type, damage in relations.items():
+        if not isinstance(damage, dict):
+            continue
+        for relation, multiplier in DAMAGE_MULTIPLIERS.items():
+            for defending_type in damage.get(relation, []):
+                if isinstance(defending_type, str):
+                    rows.append((attacking_type, defending_type, multiplier))
+    return rows
+
+
+def _resource_name(resource) -> str | None:
+    # PokeAPI references other resources as {"name": ..., "url": ...}
+    return resource.get("name") if isinstance(resource, dict) else None
+
+
+def transform_move_details(move_data: dict) -> dict | None:
+    """
+    Transform a raw PokeAPI move resource into the columns of the moves table.
+    power/accuracy/pp are None for moves that have none (e.g. status moves).
+    Returns dict on success, None on invalid input.
+    """
+    if not isinstance(move_data, dict) or not move_data.get("name"):
+        return None
+
+    def as_int(value):
+        return int(value) if isinstance(value, (int, float)) else None
+
+    return {
+        "name": move_data["name"],
+        "power": as_int(move_data.get("power")),
+        "accuracy": as_int(move_data.get("accuracy")),
+        "pp": as_int(move_data.get("pp")),
+        "type_name": _resource_name(move_data.get("type")),
+        "damage_class": _resource_name(move_data.get("damage_class")),
+    }
+
+
+def transform_ability_details(ability_data: dict) -> dict | None:
+    """
+    Transform a raw PokeAPI ability resource into the columns of the
+    abilities table, keeping the English short effect text.
+    Returns dict on success, None on invalid input.
+    """
+    if not isinstance(ability_data, dict) or not ability_data.get("name"):
+        return None
+
+    short_effect = None
+    for entry in ability_data.get("effect_entries") or []:
+        if isinstance(entry, dict) and _resource_name(entry.get("language")) == "en":
+            short_effect = entry.get("short_effect") or entry.get("effect")
+            break
+
+    return {
+        "name": ability_data["name"],
+        "short_effect": short_effect,
+        "generation": _resource_name(ability_data.get("generation")),
+    }
@@ -0,0 +1,186 @@
+# middleware.py
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from routers.http_cache import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        # Brotli quality runs 0-11; the shared level is clamped into that range
+        self._compressor = brotli.Compressor(quality=min(11, max(0, level)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _encoders():
+    encoders = {"gzip": _GzipEncoder}
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    return encoders
+
+
+def _parse_accept_encoding(accept_encoding: str) -> dict:
+    """
+    Map each coding named in an Accept-Encoding header to its q-value.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+    return qualities
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows the given content coding.
+    """
+    qualities = _parse_accept_encoding(accept_encoding)
+    return qualities.get(encoding, qualities.get("*", 0.0)) > 0
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+    Brotli wins ties over gzip; codings with q=0 are never chosen.
+    """
+    qualities = _parse_accept_encoding(accept_encoding)
+    preference = {"br": 1, "gzip": 0}
+    best, best_key = None, None
+
+    for candidate in _encoders():
+        quality = qualities.get(candidate, qualities.get("*", 0.0))
+        if quality <= 0:
+            continue
+        key = (quality, preference[candidate])
+        if best_key is None or key > best_key:
+            best, best_key = candidate, key
+
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with Brotli or gzip based on Accept-Encoding.
+    Bodies smaller than minimum_size are sent as-is; streaming responses
+    are compressed chunk by chunk so the first byte is not delayed.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.level)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, level: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.start_message: Message | None = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers back until the first body chunk tells us the size
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or message["status"] in (204, 304)
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self._send(message)
+                return
+
+            self.encoder = _encoders()[self.encoding](self.level)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+
+            if more_body:
+                del headers["Content-Length"]
+                await self._flush_start()
+                await self._send({"type": "http.response.body", "body": self.encoder.compress(body), "more_body": True})
+            else:
+                compressed = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+                await self._flush_start()
+                await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        if more_body:
+            chunk = self.encoder.compress(body)
+        else:
+            chunk = self.encoder.finish(body)
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _flush_start(self) -> None:
+        if self.start_message is not None:
+            await self._send(self.start_message)
+            self.start_message = None
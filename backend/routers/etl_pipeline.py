@@ -1,6 +1,10 @@
 # routers/etl_pipeline.py
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks, Query
 from data_processing.etl import run_etl_pipeline
+from data_processing.build import run_blue_green_build
+from data_processing.replica import refresh_replica
+from routers.pokemon_analysis import warm_analysis_cache
+from constants import ETL_BLUE_GREEN, ANALYSIS_WARM_ON_ETL, DATABASE_FILE
 
 
 router = APIRouter(
@@ -9,9 +13,28 @@ router = APIRouter(
 )
 
 
+# A plain def so FastAPI runs the build in its threadpool; reads keep being
+# served from the event loop while it runs
 @router.post("/etl/run-pipeline")
-async def run_pipeline():
+def run_pipeline(
+    background_tasks: BackgroundTasks,
+    blue_green: bool = Query(ETL_BLUE_GREEN),
+    warm_analysis: bool = Query(ANALYSIS_WARM_ON_ETL)
+):
+    """
+    Run the ETL pipeline. With blue_green the data is built into a separate
+    file and swapped in once verified, so readers never see a partial load.
+    With warm_analysis every analysis graph is re-rendered in the background
+    once the response is sent.
+    """
     print("ETL Pipeline STARTED")
-    run_etl_pipeline()
+    if blue_green:
+        run_blue_green_build()
+    else:
+        run_etl_pipeline()
+    # Copy the new data into the read replica now rather than on the next read
+    refresh_replica(DATABASE_FILE)
+    if warm_analysis:
+        background_tasks.add_task(warm_analysis_cache)
     print("ETL Pipeline FINISHED")
     return {"detail": "Pipeline completed."}
@@ -0,0 +1,103 @@
+# routers/http_cache.py
+
+import hashlib
+from typing import Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from data_processing.cache import get_dataset_generation
+
+# Content codings whose representations get a suffixed ETag
+ENCODED_ETAG_SUFFIXES = ("gzip", "br")
+
+
+def make_etag(request: Request) -> str:
+    """
+    Build a strong ETag from the dataset generation, the request path and
+    the normalized (sorted) query parameters.
+    """
+    params = urlencode(sorted(request.query_params.multi_items()))
+    key = f"{get_dataset_generation()}|{request.url.path}|{params}"
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+
+def _matching_etag(request: Request, etag: str) -> Optional[str]:
+    """
+    The tag in the client's If-None-Match header that matches the ETag,
+    without any W/ prefix, or None if none does.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() == "*":
+        return etag
+
+    # If-None-Match uses weak comparison, so a W/ prefix still matches,
+    # and tags of compressed representations match their identity tag
+    for tag in header.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if _identity_etag(tag) == etag:
+            return tag
+    return None
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match header already matches the ETag.
+    """
+    return _matching_etag(request, etag) is not None
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Derive the strong ETag of a content-coded representation,
+    e.g. "abc" -> "abc-gzip". Weak tags are returned unchanged.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_etag(etag: str) -> str:
+    for encoding in ENCODED_ETAG_SUFFIXES:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def not_modified_response(request: Request, etag: str) -> Response:
+    """
+    Empty 304 response carrying the ETag the 200 would have had: the
+    client's matching tag, so a cached gzip or br representation is
+    confirmed with its own "-gzip"/"-br" tag rather than the identity one.
+    """
+    return Response(status_code=304, headers=cache_headers(_matching_etag(request, etag) or etag))
+
+
+def cache_headers(etag: str) -> dict:
+    """
+    Headers attached to every cacheable response. no-cache makes browsers
+    revalidate with If-None-Match instead of guessing freshness.
+    """
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def stale_headers() -> dict:
+    """
+    Headers of a response served from a superseded dataset generation
+    while the current one is recomputed. It carries no ETag, so clients
+    never revalidate against a body that is already out of date.
+    """
+    return {"Cache-Control": "no-cache", "Warning": '110 - "Response is Stale"'}
+
+
+def server_timing_header(timings: dict) -> dict:
+    """
+    Server-Timing header listing how long each part of a response took to
+    compute, in milliseconds, e.g. {"pokemon_stats": 1.2} ->
+    "pokemon_stats;dur=1.2". Empty when nothing was computed.
+    """
+    if not timings:
+        return {}
+    return {"Server-Timing": ", ".join(f"{name};dur={elapsed:.1f}" for name, elapsed in timings.items())}
@@ -0,0 +1,91 @@
+# routers/matchups.py
+
+from typing import List
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+from data_processing.matchups import get_matchup_data, search_teams
+from data_processing.cache import get_dataset_generation
+from routers.responses import FastJSONResponse
+from routers.http_cache import (
+    make_etag,
+    is_not_modified,
+    not_modified_response,
+    cache_headers
+)
+from constants import DATABASE_FILE, TEAM_SIZE
+
+router = APIRouter(
+    prefix="/pokemon",
+    tags=["Pokemon-matchups"]
+)
+
+
+class TeamRequest(BaseModel):
+    members: List[str] = Field(..., min_length=1, max_length=TEAM_SIZE)
+
+
+class TeamSearchRequest(BaseModel):
+    required: List[str] = Field(default_factory=list, max_length=TEAM_SIZE)
+    pool: List[str] | None = None
+    limit: int = Field(5, ge=1, le=20)
+
+
+def _matchup_data():
+    try:
+        chart, pokemon_types = get_matchup_data(DATABASE_FILE, get_dataset_generation(DATABASE_FILE))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not len(chart):
+        raise HTTPException(status_code=503, detail="Type matchups not loaded yet; run the ETL pipeline")
+    return chart, pokemon_types
+
+
+def _check_names(names: List[str], pokemon_types: dict) -> List[str]:
+    names = [name.lower() for name in names]
+    unknown = [name for name in names if name not in pokemon_types]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown Pokémon: {', '.join(unknown)}")
+    return names
+
+
+@router.get("/types/effectiveness")
+async def type_effectiveness(request: Request):
+    """
+    The type effectiveness matrix: matrix[i][j] is the damage multiplier of
+    an attack of type types[i] against a Pokémon of type types[j].
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    chart, _ = _matchup_data()
+    return FastJSONResponse(
+        {"types": chart.type_names, "matrix": chart.matrix.tolist()},
+        headers=cache_headers(etag)
+    )
+
+
+@router.post("/team/coverage")
+async def team_coverage(team: TeamRequest):
+    """
+    Offensive and defensive type coverage of a team of up to six Pokémon.
+    """
+    chart, pokemon_types = _matchup_data()
+    members = _check_names(team.members, pokemon_types)
+    return {
+        "members": [{"name": name, "types": pokemon_types[name]} for name in members],
+        **chart.team_report([pokemon_types[name] for name in members])
+    }
+
+
+@router.post("/team/search")
+def team_search(search: TeamSearchRequest):
+    """
+    Best-covering teams that include every required Pokémon, filled from
+    pool (default: every Pokémon). Declared sync so the CPU-bound search
+    runs in the threadpool instead of blocking the event loop.
+    """
+    chart, pokemon_types = _matchup_data()
+    required = _check_names(search.required, pokemon_types)
+    pool = _check_names(search.pool, pokemon_types) if search.pool is not None else None
+    return search_teams(chart, pokemon_types, required, pool, search.limit)
@@ -1,8 +1,31 @@
 # routers/pokemon.py
 
+import json
 import sqlite3
-from fastapi import APIRouter, HTTPException, Query
+from typing import List, Literal
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from data_processing.etl import DATABASE_FILE
+from data_processing.documents import get_pokemon_document, get_pokemon_documents, decode_document
+from data_processing.search import get_name_index
+from data_processing.similarity import get_stat_index
+from data_processing.movesets import get_move_set_index
+from data_processing.ranks import get_leaderboard, get_stat_percentiles
+from data_processing.export import EXPORT_FORMATS, export_format_available, stream_export
+from data_processing.cache import get_dataset_generation
+from data_processing.replica import read_connection
+from routers.responses import FastJSONResponse, PreEncodedJSONResponse, dumps
+from routers.single_flight import coalescer, request_key
+from constants import BATCH_MAX_IDS
+from routers.http_cache import (
+    make_etag,
+    is_not_modified,
+    not_modified_response,
+    cache_headers,
+    encoded_etag
+)
+from middleware import accepts_encoding
 
 
 router = APIRouter(
@@ -11,15 +34,26 @@ router = APIRouter(
 )
 
 
+class BatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BATCH_MAX_IDS)
+
+
 @router.get("/")
-async def get_pokemon():
-    conn = sqlite3.connect(DATABASE_FILE)
+async def get_pokemon(request: Request):
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    conn = read_connection(DATABASE_FILE)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
     try:
         cur.execute("SELECT name FROM pokemon ORDER BY id")
         rows = cur.fetchall()
-        return [row["name"] for row in rows]
+        return FastJSONResponse(
+            [row["name"] for row in rows],
+            headers=cache_headers(etag)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
@@ -28,12 +62,30 @@ async def get_pokemon():
 
 @router.get("/filter_pokemons")
 async def filter_pokemons(
+    request: Request,
     is_evolved: bool | None = Query(None),
     hp_min: int | None = Query(None),
     attack_min: int | None = Query(None),
-    type_name: str | None = Query(None)
+    type_name: str | None = Query(None),
+    cluster: int | None = Query(None, ge=0)
 ):
-    conn = sqlite3.connect(DATABASE_FILE)
+    """
+    Names and HP of the Pokémon matching every given filter. Concurrent
+    identical requests share one query.
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    body = await coalescer.do(
+        "filter_pokemons", request_key(request, get_dataset_generation(DATABASE_FILE)),
+        _filter_pokemons, is_evolved, hp_min, attack_min, type_name, cluster
+    )
+    return PreEncodedJSONResponse(body, headers=cache_headers(etag))
+
+
+def _filter_pokemons(is_evolved, hp_min, attack_min, type_name, cluster) -> bytes:
+    conn = read_connection(DATABASE_FILE)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
 
@@ -68,21 +120,237 @@ async def filter_pokemons(
             query += " AND pt.type_name = ?"
             params.append(type_name.lower())
 
+        if cluster is not None:
+            query += " AND p.id IN (SELECT pokemon_id FROM pokemon_clusters WHERE cluster_id = ?)"
+            params.append(cluster)
+
         query += " ORDER BY p.id"
 
         cur.execute(query, params)
         rows = cur.fetchall()
 
         # Return list of objects with name and hp only
-        return [
+        return dumps([
             {
                 "name": row["name"],
                 "hp": row["hp"] if row["hp"] is not None else 0
             }
             for row in rows
-        ]
+        ])
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        conn.close()
+
+
+@router.get("/search")
+async def search_pokemon(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=64),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Search Pokémon names with prefix, substring and typo-tolerant matching
+    (e.g. "pikachoo" finds pikachu). Results are ranked best match first.
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    try:
+        index = get_name_index(DATABASE_FILE, get_dataset_generation(DATABASE_FILE))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return FastJSONResponse(
+        {"query": q, "results": index.search(q, limit)},
+        headers=cache_headers(etag)
+    )
+
+
+@router.get("/leaderboard/{stat_name}")
+async def stat_leaderboard(
+    request: Request,
+    stat_name: str,
+    type_name: str | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Top Pokémon by one stat, or by base stat total with stat_name=total,
+    optionally among one type (e.g. /leaderboard/speed?type_name=water).
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    conn = read_connection(DATABASE_FILE)
+    try:
+        results = get_leaderboard(conn, stat_name, type_name, limit, offset)
+    finally:
+        conn.close()
+
+    if not results and offset == 0:
+        raise HTTPException(status_code=404, detail=f"No ranking for stat '{stat_name}'")
+
+    return FastJSONResponse(
+        {"stat": stat_name.lower(), "type": type_name.lower() if type_name else None, "results": results},
+        headers=cache_headers(etag)
+    )
+
+
+@router.get("/{name_or_id}/percentiles")
+async def stat_percentiles(request: Request, name_or_id: str, type_name: str | None = Query(None)):
+    """
+    Rank and percentile of each of a Pokémon's stats among all Pokémon,
+    or among one type with type_name.
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    conn = read_connection(DATABASE_FILE)
+    try:
+        percentiles = get_stat_percentiles(conn, name_or_id, type_name)
+    finally:
+        conn.close()
+
+    if percentiles is None:
+        raise HTTPException(status_code=404, detail=f"Pokémon '{name_or_id}' not found")
+    if type_name and not percentiles["stats"]:
+        raise HTTPException(status_code=404, detail=f"'{name_or_id}' is not of type '{type_name}'")
 
+    return FastJSONResponse(percentiles, headers=cache_headers(etag))
+
+
+@router.get("/{name_or_id}/similar")
+async def similar_pokemon(
+    request: Request,
+    name_or_id: str,
+    k: int = Query(10, ge=1, le=50),
+    type_name: str | None = Query(None),
+    metric: Literal["euclidean", "manhattan", "cosine"] = Query("euclidean")
+):
+    """
+    Pokémon with the most similar base stat profile, e.g. for team building.
+    Stats are normalized per stat before comparing; type_name restricts the
+    candidates to one type.
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    try:
+        index = get_stat_index(DATABASE_FILE, get_dataset_generation(DATABASE_FILE))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = index.similar(name_or_id, k, metric, type_name)
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"Pokémon '{name_or_id}' not found")
+
+    return FastJSONResponse(
+        {"pokemon": name_or_id.lower(), "metric": metric, "results": results},
+        headers=cache_headers(etag)
+    )
+
+
+@router.get("/{name_or_id}/shared-moves")
+async def shared_moves(request: Request, name_or_id: str, k: int = Query(10, ge=1, le=50)):
+    """
+    Pokémon that share the most moves with the given one, ranked by the
+    Jaccard similarity of their move sets.
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    try:
+        index = get_move_set_index(DATABASE_FILE, get_dataset_generation(DATABASE_FILE))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    results = index.shares_most_moves(name_or_id, k)
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"Pokémon '{name_or_id}' not found or has no moves")
+
+    return FastJSONResponse(
+        {"pokemon": name_or_id.lower(), "results": results},
+        headers=cache_headers(etag)
+    )
+
+
+@router.get("/export")
+async def export_pokemon(format: Literal["ndjson", "csv", "parquet"] = Query("ndjson")):
+    """
+    Stream the full dataset as NDJSON, CSV or Parquet.
+    Rows are read from one cursor in fixed-size chunks and written out as
+    they are produced, so memory stays flat and the first byte is sent immediately.
+    """
+    if not export_format_available(format):
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+
+    return StreamingResponse(
+        stream_export(DATABASE_FILE, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="pokemon.{format}"'}
+    )
+
+
+@router.post("/batch")
+async def get_pokemon_batch(batch: BatchRequest):
+    """
+    Get the full records of up to BATCH_MAX_IDS Pokémon in one query.
+    Records are returned in request order; unknown ids are listed in "missing".
+    """
+    ids = list(dict.fromkeys(batch.ids))
+
+    conn = read_connection(DATABASE_FILE)
+    try:
+        documents = get_pokemon_documents(conn, ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        conn.close()
+
+    # Documents are already JSON; splice them in without re-encoding
+    found = b",".join(documents[i] for i in ids if i in documents)
+    missing = [i for i in ids if i not in documents]
+    body = b'{"pokemon":[' + found + b'],"missing":' + json.dumps(missing).encode("utf-8") + b'}'
+    return PreEncodedJSONResponse(body)
+
+
+# Must stay the last route: "/{name_or_id}" would otherwise shadow
+# every single-segment path declared after it
+@router.get("/{name_or_id}")
+async def get_pokemon_detail(name_or_id: str, request: Request):
+    """
+    Get one Pokémon's full record (types, abilities, moves, stats) by name or id.
+    Served from the document pre-rendered by the loader; a gzip-stored document
+    is sent as-is to clients that accept gzip.
+    """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    conn = read_connection(DATABASE_FILE)
+    try:
+        document = get_pokemon_document(conn, name_or_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+    if document is None:
+        raise HTTPException(status_code=404, detail=f"Pokémon '{name_or_id}' not found")
+
+    encoding, body = document
+    if encoding != "identity":
+        if accepts_encoding(request.headers.get("accept-encoding", ""), encoding):
+            headers = cache_headers(encoded_etag(etag, encoding))
+            headers.update({"Content-Encoding": encoding, "Vary": "Accept-Encoding"})
+            return PreEncodedJSONResponse(body, headers=headers)
+        body = decode_document(encoding, body)
+
+    return PreEncodedJSONResponse(body, headers=cache_headers(etag))
@@ -1,18 +1,185 @@
 # routers/pokemon_analysis.py
 
-from fastapi import APIRouter, HTTPException
+import logging
+import sqlite3
+from time import perf_counter
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from data_processing.load import create_connection
-from data_processing.analysis import generate_all_analysis
-from constants import DATABASE_FILE
+from data_processing.analysis import (
+    generate_all_analysis,
+    get_pokemon_stats_average,
+    get_type_distribution,
+    get_abilities_frequency,
+    get_moves_frequency,
+    get_evolution_stage_distribution,
+    get_type_combination_distribution,
+    analysis_scope,
+    parse_stat_range,
+    DEFAULT_TOP_N,
+    GRAPH_METADATA
+)
+from data_processing.distributions import get_stat_distributions, DISTRIBUTION_GRAPH_METADATA
+from data_processing.cooccurrence import generate_cooccurrence_analysis, COOCCURRENCE_GRAPH_METADATA
+from data_processing.clustering import get_stat_clusters, CLUSTER_GRAPH_METADATA
+from data_processing.sketches import (
+    load_sketches,
+    approximate_frequency,
+    approximate_distinct_counts,
+    SKETCH_SOURCES
+)
+from data_processing.snapshots import (
+    load_analysis_snapshot,
+    render_analysis_snapshot,
+    render_graph_snapshot
+)
+from data_processing.cache import get_dataset_generation, LRUCache, StaleWhileRevalidateCache
+from data_processing.replica import read_database
+from data_processing.shared_cache import get_shared_cache
+from routers.responses import PreEncodedJSONResponse, dumps
+from routers.single_flight import coalescer, path_key, request_key
+from routers.http_cache import (
+    make_etag,
+    is_not_modified,
+    not_modified_response,
+    cache_headers,
+    stale_headers,
+    server_timing_header
+)
+from constants import DATABASE_FILE, ANALYSIS_MAX_STALENESS, ANALYSIS_LRU_SIZE
 
 router = APIRouter(
     prefix="/pokemon",
     tags=["Pokemon-analysis"]
 )
 
+VALID_GRAPHS = (
+    list(GRAPH_METADATA)
+    + list(DISTRIBUTION_GRAPH_METADATA)
+    + list(COOCCURRENCE_GRAPH_METADATA)
+    + list(CLUSTER_GRAPH_METADATA)
+)
+
+# Encoded snapshot bodies keyed by request path, valid for one dataset
+# generation; after an ETL run the previous body is served while the new
+# one is rendered
+_snapshot_body_cache = StaleWhileRevalidateCache(ANALYSIS_MAX_STALENESS)
+
+# Bodies of filtered / top_n / approx requests, keyed by dataset generation,
+# graph and normalized parameters. Bounded: the parameter space is unbounded
+_scoped_body_cache = LRUCache(ANALYSIS_LRU_SIZE)
+
+
+async def _serve_lru(etag: str, key: tuple, render, *args):
+    """
+    Serve the body cached under key in the bounded LRU cache, rendering it
+    through the single-flight layer on a miss. render is called as
+    render(*args, key), stores the body and returns it with its timings.
+    """
+    body = _scoped_body_cache.get(key)
+    if body is not None:
+        return PreEncodedJSONResponse(body, headers=cache_headers(etag))
+
+    body, timings = await coalescer.do("analysis_scoped", key, render, *args, key)
+    return PreEncodedJSONResponse(body, headers={**cache_headers(etag), **server_timing_header(timings)})
+
+
+def _render_approximate(graph_name, key: tuple) -> tuple:
+    # graph_name None renders every sketched graph plus the distinct counts
+    conn = create_connection(read_database(DATABASE_FILE))
+    if not conn:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to connect to database"
+        )
+
+    start = perf_counter()
+    try:
+        sketches = load_sketches(conn)
+    except sqlite3.Error:
+        sketches = None
+    finally:
+        conn.close()
+
+    if sketches is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No analytics sketches: enable SKETCH_ANALYTICS and run the ETL pipeline"
+        )
+
+    if graph_name:
+        body = dumps({
+            "status": "success",
+            "graph_name": graph_name,
+            "chart_type": GRAPH_METADATA[graph_name]["type"],
+            "approximate": True,
+            **approximate_frequency(sketches, graph_name, key[2])
+        })
+    else:
+        body = dumps({
+            "status": "success",
+            "approximate": True,
+            "data": {
+                name: {
+                    "title": GRAPH_METADATA[name]["title"],
+                    "type": GRAPH_METADATA[name]["type"],
+                    **approximate_frequency(sketches, name, DEFAULT_TOP_N[name])
+                }
+                for name in SKETCH_SOURCES
+            },
+            "distinct_counts": approximate_distinct_counts(sketches)
+        })
+    _scoped_body_cache.set(key, body)
+    return body, {"sketches": (perf_counter() - start) * 1000}
+
+
+async def _serve_cached(request: Request, etag: str, endpoint: str, render, *args):
+    """
+    Serve the body cached for this path and generation. On a miss, render
+    it through the single-flight layer; if the previous generation's body is
+    still within the staleness cap, serve that at once and render behind it.
+    render is called as render(*args, path, generation) and returns the body
+    and the per-graph compute timings reported in Server-Timing.
+    """
+    path = request.url.path
+    generation = get_dataset_generation(DATABASE_FILE)
+    body = _snapshot_body_cache.get(path, generation)
+    if body is not None:
+        return PreEncodedJSONResponse(body, headers=cache_headers(etag))
+
+    key = request_key(request, generation)
+    stale = _snapshot_body_cache.get_stale(path, generation)
+    if stale is not None:
+        coalescer.spawn(endpoint, key, render, *args, path, generation)
+        return PreEncodedJSONResponse(stale, headers=stale_headers())
+
+    body, timings = await coalescer.do(endpoint, key, render, *args, path, generation)
+    return PreEncodedJSONResponse(body, headers={**cache_headers(etag), **server_timing_header(timings)})
+
+
+async def warm_analysis_cache() -> None:
+    """
+    Render /pokemon/analysis and every graph of the current dataset
+    generation one after another, so the first requests after an ETL run
+    find them cached. Requests arriving meanwhile join the render in flight.
+    Graphs computed live rather than from a snapshot are rendered but, as
+    on every request, not cached.
+    """
+    generation = get_dataset_generation(DATABASE_FILE)
+    path = f"{router.prefix}/analysis"
+    jobs = [("analysis", path, _render_analysis, ())]
+    jobs += [("analysis_graph", f"{path}/{name}", _render_graph, (name,)) for name in VALID_GRAPHS]
+
+    for endpoint, job_path, render, args in jobs:
+        try:
+            await coalescer.do(endpoint, path_key(generation, job_path), render, *args, job_path, generation)
+        except Exception as e:
+            logging.warning(f"Failed to warm {job_path}: {e}")
+
 
 @router.get("/analysis")
-async def analysis():
+async def analysis(request: Request, approx: bool = Query(False)):
     """
     Get comprehensive Pokémon analysis data for dashboard visualizations.
     
@@ -24,9 +191,39 @@ async def analysis():
             4. moves_frequency: Most common moves (bar chart)
             5. evolution_distribution: Evolved vs Not Evolved (pie chart)
             6. type_combination: Single-type vs Dual-type Pokémon (bar chart)
+
+    Served from the snapshot materialized by the latest ETL run when one
+    exists; computed live otherwise. Concurrent identical requests share
+    one computation, and right after an ETL run the previous snapshot is
+    served (without an ETag) while the new one is rendered. Live
+    computations report each graph's time in a Server-Timing header.
+
+    With approx=true, returns the ability and move frequency graphs and
+    distinct counts estimated from the loader's sketches, with error
+    bounds, instead (requires SKETCH_ANALYTICS).
     """
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    if approx:
+        key = (get_dataset_generation(DATABASE_FILE), None, None, "approx")
+        return await _serve_lru(etag, key, _render_approximate, None)
+
+    return await _serve_cached(request, etag, "analysis", _render_analysis)
+
+
+def _render_analysis(path: str, generation: str) -> tuple:
+    # Rendered once for all worker processes by the shared cache builder
+    shared = get_shared_cache(DATABASE_FILE, generation)
+    body = shared.analysis_body() if shared is not None else None
+    if body is not None:
+        _snapshot_body_cache.set(path, generation, body)
+        return body, {}
+
     # Connect to database
-    conn = create_connection(DATABASE_FILE)
+    database = read_database(DATABASE_FILE)
+    conn = create_connection(database)
     
     if not conn:
         raise HTTPException(
@@ -35,8 +232,16 @@ async def analysis():
         )
     
     try:
-        # Generate all analysis
-        analysis_data = generate_all_analysis(conn)
+        # Serve the pre-serialized snapshot of the latest ETL run
+        snapshot = load_analysis_snapshot(conn)
+        if snapshot:
+            body = render_analysis_snapshot(snapshot)
+            _snapshot_body_cache.set(path, generation, body)
+            return body, {}
+
+        # Fall back to live computation, one read connection per graph
+        timings = {}
+        analysis_data = generate_all_analysis(conn, database, timings)
         
         if not analysis_data:
             raise HTTPException(
@@ -44,10 +249,10 @@ async def analysis():
                 detail="Failed to generate analysis data"
             )
         
-        return {
+        return dumps({
             "status": "success",
             "data": analysis_data
-        }
+        }), timings
     
     except Exception as e:
         raise HTTPException(
@@ -64,34 +269,150 @@ async def analysis():
 
 
 @router.get("/analysis/{graph_name}")
-async def get_specific_analysis(graph_name: str):
+async def get_specific_analysis(
+    graph_name: str,
+    request: Request,
+    top_n: int | None = Query(None, ge=1, le=100),
+    type_name: str | None = Query(None),
+    is_evolved: bool | None = Query(None),
+    stat_range: List[str] | None = Query(None),
+    approx: bool = Query(False)
+):
     """
     Get data for a specific graph.
     
     Args:
         graph_name: Name of the graph 
             (pokemon_stats, type_distribution, abilities_frequency, 
-             moves_frequency, evolution_distribution, type_combination)
+             moves_frequency, evolution_distribution, type_combination,
+             stat_histograms, stat_quartiles, stat_by_type, stat_correlation,
+             move_cooccurrence, ability_cooccurrence, stat_clusters)
+        top_n: Entries of abilities_frequency / moves_frequency (default 10 / 15)
+        type_name, is_evolved, stat_range: Restrict the six dashboard graphs
+            to Pokémon of one type, evolution status and stat ranges, given
+            as repeatable stat:min:max (e.g. stat_range=speed:100:)
+        approx: Estimate abilities_frequency / moves_frequency from the
+            loader's sketches, with error bounds (requires SKETCH_ANALYTICS)
     
     Returns:
         dict: Data for the requested graph
     """
-    valid_graphs = [
-        "pokemon_stats",
-        "type_distribution",
-        "abilities_frequency",
-        "moves_frequency",
-        "evolution_distribution",
-        "type_combination"
-    ]
-    
-    if graph_name not in valid_graphs:
+    if graph_name not in VALID_GRAPHS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid graph name. Valid options: {', '.join(VALID_GRAPHS)}"
+        )
+
+    try:
+        scope = analysis_scope(type_name, is_evolved, [parse_stat_range(value) for value in stat_range or []])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if scope is not None and graph_name not in GRAPH_METADATA:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid graph name. Valid options: {', '.join(valid_graphs)}"
+            detail=f"Filters are only supported by: {', '.join(GRAPH_METADATA)}"
+        )
+    if top_n is not None and graph_name not in DEFAULT_TOP_N:
+        raise HTTPException(
+            status_code=400,
+            detail=f"top_n is only supported by: {', '.join(DEFAULT_TOP_N)}"
+        )
+    if approx and (graph_name not in SKETCH_SOURCES or scope is not None):
+        raise HTTPException(
+            status_code=400,
+            detail=f"approx is only supported, without filters, by: {', '.join(SKETCH_SOURCES)}"
         )
     
-    conn = create_connection("pokemon.db")
+    etag = make_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified_response(request, etag)
+
+    if approx:
+        key = (get_dataset_generation(DATABASE_FILE), graph_name, top_n or DEFAULT_TOP_N[graph_name], "approx")
+        return await _serve_lru(etag, key, _render_approximate, graph_name)
+
+    if scope is None and top_n is None:
+        return await _serve_cached(request, etag, "analysis_graph", _render_graph, graph_name)
+
+    key = (get_dataset_generation(DATABASE_FILE), graph_name, top_n or DEFAULT_TOP_N.get(graph_name), scope)
+    return await _serve_lru(etag, key, _render_scoped, graph_name)
+
+
+def _render_scoped(graph_name: str, key: tuple) -> tuple:
+    _, _, top_n, scope = key
+    conn = create_connection(read_database(DATABASE_FILE))
+
+    if not conn:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to connect to database"
+        )
+
+    try:
+        function = {
+            "pokemon_stats": get_pokemon_stats_average,
+            "type_distribution": get_type_distribution,
+            "abilities_frequency": get_abilities_frequency,
+            "moves_frequency": get_moves_frequency,
+            "evolution_distribution": get_evolution_stage_distribution,
+            "type_combination": get_type_combination_distribution
+        }[graph_name]
+        arguments = {"scope": scope}
+        if top_n is not None:
+            arguments["top_n"] = top_n
+
+        start = perf_counter()
+        data = function(conn, **arguments)
+        body = dumps({
+            "status": "success",
+            "graph_name": graph_name,
+            "chart_type": GRAPH_METADATA[graph_name]["type"],
+            "data": data
+        })
+        _scoped_body_cache.set(key, body)
+        return body, {graph_name: (perf_counter() - start) * 1000}
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error generating analysis: {str(e)}"
+        )
+
+    finally:
+        try:
+            conn.close()
+        except:
+            pass
+
+
+def _render_graph(graph_name: str, path: str, generation: str) -> tuple:
+    shared = get_shared_cache(DATABASE_FILE, generation)
+    body = shared.analysis_body(graph_name) if shared is not None else None
+    if body is not None:
+        _snapshot_body_cache.set(path, generation, body)
+        return body, {}
+
+    if graph_name in DISTRIBUTION_GRAPH_METADATA:
+        # NumPy distribution graphs, computed once per dataset generation
+        try:
+            distributions = get_stat_distributions(DATABASE_FILE, generation)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error generating analysis: {str(e)}"
+            )
+
+        body = dumps({
+            "status": "success",
+            "graph_name": graph_name,
+            "title": DISTRIBUTION_GRAPH_METADATA[graph_name]["title"],
+            "chart_type": DISTRIBUTION_GRAPH_METADATA[graph_name]["type"],
+            "data": distributions[graph_name]
+        })
+        _snapshot_body_cache.set(path, generation, body)
+        return body, {}
+
+    conn = create_connection(read_database(DATABASE_FILE))
     
     if not conn:
         raise HTTPException(
@@ -100,16 +421,30 @@ async def get_specific_analysis(graph_name: str):
         )
     
     try:
-        # Import the specific function
-        from data_processing.analysis import (
-            get_pokemon_stats_average,
-            get_type_distribution,
-            get_abilities_frequency,
-            get_moves_frequency,
-            get_evolution_stage_distribution,
-            get_type_combination_distribution
-        )
-        
+        # Serve the pre-serialized snapshot of the latest ETL run
+        snapshot = load_analysis_snapshot(conn)
+        if graph_name in snapshot:
+            body = render_graph_snapshot(graph_name, snapshot[graph_name])
+            _snapshot_body_cache.set(path, generation, body)
+            return body, {}
+
+        if graph_name in COOCCURRENCE_GRAPH_METADATA:
+            # Snapshot predates co-occurrence mining: mine once per generation
+            graph = generate_cooccurrence_analysis(conn).get(graph_name)
+            if graph is None:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to generate analysis data"
+                )
+            body = dumps({
+                "status": "success",
+                "graph_name": graph_name,
+                "chart_type": graph["type"],
+                "data": graph["data"]
+            })
+            _snapshot_body_cache.set(path, generation, body)
+            return body, {}
+
         # Map graph names to functions
         function_map = {
             "pokemon_stats": get_pokemon_stats_average,
@@ -117,28 +452,20 @@ async def get_specific_analysis(graph_name: str):
             "abilities_frequency": get_abilities_frequency,
             "moves_frequency": get_moves_frequency,
             "evolution_distribution": get_evolution_stage_distribution,
-            "type_combination": get_type_combination_distribution
+            "type_combination": get_type_combination_distribution,
+            "stat_clusters": get_stat_clusters
         }
         
         # Get the data
+        start = perf_counter()
         data = function_map[graph_name](conn)
         
-        # Determine chart type
-        chart_types = {
-            "pokemon_stats": "radar",
-            "type_distribution": "pie",
-            "abilities_frequency": "bar",
-            "moves_frequency": "bar",
-            "evolution_distribution": "pie",
-            "type_combination": "bar"
-        }
-        
-        return {
+        return dumps({
             "status": "success",
             "graph_name": graph_name,
-            "chart_type": chart_types[graph_name],
+            "chart_type": {**GRAPH_METADATA, **CLUSTER_GRAPH_METADATA}[graph_name]["type"],
             "data": data
-        }
+        }), {graph_name: (perf_counter() - start) * 1000}
     
     except Exception as e:
         raise HTTPException(
@@ -151,4 +478,4 @@ async def get_specific_analysis(graph_name: str):
             try:
                 conn.close()
             except:
-                pass
\ No newline at end of file
+                pass
@@ -0,0 +1,45 @@
+# routers/responses.py
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON bytes, using orjson when available.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (stdlib json fallback).
+    Endpoints that return this class directly also skip FastAPI's
+    jsonable_encoder pass over plain dict/list payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class PreEncodedJSONResponse(JSONResponse):
+    """
+    JSON response for payloads that are already serialized to bytes,
+    e.g. materialized snapshots or cached bodies. Nothing is re-encoded.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
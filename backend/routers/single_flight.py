@@ -0,0 +1,104 @@
+# routers/single_flight.py
+
+import asyncio
+import threading
+from typing import Callable, Dict, Hashable
+from urllib.parse import urlencode
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+
+def request_key(request: Request, generation: str) -> tuple:
+    """
+    Coalescing key of a read request: the dataset generation, the path and
+    the normalized (sorted) query parameters, as used for its ETag. Requests
+    that differ only in parameter order share one computation; requests
+    that straddle an ETL run do not.
+    """
+    return path_key(generation, request.url.path, urlencode(sorted(request.query_params.multi_items())))
+
+
+def path_key(generation: str, path: str, params: str = "") -> tuple:
+    """
+    Coalescing key for work started outside a request, e.g. background
+    refreshes; equal to request_key of a request for the same path.
+    """
+    return generation, path, params
+
+
+class SingleFlight:
+    """
+    Concurrent identical requests await one shared computation instead of
+    each running the same queries.
+
+    The first caller for a key (the leader) starts fn in the threadpool;
+    callers arriving with the same key while it runs await the same task.
+    Every caller awaits through asyncio.shield, so a client disconnecting
+    never cancels the computation the others are waiting on. The key is
+    released as soon as the computation finishes, so results are never
+    served from here after the fact; caching stays the caller's business.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, endpoint: str, key: Hashable, fn: Callable, *args):
+        """
+        Run fn(*args) once for all concurrent callers with the same endpoint
+        and key and return (or raise) its result to each of them.
+        """
+        return await asyncio.shield(self._join(endpoint, key, fn, args))
+
+    def spawn(self, endpoint: str, key: Hashable, fn: Callable, *args) -> None:
+        """
+        Start fn(*args) in the background without waiting for it, unless
+        the same computation is already in flight. Requests arriving
+        meanwhile join it through do(). Must be called from the event loop.
+        """
+        self._join(endpoint, key, fn, args)
+
+    def _join(self, endpoint: str, key: Hashable, fn: Callable, args: tuple) -> asyncio.Future:
+        flight_key = (endpoint, key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(fn, *args))
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda done: self._land(flight_key, done))
+            self._count(endpoint, "executed")
+        else:
+            self._count(endpoint, "coalesced")
+        return task
+
+    def _land(self, flight_key, task: asyncio.Future) -> None:
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def _count(self, endpoint: str, outcome: str) -> None:
+        with self._lock:
+            counters = self._metrics.setdefault(endpoint, {"executed": 0, "coalesced": 0})
+            counters[outcome] += 1
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per endpoint: computations executed, and requests that were
+        coalesced into one already in flight instead of running their own.
+        """
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._metrics.items()}
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+# Shared by every router so metrics cover all coalesced endpoints
+coalescer = SingleFlight()
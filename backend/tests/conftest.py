@@ -0,0 +1,65 @@
+# tests/conftest.py
+import pytest
+from unittest.mock import patch
+from data_processing.load import create_connection, create_tables, load_pokemons
+
+
+def _make_pokemon(pokemon_id, name=None, types=("normal",), abilities=(), moves=(), stats=None, is_evolved=False):
+    return {
+        "main": {"id": pokemon_id, "name": name or f"mon-{pokemon_id}", "is_evolved": is_evolved},
+        "types": list(types),
+        "abilities": list(abilities),
+        "moves": list(moves),
+        "stats": [{"stat_name": stat, "base_stat": value} for stat, value in (stats or {}).items()],
+    }
+
+
+@pytest.fixture
+def make_pokemon():
+    """Factory for one Pokémon's transformed data as load_pokemons takes it; stats maps stat name to base stat"""
+    return _make_pokemon
+
+
+@pytest.fixture
+def pokemon_db(tmp_path):
+    """
+    Factory loading the given Pokémon into a database in tmp_path, returning
+    its path. name may also be the path of an existing database to add to.
+    """
+    def build(pokemon, name="test.db"):
+        path = str(tmp_path / name)
+        conn = create_connection(path)
+        create_tables(conn)
+        for data in pokemon:
+            load_pokemons(conn, data)
+        conn.close()
+        return path
+
+    return build
+
+
+@pytest.fixture
+def pokemon_conn(pokemon_db):
+    """Factory like pokemon_db returning an open connection, closed after the test"""
+    connections = []
+
+    def build(pokemon, name="test.db"):
+        conn = create_connection(pokemon_db(pokemon, name))
+        connections.append(conn)
+        return conn
+
+    yield build
+    for conn in connections:
+        conn.close()
+
+
+@pytest.fixture
+def pokemon_db_file(pokemon_db, make_pokemon):
+    """Two loaded Pokémon in a temporary database served by the pokemon router"""
+    db_file = pokemon_db([
+        make_pokemon(pokemon_id, name, types=["grass"], moves=["tackle"], stats={"hp": 45})
+        for pokemon_id, name in [(1, "bulbasaur"), (4, "charmander")]
+    ])
+
+    with patch('routers.pokemon.DATABASE_FILE', db_file):
+        yield db_file
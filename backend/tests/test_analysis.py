@@ -0,0 +1,104 @@
+# tests/test_analysis.py
+import pytest
+from unittest.mock import patch
+from data_processing.load import create_connection
+from data_processing.analysis import GRAPH_FUNCTIONS, GRAPH_METADATA, generate_all_analysis
+
+
+@pytest.fixture
+def db_file(pokemon_db, make_pokemon):
+    return pokemon_db([
+        make_pokemon(
+            pokemon_id, name, types,
+            abilities=["overgrow" if "grass" in types else "blaze"],
+            moves=["tackle", "growl"],
+            stats={"hp": 40 + pokemon_id},
+            is_evolved=is_evolved,
+        )
+        for pokemon_id, name, types, is_evolved in (
+            (1, "bulbasaur", ["grass", "poison"], False),
+            (2, "ivysaur", ["grass", "poison"], True),
+            (4, "charmander", ["fire"], False),
+        )
+    ])
+
+
+@pytest.fixture
+def two_workers():
+    with patch("data_processing.analysis.ANALYSIS_WORKERS", 2), \
+            patch("data_processing.analysis.os.cpu_count", return_value=4):
+        yield
+
+
+class TestGenerateAllAnalysis:
+    """Test suite for computing the dashboard graphs"""
+
+    def test_parallel_matches_serial(self, db_file, two_workers):
+        """Test that per-connection parallel computation gives the serial result"""
+        conn = create_connection(db_file)
+        try:
+            serial = generate_all_analysis(conn)
+            with patch("data_processing.analysis._compute_graphs_serial") as mock_serial:
+                parallel = generate_all_analysis(conn, db_file)
+        finally:
+            conn.close()
+
+        mock_serial.assert_not_called()
+        assert parallel == serial
+        assert set(parallel) == set(GRAPH_METADATA)
+        assert parallel["type_distribution"]["data"] == {"grass": 2, "poison": 2, "fire": 1}
+
+    def test_timings(self, db_file, two_workers):
+        """Test that every graph's compute time is reported"""
+        conn = create_connection(db_file)
+        timings = {}
+        try:
+            generate_all_analysis(conn, db_file, timings)
+        finally:
+            conn.close()
+
+        assert set(timings) == set(GRAPH_FUNCTIONS)
+        assert all(elapsed >= 0 for elapsed in timings.values())
+
+    def test_falls_back_when_file_changes(self, db_file, two_workers):
+        """Test that results spanning two dataset generations are recomputed serially"""
+        conn = create_connection(db_file)
+        try:
+            with patch("data_processing.analysis.get_dataset_generation", side_effect=["gen-1", "gen-2"]), \
+                    patch("data_processing.analysis._compute_graphs_serial", return_value={}) as mock_serial:
+                generate_all_analysis(conn, db_file)
+        finally:
+            conn.close()
+
+        mock_serial.assert_called_once_with(conn)
+
+    def test_falls_back_when_file_missing(self, db_file, tmp_path, two_workers):
+        """Test that an unopenable db_file falls back to the given connection"""
+        conn = create_connection(db_file)
+        try:
+            result = generate_all_analysis(conn, str(tmp_path / "missing.db"))
+        finally:
+            conn.close()
+
+        assert result["evolution_distribution"]["data"] == {"Evolved": 1, "Not Evolved": 2}
+        assert not (tmp_path / "missing.db").exists()
+
+    def test_single_core_runs_serially(self, db_file):
+        """Test that one available core keeps the computation on conn"""
+        conn = create_connection(db_file)
+        try:
+            with patch("data_processing.analysis.os.cpu_count", return_value=1), \
+                    patch("data_processing.analysis._compute_graphs_parallel") as mock_parallel:
+                generate_all_analysis(conn, db_file)
+        finally:
+            conn.close()
+
+        mock_parallel.assert_not_called()
+
+    def test_no_connection(self):
+        """Test that no connection yields no analysis"""
+        assert generate_all_analysis(None) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+# tests/test_build.py
+import os
+import sqlite3
+import pytest
+from unittest.mock import patch
+from data_processing.build import (
+    build_file_for,
+    seed_build_database,
+    verify_database,
+    run_blue_green_build,
+)
+
+
+@pytest.fixture
+def add_pokemon(pokemon_db, make_pokemon):
+    def add(db_file, pokemon_id, name):
+        pokemon_db([make_pokemon(pokemon_id, name, stats={"hp": 50})], db_file)
+        return True
+
+    return add
+
+
+def names(db_file):
+    conn = sqlite3.connect(db_file)
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM pokemon ORDER BY id")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def live_file(add_pokemon, tmp_path):
+    path = str(tmp_path / "live.db")
+    add_pokemon(path, 1, "bulbasaur")
+    return path
+
+
+class TestBlueGreenBuild:
+    """Test suite for run_blue_green_build"""
+
+    def test_build_is_swapped_in(self, live_file, add_pokemon):
+        """Test that the build starts from the live data and replaces it atomically"""
+        reader = sqlite3.connect(live_file)
+        reader.execute("BEGIN")
+        assert reader.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0] == 1
+
+        with patch('data_processing.build.run_etl_pipeline', side_effect=lambda f: add_pokemon(f, 2, "ivysaur")) as etl:
+            assert run_blue_green_build(live_file) is True
+
+        etl.assert_called_once_with(build_file_for(live_file))
+        assert names(live_file) == ["bulbasaur", "ivysaur"]
+        assert not os.path.exists(build_file_for(live_file))
+        # A reader that was already open finishes on the old file
+        assert reader.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0] == 1
+        reader.close()
+
+    def test_failed_etl_keeps_live_database(self, live_file, add_pokemon):
+        """Test that a failed build leaves the live database untouched"""
+        def half_load(build_file):
+            add_pokemon(build_file, 2, "ivysaur")
+            return False
+
+        with patch('data_processing.build.run_etl_pipeline', side_effect=half_load):
+            assert run_blue_green_build(live_file) is False
+
+        assert names(live_file) == ["bulbasaur"]
+        assert not os.path.exists(build_file_for(live_file))
+
+    def test_first_build_without_live_database(self, tmp_path, add_pokemon):
+        """Test that a first build creates the live database"""
+        live = str(tmp_path / "new.db")
+
+        with patch('data_processing.build.run_etl_pipeline', side_effect=lambda f: add_pokemon(f, 1, "bulbasaur")):
+            assert run_blue_green_build(live) is True
+
+        assert names(live) == ["bulbasaur"]
+
+
+class TestVerifyDatabase:
+    """Test suite for seed_build_database and verify_database"""
+
+    def test_verify(self, live_file, pokemon_db):
+        """Test that a loaded database passes and gets planner statistics"""
+        assert verify_database(live_file) is True
+        conn = sqlite3.connect(live_file)
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        conn.close()
+
+        empty = pokemon_db([], "empty.db")
+        assert verify_database(empty) is False
+
+    def test_dangling_foreign_key_fails(self, live_file):
+        """Test that a database with orphaned rows is rejected"""
+        conn = sqlite3.connect(live_file)
+        conn.execute("INSERT INTO pokemon_types (pokemon_id, type_name) VALUES (99, 'normal')")
+        conn.commit()
+        conn.close()
+
+        assert verify_database(live_file) is False
+
+    def test_seed_copies_live_data(self, live_file):
+        """Test that the build file starts as a copy of the live database"""
+        build = build_file_for(live_file)
+        assert seed_build_database(live_file, build) is True
+        assert names(build) == ["bulbasaur"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
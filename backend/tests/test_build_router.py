@@ -0,0 +1,63 @@
+# tests/test_build_router.py
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app import app
+from routers import pokemon_analysis
+
+client = TestClient(app)
+
+
+class TestBlueGreenRouter:
+    """Test suite for blue/green builds from the ETL pipeline endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def clear_analysis_cache(self):
+        # The endpoint warms the analysis cache; keep its bodies out of other tests
+        yield
+        pokemon_analysis._snapshot_body_cache.clear()
+
+    @patch('routers.etl_pipeline.run_etl_pipeline')
+    @patch('routers.etl_pipeline.run_blue_green_build')
+    def test_run_pipeline_blue_green(self, mock_build, mock_run_etl):
+        """Test that blue_green builds into a separate file instead of the live one"""
+        mock_build.return_value = True
+
+        response = client.post("/pokemon/etl/run-pipeline?blue_green=true")
+
+        assert response.status_code == 200
+        mock_build.assert_called_once()
+        mock_run_etl.assert_not_called()
+
+    def test_reads_served_during_build(self, pokemon_db_file):
+        """Test that a read completes while a build is still running"""
+        started, release = threading.Event(), threading.Event()
+
+        def slow_build():
+            started.set()
+            release.wait(5)
+            return True
+
+        with TestClient(app) as shared_client, \
+                patch('routers.etl_pipeline.run_blue_green_build', side_effect=slow_build), \
+                patch('routers.etl_pipeline.refresh_replica'):
+            build = threading.Thread(
+                target=shared_client.post, args=("/pokemon/etl/run-pipeline?blue_green=true&warm_analysis=false",)
+            )
+            build.start()
+            try:
+                assert started.wait(5)
+                response = shared_client.get("/pokemon/")
+                still_building = build.is_alive()
+            finally:
+                release.set()
+                build.join(5)
+
+        assert response.status_code == 200
+        assert response.json() == ["bulbasaur", "charmander"]
+        assert still_building
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+# tests/test_clustering.py
+import numpy as np
+import pytest
+from data_processing.clustering import kmeans, rebuild_stat_clusters, get_stat_clusters
+
+# Two clear archetypes: bulky (high hp, low speed) and fast (low hp, high speed)
+POKEMON = [
+    (1, 150, 30), (2, 140, 35), (3, 160, 25),
+    (4, 40, 130), (5, 45, 120), (6, 35, 140),
+]
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(pokemon_id, stats={"hp": hp, "speed": speed})
+        for pokemon_id, hp, speed in POKEMON
+    ])
+
+
+
+class TestKMeans:
+    """Test suite for the kmeans function"""
+
+    def test_separates_blobs_deterministically(self):
+        """Test that well separated blobs are recovered, identically per seed"""
+        rng = np.random.default_rng(0)
+        points = np.vstack([rng.normal(center, 0.1, size=(30, 2)) for center in ([0, 0], [5, 5], [0, 5])])
+
+        labels, centroids = kmeans(points, 3, seed=1)
+        again, _ = kmeans(points, 3, seed=1)
+
+        assert np.array_equal(labels, again)
+        assert [len(set(labels[i:i + 30].tolist())) for i in (0, 30, 60)] == [1, 1, 1]
+        assert len(set(labels.tolist())) == 3
+        assert np.allclose(sorted(centroids.round().tolist()), [[0, 0], [0, 5], [5, 5]])
+
+
+class TestStatClusters:
+    """Test suite for rebuild_stat_clusters and get_stat_clusters"""
+
+    def test_clusters_are_stored(self, conn):
+        """Test that every Pokémon gets a cluster and centroids are in raw units"""
+        assert rebuild_stat_clusters(conn, k=2)
+
+        members = dict(conn.execute("SELECT pokemon_id, cluster_id FROM pokemon_clusters").fetchall())
+        assert len(members) == 6
+        assert members[1] == members[2] == members[3]
+        assert members[4] == members[5] == members[6] != members[1]
+
+        graph = get_stat_clusters(conn)
+        bulky = graph["clusters"][members[1]]
+        assert bulky["label"] == "high hp"
+        assert bulky["size"] == 3
+        assert bulky["centroid"] == {"hp": 150.0, "speed": 30.0}
+        assert bulky["examples"][0] == "mon-1"
+
+    def test_rebuild_replaces_results(self, conn):
+        """Test that re-clustering swaps in the new results"""
+        assert rebuild_stat_clusters(conn, k=2)
+        assert rebuild_stat_clusters(conn, k=3)
+
+        assert conn.execute("SELECT COUNT(*) FROM stat_clusters").fetchone()[0] == 3
+        assert conn.execute("SELECT COUNT(*) FROM pokemon_clusters").fetchone()[0] == 6
+
+    def test_empty_database(self, pokemon_conn):
+        """Test that clustering an empty roster stores nothing"""
+        conn = pokemon_conn([], "empty.db")
+
+        assert rebuild_stat_clusters(conn)
+        assert get_stat_clusters(conn) == {}
+        assert rebuild_stat_clusters(None) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,34 @@
+# tests/test_clusters_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from app import app
+
+client = TestClient(app)
+
+
+class TestClusterFilterRouter:
+    """Test suite for filtering Pokémon by stat archetype cluster"""
+
+    @patch('routers.pokemon.sqlite3.connect')
+    def test_filter_pokemons_by_cluster(self, mock_connect):
+        """Test filter Pokemon by stat archetype cluster"""
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+
+        mock_cursor.fetchall.return_value = [
+            {"name": "shuckle", "hp": 20}
+        ]
+
+        response = client.get("/pokemon/filter_pokemons?cluster=2")
+
+        assert response.status_code == 200
+        query, params = mock_cursor.execute.call_args[0]
+        assert "pokemon_clusters" in query
+        assert params == [2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
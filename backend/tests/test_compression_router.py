@@ -0,0 +1,43 @@
+# tests/test_compression_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app import app
+
+client = TestClient(app)
+
+
+class TestCompressedETag:
+    """Test suite for revalidating compressed representations"""
+
+    @patch('routers.pokemon.sqlite3.connect')
+    def test_compressed_etag_matches(self, mock_connect):
+        """Test that the ETag of a compressed representation revalidates"""
+        mock_connect.return_value.cursor.return_value.fetchall.return_value = []
+
+        etag = client.get("/pokemon/").headers["etag"]
+        response = client.get(
+            "/pokemon/",
+            headers={"If-None-Match": etag[:-1] + '-gzip"'}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag[:-1] + '-gzip"'
+
+    @patch('routers.pokemon.sqlite3.connect')
+    def test_not_modified_keeps_identity_etag(self, mock_connect):
+        """Test that revalidating an uncompressed representation confirms its own tag"""
+        mock_connect.return_value.cursor.return_value.fetchall.return_value = []
+
+        etag = client.get("/pokemon/").headers["etag"]
+        response = client.get(
+            "/pokemon/",
+            headers={"If-None-Match": f'"other", W/{etag}', "Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+# tests/test_cooccurrence.py
+import numpy as np
+import pytest
+from unittest.mock import patch
+from data_processing.cooccurrence import (
+    load_incidence,
+    pair_counts,
+    fp_growth,
+    compute_cooccurrence,
+    generate_cooccurrence_analysis,
+    COOCCURRENCE_GRAPH_METADATA,
+)
+
+MOVES = {
+    1: ["rest", "snore", "tackle"],
+    2: ["rest", "snore", "tackle", "growl"],
+    3: ["rest", "snore", "ember"],
+    4: ["tackle", "growl"],
+}
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(
+            pokemon_id,
+            abilities=["run-away"] if pokemon_id % 2 else ["run-away", "guts"],
+            moves=moves,
+            stats={"hp": 50},
+        )
+        for pokemon_id, moves in MOVES.items()
+    ])
+
+
+def brute_force_itemsets(transactions, min_count, max_length):
+    from itertools import combinations
+    items = sorted({item for t in transactions for item in t})
+    found = {}
+    for size in range(1, max_length + 1):
+        for itemset in combinations(items, size):
+            count = sum(1 for t in transactions if set(itemset) <= set(t))
+            if count >= min_count:
+                found[itemset] = count
+    return found
+
+
+class TestIncidence:
+    """Test suite for load_incidence and pair_counts"""
+
+    def test_pair_counts_match_junction(self, conn):
+        """Test that X^T X counts the Pokémon sharing each pair of moves"""
+        pokemon_ids, names, matrix = load_incidence(conn, "pokemon_moves", "move_name")
+        assert pokemon_ids == [1, 2, 3, 4]
+
+        i, j, counts = pair_counts(matrix)
+        pairs = {(names[a], names[b]): int(c) for a, b, c in zip(i, j, counts)}
+        assert pairs[("rest", "snore")] == 3
+        assert pairs[("growl", "tackle")] == 2
+        assert ("ember", "growl") not in pairs
+
+    def test_dense_fallback(self, conn):
+        """Test that the NumPy fallback gives the same counts as scipy"""
+        _, _, matrix = load_incidence(conn, "pokemon_moves", "move_name")
+        with patch('data_processing.cooccurrence.sparse', None):
+            _, _, dense = load_incidence(conn, "pokemon_moves", "move_name")
+            dense_pairs = sorted(zip(*(a.tolist() for a in pair_counts(dense))))
+        assert isinstance(dense, np.ndarray)
+        assert sorted(zip(*(a.tolist() for a in pair_counts(matrix)))) == dense_pairs
+
+
+class TestFPGrowth:
+    """Test suite for fp_growth function"""
+
+    def test_matches_brute_force(self):
+        """Test that FP-growth finds exactly the frequent itemsets"""
+        rng = np.random.default_rng(7)
+        transactions = [sorted(rng.choice(8, size=rng.integers(1, 6), replace=False).tolist()) for _ in range(40)]
+
+        result = dict(fp_growth(transactions, min_count=6, max_length=3))
+
+        assert result == brute_force_itemsets(transactions, 6, 3)
+
+    def test_empty(self):
+        """Test that no transactions yield no itemsets"""
+        assert fp_growth([[], []], min_count=1) == []
+
+
+class TestComputeCooccurrence:
+    """Test suite for compute_cooccurrence and generate_cooccurrence_analysis"""
+
+    def test_pairs_and_itemsets(self, conn):
+        """Test support, lift and the three-item itemsets"""
+        result = compute_cooccurrence(conn, "pokemon_moves", "move_name", min_support=0.5)
+
+        assert result["pokemon_count"] == 4
+        top = result["pairs"][0]
+        assert top["items"] == ["rest", "snore"]
+        assert top["support"] == 0.75
+        assert top["lift"] == round(3 * 4 / (3 * 3), 4)
+        assert all(pair["count"] >= 2 for pair in result["pairs"])
+        assert result["itemsets"] == [
+            {"items": ["rest", "snore", "tackle"], "count": 2, "support": 0.5}
+        ]
+
+    def test_generate_all_graphs(self, conn):
+        """Test that every co-occurrence graph is produced with its metadata"""
+        graphs = generate_cooccurrence_analysis(conn)
+
+        assert set(graphs) == set(COOCCURRENCE_GRAPH_METADATA)
+        abilities = graphs["ability_cooccurrence"]["data"]
+        assert abilities["pairs"][0]["items"] == ["guts", "run-away"]
+        assert generate_cooccurrence_analysis(None) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,35 @@
+# tests/test_cooccurrence_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from app import app
+
+client = TestClient(app)
+
+
+class TestCooccurrenceRouter:
+    """Test suite for the co-occurrence graph endpoints"""
+
+    @patch('routers.pokemon_analysis.generate_cooccurrence_analysis')
+    @patch('routers.pokemon_analysis.create_connection')
+    def test_get_specific_analysis_cooccurrence(self, mock_create_connection, mock_generate):
+        """Test that a co-occurrence graph is mined live when no snapshot holds it"""
+        mock_create_connection.return_value = MagicMock()
+        mock_generate.return_value = {
+            "move_cooccurrence": {
+                "data": {"pairs": [{"items": ["rest", "snore"], "count": 3}], "itemsets": []},
+                "title": "Moves Learned Together",
+                "type": "network"
+            }
+        }
+
+        response = client.get("/pokemon/analysis/move_cooccurrence")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["chart_type"] == "network"
+        assert data["data"]["pairs"][0]["items"] == ["rest", "snore"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
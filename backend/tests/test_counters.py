@@ -0,0 +1,136 @@
+# tests/test_counters.py
+import pytest
+from unittest.mock import patch
+from data_processing.load import create_connection, create_tables, load_pokemons
+from data_processing.counters import check_counters, rebuild_counters
+from data_processing.analysis import (
+    get_type_distribution,
+    get_abilities_frequency,
+    get_moves_frequency,
+    get_pokemon_stats_average,
+)
+
+
+@pytest.fixture
+def pokemon(make_pokemon):
+    def build(pokemon_id, name, types, moves, hp):
+        return make_pokemon(pokemon_id, name, types, abilities=["overgrow"], moves=moves, stats={"hp": hp})
+
+    return build
+
+
+@pytest.fixture
+def conn(pokemon_conn, pokemon):
+    return pokemon_conn([
+        pokemon(1, "bulbasaur", ["grass", "poison"], ["tackle", "growl"], 45),
+        pokemon(2, "ivysaur", ["grass", "poison"], ["tackle"], 60),
+        pokemon(4, "charmander", ["fire"], ["scratch", "growl"], 39),
+    ])
+
+
+class TestCounterTriggers:
+    """Test suite for trigger-maintained aggregate counters"""
+
+    def test_counters_follow_inserts(self, conn):
+        """Test that counters are incremented by the loader"""
+        rows = dict(conn.execute("SELECT type_name, count FROM type_counts").fetchall())
+        assert rows == {"grass": 2, "poison": 2, "fire": 1}
+
+        total, count = conn.execute(
+            "SELECT total, count FROM stat_sums WHERE stat_name = 'hp'"
+        ).fetchone()
+        assert total == 144
+        assert count == 3
+
+        assert check_counters(conn) == {}
+
+    def test_reload_does_not_double_count(self, conn, pokemon):
+        """Test that ignored duplicate inserts leave counters untouched"""
+        load_pokemons(conn, pokemon(1, "bulbasaur", ["grass", "poison"], ["tackle", "growl"], 45))
+
+        moves = dict(conn.execute("SELECT move_name, count FROM move_counts").fetchall())
+        assert moves == {"tackle": 2, "growl": 2, "scratch": 1}
+        assert check_counters(conn) == {}
+
+    def test_counters_follow_deletes(self, conn):
+        """Test that deleting junction rows decrements and prunes counters"""
+        conn.execute("DELETE FROM pokemon_types WHERE pokemon_id = 4")
+        conn.execute("DELETE FROM pokemon_stats WHERE pokemon_id = 4")
+        conn.commit()
+
+        rows = dict(conn.execute("SELECT type_name, count FROM type_counts").fetchall())
+        assert "fire" not in rows
+        assert get_pokemon_stats_average(conn) == {"hp": 52.5}
+        assert check_counters(conn) == {}
+
+
+class TestCounterConsistency:
+    """Test suite for the counter consistency checker"""
+
+    def test_detects_and_repairs_drift(self, conn):
+        """Test that drifted counters are reported and rebuilt"""
+        conn.execute("UPDATE move_counts SET count = 99 WHERE move_name = 'tackle'")
+        conn.execute("DELETE FROM type_counts")
+        conn.commit()
+
+        drift = check_counters(conn)
+        assert drift["move_counts"] == 2
+        assert drift["type_counts"] == 3
+        assert "ability_counts" not in drift
+
+        assert rebuild_counters(conn) is True
+        assert check_counters(conn) == {}
+
+    def test_analysis_reads_counters(self, conn):
+        """Test that analysis results match a full recomputation"""
+        assert get_type_distribution(conn) == {"grass": 2, "poison": 2, "fire": 1}
+        assert get_moves_frequency(conn, top_n=1) in ({"tackle": 2}, {"growl": 2})
+        assert get_abilities_frequency(conn) == {"overgrow": 3}
+
+    def test_analysis_falls_back_without_counters(self, conn):
+        """Test that empty counters fall back to live aggregation"""
+        conn.execute("DELETE FROM type_counts")
+        conn.commit()
+
+        assert get_type_distribution(conn) == {"grass": 2, "poison": 2, "fire": 1}
+
+    def test_analysis_falls_back_without_counter_tables(self, tmp_path, pokemon):
+        """Test that a database built before the counter tables is aggregated live"""
+        conn = create_connection(str(tmp_path / "old.db"))
+        try:
+            with patch("data_processing.load.counter_table_definitions", return_value=[]), \
+                    patch("data_processing.load.missing_counter_tables", return_value=[]):
+                create_tables(conn)
+            load_pokemons(conn, pokemon(1, "bulbasaur", ["grass", "poison"], ["tackle", "growl"], 45))
+            load_pokemons(conn, pokemon(4, "charmander", ["fire"], ["tackle"], 39))
+
+            assert get_type_distribution(conn) == {"grass": 1, "poison": 1, "fire": 1}
+            assert get_abilities_frequency(conn) == {"overgrow": 2}
+            assert get_moves_frequency(conn, top_n=1) == {"tackle": 2}
+            assert get_pokemon_stats_average(conn) == {"hp": 42.0}
+        finally:
+            conn.close()
+
+    def test_counters_seeded_on_upgrade(self, tmp_path, pokemon):
+        """Test that counter tables added to a populated database start out complete"""
+        conn = create_connection(str(tmp_path / "old.db"))
+        try:
+            with patch("data_processing.load.counter_table_definitions", return_value=[]), \
+                    patch("data_processing.load.missing_counter_tables", return_value=[]):
+                create_tables(conn)
+            load_pokemons(conn, pokemon(1, "bulbasaur", ["grass", "poison"], ["tackle", "growl"], 45))
+
+            assert create_tables(conn) is True
+            load_pokemons(conn, pokemon(4, "charmander", ["fire"], ["ember"], 39))
+
+            assert check_counters(conn) == {}
+            assert get_type_distribution(conn) == {"grass": 1, "poison": 1, "fire": 1}
+            assert get_moves_frequency(conn) == {"ember": 1, "growl": 1, "tackle": 1}
+            assert get_pokemon_stats_average(conn) == {"hp": 42.0}
+        finally:
+            conn.close()
+
+    def test_none_connection(self):
+        """Test that None connection is handled"""
+        assert check_counters(None) == {}
+        assert rebuild_counters(None) is False
@@ -0,0 +1,68 @@
+# tests/test_crawler.py
+import pytest
+from unittest.mock import patch, Mock
+from data_processing.crawler import RateLimiter, crawl_resources
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter"""
+
+    @patch('data_processing.crawler.monotonic', return_value=100.0)
+    @patch('data_processing.crawler.sleep')
+    def test_calls_are_spaced(self, mock_sleep, mock_monotonic):
+        """Test that consecutive calls wait one interval longer each"""
+        limiter = RateLimiter(4)
+        for _ in range(3):
+            limiter.wait()
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.25, 0.5]
+
+    @patch('data_processing.crawler.sleep')
+    def test_zero_rate_disables_limit(self, mock_sleep):
+        """Test that a non-positive rate never sleeps"""
+        limiter = RateLimiter(0)
+        for _ in range(3):
+            limiter.wait()
+
+        mock_sleep.assert_not_called()
+
+
+class TestCrawlResources:
+    """Test suite for crawl_resources function"""
+
+    @patch('data_processing.crawler.requests.get')
+    def test_fetches_each_url_once(self, mock_get):
+        """Test that duplicate URLs are fetched once and results keep input order"""
+
+        def response_for(url, timeout):
+            response = Mock()
+            response.json.return_value = {"url": url}
+            return response
+        mock_get.side_effect = response_for
+
+        urls = [f"https://example.test/move/{i}/" for i in range(20)]
+        result = crawl_resources(urls + urls, max_workers=4, rate=0)
+
+        assert list(result) == urls
+        assert result[urls[3]] == {"url": urls[3]}
+        assert mock_get.call_count == 20
+
+    @patch('data_processing.crawler.requests.get')
+    def test_failures_map_to_none(self, mock_get):
+        """Test that failed requests and bad JSON map to None"""
+        import requests
+        bad_json = Mock()
+        bad_json.json.side_effect = ValueError()
+        mock_get.side_effect = [requests.exceptions.ConnectionError(), bad_json]
+
+        result = crawl_resources(["https://example.test/a/", "https://example.test/b/"], max_workers=1, rate=0)
+
+        assert result == {"https://example.test/a/": None, "https://example.test/b/": None}
+
+    def test_empty_input(self):
+        """Test that no URLs means no requests"""
+        assert crawl_resources([]) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
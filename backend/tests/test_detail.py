@@ -0,0 +1,64 @@
+# tests/test_detail.py
+import json
+import pytest
+from data_processing.detail import fetch_pokemon_document, fetch_pokemon_documents
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(
+            1, "bulbasaur", ["grass", "poison"],
+            abilities=["overgrow", "chlorophyll"],
+            moves=["tackle", "vine-whip"],
+            stats={"hp": 45, "attack": 49},
+        ),
+        make_pokemon(2, "ivysaur", ["grass", "poison"], abilities=["overgrow"], is_evolved=True),
+    ])
+
+
+class TestFetchPokemonDocument:
+    """Test suite for single Pokémon detail lookup"""
+
+    def test_by_name_and_id(self, conn):
+        """Test that names (case-insensitive) and ids resolve to the same record"""
+        by_name = fetch_pokemon_document(conn, "Bulbasaur")
+        by_id = fetch_pokemon_document(conn, "1")
+
+        assert by_name == by_id
+        assert json.loads(by_name) == {
+            "id": 1,
+            "name": "bulbasaur",
+            "is_evolved": False,
+            "types": ["grass", "poison"],
+            "abilities": ["overgrow", "chlorophyll"],
+            "moves": ["tackle", "vine-whip"],
+            "stats": {"hp": 45, "attack": 49},
+        }
+
+    def test_empty_relations(self, conn):
+        """Test a Pokémon without moves or stats"""
+        document = json.loads(fetch_pokemon_document(conn, "ivysaur"))
+        assert document["is_evolved"] is True
+        assert document["moves"] == []
+        assert document["stats"] == {}
+
+    def test_not_found(self, conn):
+        """Test that unknown Pokémon return None"""
+        assert fetch_pokemon_document(conn, "missingno") is None
+        assert fetch_pokemon_document(conn, "999") is None
+        assert fetch_pokemon_document(None, "1") is None
+
+
+class TestFetchPokemonDocuments:
+    """Test suite for batch detail lookup"""
+
+    def test_batch(self, conn):
+        """Test that known ids are returned and unknown ids omitted"""
+        documents = fetch_pokemon_documents(conn, [2, 1, 999])
+
+        assert set(documents) == {1, 2}
+        assert json.loads(documents[2])["name"] == "ivysaur"
+
+    def test_empty_batch(self, conn):
+        assert fetch_pokemon_documents(conn, []) == {}
@@ -0,0 +1,51 @@
+# tests/test_detail_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app import app
+
+client = TestClient(app)
+
+
+class TestPokemonDetailRouter:
+    """Test suite for the detail and batch endpoints"""
+
+    def test_get_detail(self, pokemon_db_file):
+        """Test getting one Pokémon's full record by name"""
+        response = client.get("/pokemon/bulbasaur")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == 1
+        assert data["moves"] == ["tackle"]
+        assert data["stats"] == {"hp": 45}
+        assert "etag" in response.headers
+
+    def test_get_detail_not_found(self, pokemon_db_file):
+        """Test that unknown Pokémon return 404"""
+        response = client.get("/pokemon/missingno")
+        assert response.status_code == 404
+
+    def test_detail_does_not_shadow_routes(self, pokemon_db_file):
+        """Test that fixed routes still win over the detail route"""
+        with patch('routers.pokemon_analysis.create_connection', return_value=None):
+            response = client.get("/pokemon/analysis")
+        assert response.json()["detail"] == "Failed to connect to database"
+
+    def test_batch(self, pokemon_db_file):
+        """Test batch lookup keeps request order and reports missing ids"""
+        response = client.post("/pokemon/batch", json={"ids": [4, 999, 1, 4]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["name"] for p in data["pokemon"]] == ["charmander", "bulbasaur"]
+        assert data["missing"] == [999]
+
+    def test_batch_limits(self, pokemon_db_file):
+        """Test that empty and oversized batches are rejected"""
+        assert client.post("/pokemon/batch", json={"ids": []}).status_code == 422
+        assert client.post("/pokemon/batch", json={"ids": list(range(1, 102))}).status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+# tests/test_distributions.py
+import numpy as np
+import pytest
+from data_processing.load import create_connection
+from data_processing.distributions import (
+    load_stats_matrix,
+    compute_stat_distributions,
+    get_stat_distributions,
+    DISTRIBUTION_GRAPH_METADATA,
+)
+
+POKEMON = [
+    (1, ["water"], 40, 60),
+    (2, ["water", "ice"], 60, 50),
+    (3, ["fire"], 80, 90),
+    (4, ["fire"], 100, 120),
+]
+
+
+@pytest.fixture
+def db_file(pokemon_db, make_pokemon):
+    return pokemon_db([
+        make_pokemon(pokemon_id, types=types, stats={"hp": hp, "attack": attack})
+        for pokemon_id, types, hp, attack in POKEMON
+    ] + [
+        # A Pokémon with an incomplete stat line is left out of every graph
+        make_pokemon(5, types=["fire"], stats={"hp": 999}),
+    ])
+
+
+@pytest.fixture
+def distributions(db_file):
+    conn = create_connection(db_file)
+    try:
+        return compute_stat_distributions(*load_stats_matrix(conn), bins=4)
+    finally:
+        conn.close()
+
+
+class TestStatDistributions:
+    """Test suite for the NumPy stat distribution graphs"""
+
+    def test_stats_matrix(self, db_file):
+        """Test that stats pivot into a pokemon x stat matrix"""
+        conn = create_connection(db_file)
+        stat_names, stats, type_names, membership = load_stats_matrix(conn)
+        conn.close()
+
+        assert stat_names == ["hp", "attack"]
+        assert stats.tolist() == [[40, 60], [60, 50], [80, 90], [100, 120]]
+        assert type_names == ["fire", "ice", "water"]
+        assert membership[:, 2].tolist() == [True, True, False, False]
+
+    def test_histograms(self, distributions):
+        """Test equal-width histogram counts and edges"""
+        hp = distributions["stat_histograms"]["hp"]
+        assert hp["bin_edges"] == [40.0, 55.0, 70.0, 85.0, 100.0]
+        assert hp["counts"] == [1, 1, 1, 1]
+        assert sum(distributions["stat_histograms"]["attack"]["counts"]) == 4
+
+    def test_quartiles_and_spread(self, distributions):
+        """Test quartiles, mean and standard deviation against NumPy"""
+        hp = distributions["stat_quartiles"]["hp"]
+        values = np.array([40, 60, 80, 100])
+
+        assert hp["min"] == 40 and hp["max"] == 100
+        assert hp["median"] == 70
+        assert hp["q1"] == 55 and hp["q3"] == 85
+        assert hp["mean"] == 70
+        assert hp["std"] == round(float(values.std()), 2)
+
+    def test_stat_by_type(self, distributions):
+        """Test per-type averages and counts"""
+        fire = distributions["stat_by_type"]["fire"]
+        assert fire == {"count": 2, "hp": 90.0, "attack": 105.0}
+        assert distributions["stat_by_type"]["ice"]["hp"] == 60.0
+
+    def test_correlation(self, distributions):
+        """Test the stat correlation matrix"""
+        correlation = distributions["stat_correlation"]
+        expected = round(float(np.corrcoef([40, 60, 80, 100], [60, 50, 90, 120])[0, 1]), 2)
+
+        assert correlation["stats"] == ["hp", "attack"]
+        assert correlation["matrix"][0] == [1.0, expected]
+
+    def test_cached_per_generation(self, db_file):
+        """Test that the matrix is only reloaded for a new generation"""
+        first = get_stat_distributions(db_file, "gen-a")
+        assert get_stat_distributions(db_file, "gen-a") is first
+        assert get_stat_distributions(db_file, "gen-b") is not first
+        assert set(first) == set(DISTRIBUTION_GRAPH_METADATA)
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database yields empty graphs without creating the file"""
+        path = tmp_path / "missing.db"
+
+        distributions = get_stat_distributions(str(path), "gen-missing")
+        assert distributions == {name: {} for name in DISTRIBUTION_GRAPH_METADATA}
+        assert not path.exists()
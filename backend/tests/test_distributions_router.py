@@ -0,0 +1,29 @@
+# tests/test_distributions_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app import app
+
+client = TestClient(app)
+
+
+class TestDistributionsRouter:
+    """Test suite for the NumPy distribution graph endpoints"""
+
+    @patch('routers.pokemon_analysis.get_stat_distributions')
+    def test_get_specific_analysis_distribution(self, mock_get_distributions):
+        """Test getting a NumPy distribution graph"""
+        mock_get_distributions.return_value = {
+            "stat_correlation": {"stats": ["hp"], "matrix": [[1.0]]}
+        }
+
+        response = client.get("/pokemon/analysis/stat_correlation")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["chart_type"] == "heatmap"
+        assert data["data"]["matrix"] == [[1.0]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
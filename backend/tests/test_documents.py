@@ -0,0 +1,70 @@
+# tests/test_documents.py
+import gzip
+import json
+import pytest
+from data_processing.detail import fetch_pokemon_document
+from data_processing.documents import (
+    write_pokemon_documents,
+    get_pokemon_document,
+    get_pokemon_documents,
+)
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(1, "bulbasaur", ["grass", "poison"], abilities=["overgrow"], moves=["tackle"], stats={"hp": 45}),
+    ])
+
+
+class TestWritePokemonDocuments:
+    """Test suite for the pre-rendered document store"""
+
+    def test_loader_writes_document(self, conn):
+        """Test that load_pokemons stores the final API JSON"""
+        encoding, body = conn.execute(
+            "SELECT encoding, body FROM pokemon_documents WHERE pokemon_id = 1"
+        ).fetchone()
+
+        assert encoding == "identity"
+        assert body.decode("utf-8") == fetch_pokemon_document(conn, "1")
+
+    def test_unchanged_document_not_rewritten(self, conn):
+        """Test that only changed documents are regenerated"""
+        assert write_pokemon_documents(conn, [1]) == 0
+
+        conn.execute("INSERT INTO moves (name) VALUES ('growl')")
+        conn.execute("INSERT INTO pokemon_moves (pokemon_id, move_name) VALUES (1, 'growl')")
+        assert write_pokemon_documents(conn, [1]) == 1
+
+        encoding, body = get_pokemon_document(conn, "bulbasaur")
+        assert json.loads(body)["moves"] == ["tackle", "growl"]
+
+    def test_gzip_compression(self, conn):
+        """Test that documents can be stored gzip-compressed"""
+        assert write_pokemon_documents(conn, [1], compression="gzip") == 1
+
+        encoding, body = get_pokemon_document(conn, "1")
+        assert encoding == "gzip"
+        assert json.loads(gzip.decompress(body))["name"] == "bulbasaur"
+        assert json.loads(get_pokemon_documents(conn, [1])[1])["name"] == "bulbasaur"
+
+    def test_none_connection(self):
+        assert write_pokemon_documents(None, [1]) == 0
+        assert get_pokemon_document(None, "1") is None
+        assert get_pokemon_documents(None, [1]) == {}
+
+
+class TestGetPokemonDocument:
+    """Test suite for reading stored documents"""
+
+    def test_falls_back_without_stored_document(self, conn):
+        """Test live assembly for Pokémon without a stored document"""
+        conn.execute("DELETE FROM pokemon_documents")
+
+        encoding, body = get_pokemon_document(conn, "bulbasaur")
+        assert encoding == "identity"
+        assert json.loads(body)["types"] == ["grass", "poison"]
+        assert set(get_pokemon_documents(conn, [1, 2])) == {1}
+
+    def test_not_found(self, conn):
+        assert get_pokemon_document(conn, "missingno") is None
@@ -0,0 +1,33 @@
+# tests/test_documents_router.py
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+from data_processing.load import create_connection
+from data_processing.documents import write_pokemon_documents
+
+client = TestClient(app)
+
+
+class TestPokemonDocumentsRouter:
+    """Test suite for serving pre-rendered documents"""
+
+    def test_get_detail_gzip_document(self, pokemon_db_file):
+        """Test that gzip-stored documents are sent without re-encoding"""
+        conn = create_connection(pokemon_db_file)
+        conn.execute("DELETE FROM pokemon_documents")
+        write_pokemon_documents(conn, [1], compression="gzip")
+        conn.commit()
+        conn.close()
+
+        response = client.get("/pokemon/1", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"].endswith('-gzip"')
+        assert response.json()["name"] == "bulbasaur"
+
+        response = client.get("/pokemon/1", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json()["name"] == "bulbasaur"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
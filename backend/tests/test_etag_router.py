@@ -0,0 +1,77 @@
+# tests/test_etag_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from app import app
+
+client = TestClient(app)
+
+
+class TestETagSupport:
+    """Test suite for ETag / If-None-Match handling on read endpoints"""
+
+    @patch('routers.pokemon.sqlite3.connect')
+    def test_etag_returned(self, mock_connect):
+        """Test that list responses carry a strong ETag"""
+        mock_cursor = MagicMock()
+        mock_connect.return_value.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [{"name": "bulbasaur"}]
+
+        response = client.get("/pokemon/")
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "no-cache"
+
+    @patch('routers.pokemon.sqlite3.connect')
+    def test_not_modified_skips_database(self, mock_connect):
+        """Test that a matching If-None-Match returns 304 without querying"""
+        mock_cursor = MagicMock()
+        mock_connect.return_value.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [{"name": "bulbasaur", "hp": 45}]
+
+        etag = client.get("/pokemon/filter_pokemons?type_name=grass").headers["etag"]
+        mock_connect.reset_mock()
+
+        response = client.get(
+            "/pokemon/filter_pokemons?type_name=grass",
+            headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        mock_connect.assert_not_called()
+
+    @patch('routers.pokemon.sqlite3.connect')
+    def test_etag_depends_on_query_and_generation(self, mock_connect):
+        """Test that parameters and dataset generation change the ETag"""
+        mock_cursor = MagicMock()
+        mock_connect.return_value.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = []
+
+        with patch('routers.http_cache.get_dataset_generation', return_value="gen-1"):
+            fire = client.get("/pokemon/filter_pokemons?type_name=fire").headers["etag"]
+            water = client.get("/pokemon/filter_pokemons?type_name=water").headers["etag"]
+            reordered_a = client.get("/pokemon/filter_pokemons?hp_min=1&attack_min=2").headers["etag"]
+            reordered_b = client.get("/pokemon/filter_pokemons?attack_min=2&hp_min=1").headers["etag"]
+        with patch('routers.http_cache.get_dataset_generation', return_value="gen-2"):
+            fire_new = client.get("/pokemon/filter_pokemons?type_name=fire").headers["etag"]
+
+        assert fire != water
+        assert reordered_a == reordered_b
+        assert fire != fire_new
+
+    @patch('routers.pokemon_analysis.create_connection')
+    def test_analysis_not_modified(self, mock_create_connection):
+        """Test that the analysis endpoint honours If-None-Match"""
+        with patch('routers.http_cache.get_dataset_generation', return_value="gen-1"):
+            etag = client.get("/pokemon/analysis").headers.get("etag")
+            mock_create_connection.reset_mock()
+            response = client.get("/pokemon/analysis", headers={"If-None-Match": f'W/{etag}'})
+
+        assert response.status_code == 304
+        mock_create_connection.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
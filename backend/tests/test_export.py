@@ -0,0 +1,99 @@
+# tests/test_export.py
+import csv
+import io
+import json
+import pytest
+import sqlite3
+from unittest.mock import patch
+from data_processing.load import create_connection
+from data_processing.replica import read_database
+from data_processing.export import (
+    iter_document_chunks,
+    stream_export,
+    export_format_available,
+)
+
+
+@pytest.fixture
+def db_file(pokemon_db, make_pokemon):
+    path = pokemon_db([
+        make_pokemon(
+            pokemon_id, types=["grass", "poison"],
+            abilities=["overgrow"],
+            moves=["tackle", "growl"],
+            stats={"hp": 40 + pokemon_id, "attack": 50 + pokemon_id},
+            is_evolved=pokemon_id % 2 == 0,
+        )
+        for pokemon_id in range(1, 8)
+    ])
+    # One Pokémon without a pre-rendered document exercises the live fallback
+    conn = create_connection(path)
+    conn.execute("DELETE FROM pokemon_documents WHERE pokemon_id = 3")
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestExport:
+    """Test suite for the streaming dataset export"""
+
+    def test_chunks_are_bounded(self, db_file):
+        """Test that documents are read in chunk_size batches, in id order"""
+        conn = create_connection(db_file)
+        chunks = list(iter_document_chunks(conn, chunk_size=3))
+        conn.close()
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        ids = [json.loads(body)["id"] for chunk in chunks for body in chunk]
+        assert ids == list(range(1, 8))
+
+    def test_ndjson(self, db_file):
+        """Test that NDJSON has one complete document per line"""
+        body = b"".join(stream_export(db_file, "ndjson", chunk_size=2))
+        lines = body.decode("utf-8").splitlines()
+
+        assert len(lines) == 7
+        third = json.loads(lines[2])
+        assert third["name"] == "mon-3"
+        assert third["types"] == ["grass", "poison"]
+        assert third["stats"] == {"hp": 43, "attack": 53}
+
+    def test_csv(self, db_file):
+        """Test that CSV flattens lists and spreads stats over columns"""
+        body = b"".join(stream_export(db_file, "csv", chunk_size=4))
+        rows = list(csv.reader(io.StringIO(body.decode("utf-8"))))
+
+        assert rows[0] == ["id", "name", "is_evolved", "types", "abilities", "moves", "hp", "attack"]
+        assert len(rows) == 8
+        assert rows[2] == ["2", "mon-2", "True", "grass|poison", "overgrow", "tackle|growl", "42", "52"]
+
+    def test_parquet_round_trip(self, db_file):
+        """Test that the streamed Parquet file reads back with one row group per chunk"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        assert export_format_available("parquet")
+
+        body = b"".join(stream_export(db_file, "parquet", chunk_size=3))
+        parquet_file = pq.ParquetFile(io.BytesIO(body))
+        table = parquet_file.read()
+
+        assert parquet_file.num_row_groups == 3
+        assert table.column("name").to_pylist() == [f"mon-{i}" for i in range(1, 8)]
+        assert table.column("moves").to_pylist()[0] == ["tackle", "growl"]
+        assert table.column("hp").to_pylist()[6] == 47
+
+    def test_reads_replica(self, db_file):
+        """Test that replica mode exports from the in-memory copy"""
+        with patch('data_processing.replica.READ_REPLICA', True), \
+                patch('data_processing.replica.read_database', wraps=read_database) as mock_read:
+            body = b"".join(stream_export(db_file, "ndjson"))
+
+        mock_read.assert_called_once_with(db_file)
+        assert len(body.splitlines()) == 7
+
+    def test_missing_database_not_created(self, tmp_path):
+        """Test that exporting a missing database fails without creating it"""
+        path = tmp_path / "missing.db"
+
+        with pytest.raises(sqlite3.OperationalError):
+            b"".join(stream_export(str(path), "ndjson"))
+        assert not path.exists()
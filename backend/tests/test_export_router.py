@@ -0,0 +1,29 @@
+# tests/test_export_router.py
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+
+client = TestClient(app)
+
+
+class TestExportRouter:
+    """Test suite for the dataset export endpoint"""
+
+    def test_export_ndjson(self, pokemon_db_file):
+        """Test streaming the dataset as NDJSON"""
+        response = client.get("/pokemon/export?format=ndjson")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert 'filename="pokemon.ndjson"' in response.headers["content-disposition"]
+        names = [json.loads(line)["name"] for line in response.text.splitlines()]
+        assert names == ["bulbasaur", "charmander"]
+
+    def test_export_invalid_format(self, pokemon_db_file):
+        """Test that unknown export formats are rejected"""
+        assert client.get("/pokemon/export?format=xml").status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
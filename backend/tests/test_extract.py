@@ -1,7 +1,7 @@
 # tests/test_extract.py
 import pytest
 from unittest.mock import patch, Mock
-from data_processing.extract import extract_pokemons
+from data_processing.extract import extract_pokemons, extract_type_relations, extract_resource_details
 
 
 class TestExtractPokemons:
@@ -208,5 +208,80 @@ class TestExtractPokemons:
         assert result is None
 
 
+class TestExtractTypeRelations:
+    """Test suite for extract_type_relations function"""
+
+    @staticmethod
+    def type_response(url):
+        relations = {
+            "fire": {"double_damage_to": [{"name": "grass"}], "half_damage_to": [{"name": "water"}]},
+            "water": {"double_damage_to": [{"name": "fire"}], "half_damage_to": [{"name": "grass"}]},
+            "grass": {"double_damage_to": [{"name": "water"}], "no_damage_to": []},
+        }
+        type_name = url.rstrip("/").split("/")[-1]
+        response = Mock()
+        response.json.return_value = {"damage_relations": relations[type_name]}
+        return response
+
+    @patch('data_processing.extract.requests.get')
+    @patch('data_processing.extract.sleep')
+    def test_fetches_each_type_once(self, mock_sleep, mock_get):
+        """Test that referenced types are followed and never fetched twice"""
+        mock_get.side_effect = lambda url, timeout: self.type_response(url)
+
+        result = extract_type_relations(["fire", "fire"])
+
+        assert set(result) == {"fire", "water", "grass"}
+        assert result["fire"]["double_damage_to"] == ["grass"]
+        assert result["grass"]["no_damage_to"] == []
+        assert mock_get.call_count == 3
+
+    @patch('data_processing.extract.requests.get')
+    @patch('data_processing.extract.sleep')
+    def test_skips_known_types(self, mock_sleep, mock_get):
+        """Test that types already stored are not requested again"""
+        mock_get.side_effect = lambda url, timeout: self.type_response(url)
+
+        result = extract_type_relations(["fire"], known_types=["water", "grass"])
+
+        assert set(result) == {"fire"}
+        assert mock_get.call_count == 1
+
+    @patch('data_processing.extract.requests.get')
+    @patch('data_processing.extract.sleep')
+    def test_failed_type_omitted(self, mock_sleep, mock_get):
+        """Test that types that fail to download are left out"""
+        import requests
+        mock_get.side_effect = requests.exceptions.Timeout()
+
+        assert extract_type_relations(["fire"]) == {}
+
+
+class TestExtractResourceDetails:
+    """Test suite for extract_resource_details function"""
+
+    @patch('data_processing.crawler.requests.get')
+    def test_each_resource_fetched_once(self, mock_get):
+        """Test that duplicate names are requested once and keyed by name"""
+        def move_response(url, timeout):
+            response = Mock()
+            response.json.return_value = {"name": url.rstrip("/").split("/")[-1]}
+            return response
+        mock_get.side_effect = move_response
+
+        result = extract_resource_details("move", ["tackle", "growl", "tackle"])
+
+        assert result == {"tackle": {"name": "tackle"}, "growl": {"name": "growl"}}
+        assert mock_get.call_count == 2
+
+    @patch('data_processing.crawler.requests.get')
+    def test_failed_resource_omitted(self, mock_get):
+        """Test that resources that fail to download are left out"""
+        import requests
+        mock_get.side_effect = requests.exceptions.Timeout()
+
+        assert extract_resource_details("ability", ["overgrow"]) == {}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
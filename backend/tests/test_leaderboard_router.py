@@ -0,0 +1,28 @@
+# tests/test_leaderboard_router.py
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+
+client = TestClient(app)
+
+
+class TestLeaderboardRouter:
+    """Test suite for the leaderboard and percentile endpoints"""
+
+    def test_leaderboard_and_percentiles(self, pokemon_db_file):
+        """Test the stat leaderboard and percentile endpoints"""
+        response = client.get("/pokemon/leaderboard/hp?type_name=grass")
+        assert response.status_code == 200
+        assert [p["name"] for p in response.json()["results"]] == ["bulbasaur", "charmander"]
+
+        response = client.get("/pokemon/charmander/percentiles")
+        assert response.status_code == 200
+        assert response.json()["stats"]["hp"]["out_of"] == 2
+
+        assert client.get("/pokemon/leaderboard/luck").status_code == 404
+        assert client.get("/pokemon/missingno/percentiles").status_code == 404
+        assert client.get("/pokemon/bulbasaur/percentiles?type_name=fire").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
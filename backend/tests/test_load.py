@@ -2,7 +2,14 @@
 import pytest
 import sqlite3
 import os
-from data_processing.load import create_connection, create_tables, load_pokemons
+from data_processing.load import (
+    create_connection,
+    create_tables,
+    load_pokemons,
+    load_type_effectiveness,
+    get_missing_resource_details,
+    load_resource_details,
+)
 
 
 class TestCreateConnection:
@@ -384,5 +391,63 @@ class TestLoadPokemons:
         conn.close()
 
 
+class TestLoadTypeEffectiveness:
+    """Test suite for load_type_effectiveness function"""
+
+    def test_full_matrix(self, tmp_path):
+        """Test that neutral pairs are filled in to complete the matrix"""
+        conn = create_connection(str(tmp_path / "test.db"))
+        create_tables(conn)
+
+        assert load_type_effectiveness(conn, [("fire", "grass", 2.0), ("water", "fire", 2.0)], ["fire", "water"])
+        rows = dict(
+            ((a, d), m) for a, d, m in conn.execute("SELECT * FROM type_effectiveness").fetchall()
+        )
+        assert len(rows) == 6  # 2 attackers x 3 known types
+        assert rows[("fire", "grass")] == 2.0
+        assert rows[("fire", "water")] == 1.0
+
+        # Re-fetched attackers are rewritten in full
+        assert load_type_effectiveness(conn, [], ["fire"])
+        assert conn.execute(
+            "SELECT multiplier FROM type_effectiveness WHERE attacking_type = 'fire' AND defending_type = 'grass'"
+        ).fetchone()[0] == 1.0
+        conn.close()
+
+
+class TestLoadResourceDetails:
+    """Test suite for move/ability detail columns and load_resource_details"""
+
+    def test_migrates_existing_tables(self, tmp_path):
+        """Test that tables created before the detail columns gain them"""
+        conn = create_connection(str(tmp_path / "test.db"))
+        conn.execute("CREATE TABLE moves (name TEXT PRIMARY KEY)")
+        conn.execute("INSERT INTO moves VALUES ('tackle')")
+        conn.commit()
+
+        assert create_tables(conn)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(moves)")}
+        assert {"power", "accuracy", "type_name", "damage_class", "details_fetched_at"} <= columns
+        assert get_missing_resource_details(conn, "moves") == ["tackle"]
+        conn.close()
+
+    def test_fetched_rows_are_skipped(self, tmp_path):
+        """Test that stored details are written and no longer reported missing"""
+        conn = create_connection(str(tmp_path / "test.db"))
+        create_tables(conn)
+        conn.executemany("INSERT INTO moves (name) VALUES (?)", [("tackle",), ("growl",)])
+        conn.commit()
+
+        assert load_resource_details(conn, "moves", [
+            {"name": "tackle", "power": 40, "accuracy": 100, "pp": 35, "type_name": "normal", "damage_class": "physical"}
+        ])
+        assert conn.execute(
+            "SELECT power, accuracy, type_name, damage_class FROM moves WHERE name = 'tackle'"
+        ).fetchone() == (40, 100, "normal", "physical")
+        assert get_missing_resource_details(conn, "moves") == ["growl"]
+        assert load_resource_details(conn, "unknown", []) is False
+        conn.close()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
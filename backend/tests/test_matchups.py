@@ -0,0 +1,147 @@
+# tests/test_matchups.py
+from itertools import combinations
+
+import numpy as np
+import pytest
+from data_processing.load import load_type_effectiveness
+from data_processing.matchups import (
+    load_type_chart,
+    get_matchup_data,
+    load_pokemon_types,
+    search_teams,
+)
+
+TYPES = ["electric", "fire", "grass", "ground", "water"]
+MATCHUPS = [
+    ("electric", "water", 2.0), ("electric", "grass", 0.5), ("electric", "ground", 0.0), ("electric", "electric", 0.5),
+    ("fire", "grass", 2.0), ("fire", "water", 0.5), ("fire", "fire", 0.5),
+    ("grass", "water", 2.0), ("grass", "ground", 2.0), ("grass", "fire", 0.5), ("grass", "grass", 0.5),
+    ("ground", "fire", 2.0), ("ground", "electric", 2.0), ("ground", "grass", 0.5),
+    ("water", "fire", 2.0), ("water", "ground", 2.0), ("water", "grass", 0.5), ("water", "water", 0.5),
+]
+POKEMON = {
+    "pikachu": ["electric"],
+    "charmander": ["fire"],
+    "bulbasaur": ["grass"],
+    "diglett": ["ground"],
+    "squirtle": ["water"],
+    "quagsire": ["water", "ground"],
+    "rotom-wash": ["electric", "water"],
+}
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    conn = pokemon_conn([
+        make_pokemon(pokemon_id, name, types)
+        for pokemon_id, (name, types) in enumerate(POKEMON.items(), 1)
+    ])
+    load_type_effectiveness(conn, MATCHUPS, TYPES)
+    return conn
+
+
+@pytest.fixture
+def chart(conn):
+    return load_type_chart(conn)
+
+
+class TestTypeChart:
+    """Test suite for the type effectiveness matrix and coverage engine"""
+
+    def test_matrix(self, chart):
+        """Test that the stored relations form a full type x type matrix"""
+        assert chart.type_names == TYPES
+        assert chart.matrix.shape == (5, 5)
+        assert chart.matrix[chart.index["electric"], chart.index["ground"]] == 0.0
+        assert chart.matrix[chart.index["fire"], chart.index["ground"]] == 1.0
+
+    def test_dual_type_defense(self, chart):
+        """Test that dual-type multipliers are the product of both types"""
+        defense = chart.defense([chart.profile(["water", "ground"])])[0]
+        assert defense[chart.index["grass"]] == 4.0
+        assert defense[chart.index["electric"]] == 0.0
+        assert defense[chart.index["fire"]] == 0.5
+
+    def test_team_report(self, chart):
+        """Test the coverage breakdown of one team"""
+        report = chart.team_report([["water"], ["fire"]])
+
+        assert report["super_effective_against"] == ["fire", "grass", "ground"]
+        assert report["not_covered"] == ["electric", "water"]
+        assert report["offensive"] == 0.6
+        assert report["weaknesses"] == {"electric": 1, "grass": 1, "ground": 1, "water": 1}
+        assert report["shared_weakness"] == 0.8
+        assert report["score"] == round(report["offensive"] + report["defensive"] - 0.8, 4)
+
+    def test_score_teams_vectorized(self, chart):
+        """Test that batch scoring matches scoring teams one at a time"""
+        profiles = [chart.profile(types) for types in POKEMON.values()]
+        teams = np.array(list(combinations(profiles, 3)))
+        batch = chart.score_teams(teams)["score"]
+        single = [chart.score_teams(team[None])["score"][0] for team in teams]
+        assert np.allclose(batch, single)
+
+
+class TestGetMatchupData:
+    """Test suite for generation-based matchup data loading"""
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database yields an empty chart without creating the file"""
+        path = tmp_path / "missing.db"
+
+        chart, pokemon_types = get_matchup_data(str(path), "gen-missing")
+        assert len(chart) == 0
+        assert pokemon_types == {}
+        assert not path.exists()
+
+
+class TestTeamSearch:
+    """Test suite for the best-covering team search"""
+
+    def brute_force_best(self, chart, size):
+        profiles = sorted({chart.profile(types) for types in POKEMON.values()})
+        teams = np.array(list(combinations(profiles, size)))
+        return chart.score_teams(teams)["score"].max()
+
+    def test_finds_optimal_team(self, conn, chart):
+        """Test that branch-and-bound finds the brute-force optimum"""
+        pokemon_types = load_pokemon_types(conn)
+        result = search_teams(chart, pokemon_types, team_size=3, limit=3, workers=1)
+
+        assert result["exhaustive"] is True
+        assert result["candidates"] == 7
+        assert len(result["teams"]) == 3
+        assert result["teams"][0]["score"] == round(self.brute_force_best(chart, 3), 4)
+        scores = [team["score"] for team in result["teams"]]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_multiprocessing_matches(self, conn, chart, monkeypatch):
+        """Test that splitting branches across processes gives the same scores"""
+        monkeypatch.setattr("data_processing.matchups._PARALLEL_MIN_CANDIDATES", 0)
+        monkeypatch.setattr("data_processing.matchups.os.cpu_count", lambda: 2)
+        pokemon_types = load_pokemon_types(conn)
+        single = search_teams(chart, pokemon_types, team_size=4, limit=4, workers=1)
+        parallel = search_teams(chart, pokemon_types, team_size=4, limit=4, workers=2)
+
+        assert [t["score"] for t in parallel["teams"]] == [t["score"] for t in single["teams"]]
+
+    def test_required_and_pool(self, conn, chart):
+        """Test that required members are kept and the rest come from the pool"""
+        pokemon_types = load_pokemon_types(conn)
+        result = search_teams(
+            chart, pokemon_types,
+            required=["pikachu"], pool=["charmander", "bulbasaur", "squirtle"],
+            team_size=3, limit=1, workers=1
+        )
+
+        members = result["teams"][0]["members"]
+        assert members[0] == {"types": ["electric"], "pokemon": ["pikachu"], "required": True}
+        assert all(set(m["pokemon"]) <= {"charmander", "bulbasaur", "squirtle"} for m in members[1:])
+        assert result["candidates"] == 3
+
+    def test_node_limit(self, conn, chart):
+        """Test that the search reports when it stopped early"""
+        pokemon_types = load_pokemon_types(conn)
+        result = search_teams(chart, pokemon_types, team_size=3, limit=1, workers=1, node_limit=2)
+        assert result["exhaustive"] is False
+        assert len(result["teams"]) == 1  # best team of the seeding beam search
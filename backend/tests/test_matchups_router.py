@@ -0,0 +1,64 @@
+# tests/test_matchups_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app import app
+from data_processing.load import create_connection, load_type_effectiveness
+
+client = TestClient(app)
+
+
+class TestMatchupsRouter:
+    """Test suite for the type matchup and team coverage endpoints"""
+
+    @pytest.fixture
+    def db_file(self, pokemon_db, make_pokemon):
+        db_file = pokemon_db([
+            make_pokemon(pokemon_id, name, types)
+            for pokemon_id, name, types in [(1, "squirtle", ["water"]), (2, "charmander", ["fire"]), (3, "bulbasaur", ["grass"])]
+        ])
+        conn = create_connection(db_file)
+        load_type_effectiveness(
+            conn,
+            [("water", "fire", 2.0), ("fire", "grass", 2.0), ("grass", "water", 2.0),
+             ("water", "grass", 0.5), ("fire", "water", 0.5), ("grass", "fire", 0.5)],
+            ["fire", "grass", "water"]
+        )
+        conn.close()
+
+        with patch('routers.matchups.DATABASE_FILE', db_file):
+            yield db_file
+
+    def test_effectiveness_matrix(self, db_file):
+        """Test getting the type effectiveness matrix"""
+        response = client.get("/pokemon/types/effectiveness")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["types"] == ["fire", "grass", "water"]
+        assert data["matrix"][2][0] == 2.0
+
+    def test_team_coverage(self, db_file):
+        """Test scoring a team's coverage"""
+        response = client.post("/pokemon/team/coverage", json={"members": ["Squirtle", "charmander"]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["super_effective_against"] == ["fire", "grass"]
+        assert data["not_covered"] == ["water"]
+
+        response = client.post("/pokemon/team/coverage", json={"members": ["missingno"]})
+        assert response.status_code == 404
+
+    def test_team_search(self, db_file):
+        """Test searching for the best-covering team"""
+        response = client.post("/pokemon/team/search", json={"required": ["squirtle"], "limit": 1})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["exhaustive"] is True
+        assert data["teams"][0]["offensive"] == 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,115 @@
+# tests/test_middleware.py
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware import CompressionMiddleware, negotiate_encoding
+from routers.responses import FastJSONResponse, PreEncodedJSONResponse
+
+brotli = pytest.importorskip("brotli")
+
+BIG_PAYLOAD = {"names": ["bulbasaur"] * 200}
+
+
+def _make_client():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return FastJSONResponse(BIG_PAYLOAD, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return {"name": "bulbasaur"}
+
+    @app.get("/encoded")
+    def encoded():
+        return PreEncodedJSONResponse(b'{"cached":true}')
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"line {i}\n".encode() for i in range(1000)), media_type="text/plain")
+
+    return TestClient(app)
+
+
+client = _make_client()
+
+
+class TestNegotiateEncoding:
+    """Test suite for Accept-Encoding negotiation"""
+
+    def test_prefers_brotli(self):
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+
+    def test_quality_values(self):
+        assert negotiate_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+        assert negotiate_encoding("br;q=0, gzip") == "gzip"
+
+    def test_unsupported_or_empty(self):
+        assert negotiate_encoding("") is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("deflate") is None
+
+    def test_wildcard(self):
+        assert negotiate_encoding("*") == "br"
+
+
+class TestCompressionMiddleware:
+    """Test suite for response compression"""
+
+    def test_gzip_large_response(self):
+        """Test that large bodies are gzip compressed with an encoded ETag"""
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == '"abc-gzip"'
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == BIG_PAYLOAD
+
+    def test_brotli_large_response(self):
+        """Test that Brotli is used when the client prefers it"""
+        response = client.get(
+            "/big", headers={"Accept-Encoding": "br"}
+        )
+
+        assert response.headers["content-encoding"] == "br"
+        assert int(response.headers["content-length"]) < len(FastJSONResponse(BIG_PAYLOAD).body)
+
+    def test_small_response_not_compressed(self):
+        """Test that bodies below the threshold are sent as-is"""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip, br"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"name": "bulbasaur"}
+
+    def test_identity_when_not_accepted(self):
+        """Test that nothing is compressed without Accept-Encoding"""
+        response = client.get("/big", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == '"abc"'
+
+    def test_streaming_response_compressed(self):
+        """Test that streamed bodies are compressed chunk by chunk"""
+        with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw).decode().splitlines()[-1] == "line 999"
+
+
+class TestResponseClasses:
+    """Test suite for the JSON response classes"""
+
+    def test_pre_encoded_bytes_passed_through(self):
+        response = client.get("/encoded")
+        assert response.content == b'{"cached":true}'
+        assert response.headers["content-type"] == "application/json"
+
+    def test_fast_json_is_compact(self):
+        assert FastJSONResponse({"a": [1, 2]}).body == b'{"a":[1,2]}'
@@ -0,0 +1,114 @@
+# tests/test_movesets.py
+import numpy as np
+import pytest
+from data_processing.movesets import (
+    minhash_signature,
+    move_bitset,
+    build_move_set_index,
+    backfill_move_signatures,
+    materialize_move_set_pairs,
+    MoveSetIndex,
+    get_move_set_index,
+)
+
+BASE_MOVES = [f"move-{i}" for i in range(40)]
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(1, "original", moves=BASE_MOVES),
+        make_pokemon(2, "near-copy", moves=BASE_MOVES[:38] + ["extra-1", "extra-2"]),
+        make_pokemon(3, "half", moves=BASE_MOVES[:20]),
+        make_pokemon(4, "stranger", moves=[f"other-{i}" for i in range(30)]),
+        make_pokemon(5, "moveless"),
+    ])
+
+
+class TestSignatures:
+    """Test suite for move bitsets and MinHash sketches"""
+
+    def test_bitset_round_trip(self):
+        """Test that bitsets store exactly the given move ids"""
+        bits = int.from_bytes(move_bitset([1, 3, 70]), "little")
+        assert [i for i in range(80) if bits >> i & 1] == [1, 3, 70]
+
+    def test_minhash_estimates_jaccard(self):
+        """Test that sketch agreement approximates Jaccard similarity"""
+        a = list(range(0, 300))
+        b = list(range(100, 400))  # Jaccard = 200 / 400 = 0.5
+        agreement = np.mean(minhash_signature(a, 512) == minhash_signature(b, 512))
+        assert abs(agreement - 0.5) < 0.1
+
+    def test_loader_writes_signatures(self, conn):
+        """Test that load_pokemons stores one signature per Pokémon"""
+        rows = dict(conn.execute("SELECT pokemon_id, move_count FROM pokemon_move_signatures").fetchall())
+        assert rows == {1: 40, 2: 40, 3: 20, 4: 30, 5: 0}
+
+    def test_backfill(self, conn):
+        """Test that missing signatures are written by the backfill"""
+        conn.execute("DELETE FROM pokemon_move_signatures WHERE pokemon_id = 3")
+        conn.commit()
+        assert backfill_move_signatures(conn) == 1
+        assert backfill_move_signatures(conn) == 0
+
+
+class TestMoveSetIndex:
+    """Test suite for the LSH move-set index"""
+
+    def test_shares_most_moves(self, conn):
+        """Test that candidates are ranked by exact Jaccard similarity"""
+        results = build_move_set_index(conn).shares_most_moves("original", k=2)
+
+        assert [r["name"] for r in results] == ["near-copy", "half"]
+        assert results[0]["shared_moves"] == 38
+        assert results[0]["jaccard"] == round(38 / 42, 4)
+        assert results[1]["jaccard"] == 0.5
+
+    def test_lsh_candidates(self, conn):
+        """Test that only similar move sets collide in LSH buckets"""
+        index = build_move_set_index(conn)
+        candidates = {index.ids[j] for j in index.candidates(index.row_of("1"))}
+
+        assert 2 in candidates
+        assert 4 not in candidates
+
+    def test_unknown_or_moveless(self, conn):
+        """Test that Pokémon without indexed moves return None"""
+        index = build_move_set_index(conn)
+        assert len(index) == 4
+        assert index.shares_most_moves("moveless") is None
+        assert index.shares_most_moves("missingno") is None
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database yields an empty index without creating the file"""
+        path = tmp_path / "missing.db"
+
+        assert get_move_set_index(str(path), "gen-missing").shares_most_moves("original") is None
+        assert not path.exists()
+
+    def test_all_pairs_job(self, conn):
+        """Test that the batch job stores only pairs above the threshold"""
+        assert materialize_move_set_pairs(conn, threshold=0.6) == 1
+        assert conn.execute("SELECT pokemon_a, pokemon_b, shared_moves FROM move_set_pairs").fetchall() == [(1, 2, 38)]
+
+    def test_all_pairs_matches_brute_force(self):
+        """Test LSH all-pairs against an exact scan on random move sets"""
+        rng = np.random.default_rng(7)
+        base = [set(rng.choice(500, 60, replace=False).tolist()) for _ in range(20)]
+        move_sets = []
+        for moves in base:
+            move_sets.append(moves)
+            move_sets.append(set(list(moves)[:55]) | {600, 601})
+
+        rows = [
+            (i, f"form-{i}", len(m), move_bitset(sorted(m)), minhash_signature(sorted(m)).tobytes())
+            for i, m in enumerate(move_sets)
+        ]
+        pairs = {(a, b) for a, b, _, _ in MoveSetIndex(rows).similar_pairs(0.7)}
+        expected = {
+            (i, j)
+            for i in range(len(move_sets)) for j in range(i + 1, len(move_sets))
+            if len(move_sets[i] & move_sets[j]) / len(move_sets[i] | move_sets[j]) >= 0.7
+        }
+        assert pairs == expected
@@ -0,0 +1,76 @@
+# tests/test_ranks.py
+import pytest
+from data_processing.ranks import (
+    rebuild_stat_ranks,
+    get_leaderboard,
+    get_stat_percentiles,
+)
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(pokemon_id, name, types, stats={"hp": hp, "speed": speed})
+        for pokemon_id, name, types, hp, speed in [
+            (1, "squirtle", ["water"], 44, 43),
+            (2, "pikachu", ["electric"], 35, 90),
+            (3, "starmie", ["water", "psychic"], 60, 115),
+            (4, "slowpoke", ["water", "psychic"], 90, 15),
+            (5, "jolteon", ["electric"], 65, 130),
+        ]
+    ])
+
+
+class TestStatRanks:
+    """Test suite for precomputed leaderboards and percentiles"""
+
+    def test_leaderboard_is_precomputed_slice(self, conn):
+        """Test that leaderboards read stored rank arrays after a rebuild"""
+        assert rebuild_stat_ranks(conn) is True
+        stored = conn.execute("SELECT COUNT(*) FROM stat_ranks WHERE type_name = ''").fetchone()[0]
+        assert stored == 15  # 5 Pokémon x (hp, speed, total)
+
+        top = get_leaderboard(conn, "speed", limit=2)
+        assert [p["name"] for p in top] == ["jolteon", "starmie"]
+        assert [p["rank"] for p in top] == [1, 2]
+
+        page = get_leaderboard(conn, "speed", limit=2, offset=2)
+        assert [p["name"] for p in page] == ["pikachu", "squirtle"]
+
+    def test_leaderboard_by_type(self, conn):
+        """Test that rankings are kept per type"""
+        rebuild_stat_ranks(conn)
+        water = get_leaderboard(conn, "speed", type_name="Water")
+        assert [p["name"] for p in water] == ["starmie", "squirtle", "slowpoke"]
+
+    def test_total_ranking(self, conn):
+        """Test that base stat total is rankable as a pseudo-stat"""
+        rebuild_stat_ranks(conn)
+        top = get_leaderboard(conn, "total", limit=1)
+        assert top[0]["name"] == "jolteon"
+        assert top[0]["value"] == 195
+
+    def test_percentiles(self, conn):
+        """Test rank, group size and percentile of each stat"""
+        rebuild_stat_ranks(conn)
+        result = get_stat_percentiles(conn, "starmie")
+
+        assert result["id"] == 3
+        assert result["stats"]["speed"] == {"value": 115, "rank": 2, "out_of": 5, "percentile": 80.0}
+        assert result["stats"]["hp"]["percentile"] == 60.0
+
+        psychic = get_stat_percentiles(conn, "3", type_name="psychic")
+        assert psychic["stats"]["speed"]["rank"] == 1
+        assert psychic["stats"]["speed"]["out_of"] == 2
+
+    def test_unknown_pokemon(self, conn):
+        """Test that unknown Pokémon return None"""
+        assert get_stat_percentiles(conn, "missingno") is None
+
+    def test_live_fallback_before_rebuild(self, conn):
+        """Test that rankings are computed on the fly until the first rebuild"""
+        assert conn.execute("SELECT COUNT(*) FROM stat_ranks").fetchone()[0] == 0
+
+        top = get_leaderboard(conn, "hp", limit=1)
+        assert top[0]["name"] == "slowpoke"
+        assert get_stat_percentiles(conn, "slowpoke")["stats"]["hp"]["rank"] == 1
@@ -0,0 +1,103 @@
+# tests/test_replica.py
+import os
+import sqlite3
+import pytest
+from unittest.mock import patch
+from data_processing.load import create_connection
+from data_processing.replica import ReadReplica, read_database, read_connection, read_only_connection
+
+
+@pytest.fixture
+def add_pokemon(pokemon_db, make_pokemon):
+    def add(db_file, pokemon_id, name):
+        pokemon_db([make_pokemon(pokemon_id, name, stats={"hp": 50})], db_file)
+        return True
+
+    return add
+
+
+@pytest.fixture
+def db_file(add_pokemon, tmp_path):
+    path = str(tmp_path / "test.db")
+    add_pokemon(path, 1, "bulbasaur")
+    return path
+
+
+class TestReadReplica:
+    """Test suite for ReadReplica"""
+
+    def test_serves_in_memory_copy(self, db_file):
+        """Test that readers get an in-memory copy of the file"""
+        replica = ReadReplica(db_file)
+        target = replica.target()
+
+        assert target.startswith("file:") and "mode=memory" in target
+        conn = sqlite3.connect(target, uri=True)
+        assert conn.execute("SELECT name FROM pokemon").fetchall() == [("bulbasaur",)]
+        conn.close()
+        replica.close()
+
+    def test_refreshes_after_write(self, db_file, add_pokemon):
+        """Test that a write to the file is picked up, while open readers keep the old copy"""
+        replica = ReadReplica(db_file)
+        reader = sqlite3.connect(replica.target(), uri=True)
+
+        add_pokemon(db_file, 2, "ivysaur")
+        os.utime(db_file, ns=(1, 1))  # mtime resolution may hide back-to-back writes
+        conn = sqlite3.connect(replica.target(), uri=True)
+
+        assert conn.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0] == 2
+        assert reader.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0] == 1
+        conn.close()
+        reader.close()
+        replica.close()
+
+    def test_unchanged_file_is_not_copied_again(self, db_file):
+        """Test that the copy is reused until the file changes"""
+        replica = ReadReplica(db_file)
+        first = replica.target()
+
+        assert replica.target() == first
+        replica.close()
+
+    def test_missing_file_falls_back(self, tmp_path):
+        """Test that a missing database is read as the file itself"""
+        path = str(tmp_path / "missing.db")
+        assert ReadReplica(path).target() == path
+
+
+class TestReadDatabase:
+    """Test suite for read_database and read_connection"""
+
+    def test_file_mode(self, db_file):
+        """Test that replica mode off reads the file directly"""
+        assert read_database(db_file) == db_file
+
+    def test_replica_mode(self, db_file):
+        """Test that replica mode routes both helpers to the in-memory copy"""
+        with patch('data_processing.replica.READ_REPLICA', True):
+            assert read_database(db_file).startswith("file:")
+            conn = read_connection(db_file)
+            assert conn.execute("SELECT name FROM pokemon").fetchone() == ("bulbasaur",)
+            conn.close()
+
+            conn = create_connection(read_database(db_file))
+            assert conn.execute("SELECT COUNT(*) FROM pokemon").fetchone()[0] == 1
+            conn.close()
+
+    def test_read_only_connection(self, db_file, tmp_path):
+        """Test that the read-only helper reads the file or replica but never creates one"""
+        for replica_mode in (False, True):
+            with patch('data_processing.replica.READ_REPLICA', replica_mode):
+                conn = read_only_connection(db_file)
+                assert conn.execute("SELECT name FROM pokemon").fetchone() == ("bulbasaur",)
+                conn.close()
+
+                missing = tmp_path / "missing.db"
+                with pytest.raises(sqlite3.OperationalError):
+                    read_only_connection(str(missing))
+                assert not missing.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
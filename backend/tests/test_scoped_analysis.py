@@ -0,0 +1,185 @@
+# tests/test_scoped_analysis.py
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app import app
+from data_processing.cache import LRUCache
+from data_processing.analysis import (
+    analysis_scope,
+    parse_stat_range,
+    get_abilities_frequency,
+    get_evolution_stage_distribution,
+    get_moves_frequency,
+    get_pokemon_stats_average,
+    get_type_combination_distribution,
+    get_type_distribution,
+)
+from routers import pokemon_analysis
+
+POKEMON = (
+    # id, name, types, is_evolved, hp, speed, abilities, moves
+    (1, "bulbasaur", ["grass", "poison"], False, 45, 45, ["overgrow"], ["tackle", "vine-whip"]),
+    (2, "ivysaur", ["grass", "poison"], True, 60, 60, ["overgrow"], ["tackle", "vine-whip", "razor-leaf"]),
+    (4, "charmander", ["fire"], False, 39, 65, ["blaze"], ["scratch", "ember"]),
+    (5, "charmeleon", ["fire"], True, 58, 80, ["blaze"], ["scratch", "ember", "flamethrower"]),
+    (25, "pikachu", ["electric"], False, 35, 90, ["static"], ["tackle", "thunder-shock"]),
+)
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(
+            pokemon_id, name, types,
+            abilities=abilities,
+            moves=moves,
+            stats={"hp": hp, "speed": speed},
+            is_evolved=is_evolved,
+        )
+        for pokemon_id, name, types, is_evolved, hp, speed, abilities, moves in POKEMON
+    ])
+
+
+class TestParseStatRange:
+    """Test suite for parsing stat:min:max ranges"""
+
+    def test_bounds(self):
+        """Test that either bound may be omitted"""
+        assert parse_stat_range("hp:50:100") == ("hp", 50, 100)
+        assert parse_stat_range("Speed:100:") == ("speed", 100, None)
+        assert parse_stat_range("attack::60") == ("attack", None, 60)
+
+    @pytest.mark.parametrize("value", ["hp", "hp:1", "luck:1:2", "hp:a:2", "hp::", "hp:10:5"])
+    def test_invalid(self, value):
+        """Test that malformed ranges are rejected"""
+        with pytest.raises(ValueError):
+            parse_stat_range(value)
+
+
+class TestAnalysisScope:
+    """Test suite for normalized analysis scopes"""
+
+    def test_unrestricted(self):
+        """Test that no restriction is the None scope"""
+        assert analysis_scope() is None
+        assert analysis_scope(None, None, []) is None
+
+    def test_normalized(self):
+        """Test that equivalent restrictions give equal, hashable scopes"""
+        a = analysis_scope("Fire", False, [("speed", 50, None), ("hp", None, 60)])
+        b = analysis_scope("fire", False, [("hp", None, 60), ("speed", 50, None), ("hp", None, 60)])
+
+        assert a == b
+        assert hash(a) == hash(b)
+
+
+class TestScopedGraphs:
+    """Test suite for the dashboard graphs restricted to a scope"""
+
+    def test_type_scope(self, conn):
+        """Test that a type scope restricts every graph to that type"""
+        scope = analysis_scope("fire")
+
+        assert get_pokemon_stats_average(conn, scope) == {"hp": 48.5, "speed": 72.5}
+        assert get_type_distribution(conn, scope) == {"fire": 2}
+        assert get_abilities_frequency(conn, scope=scope) == {"blaze": 2}
+        assert get_evolution_stage_distribution(conn, scope) == {"Evolved": 1, "Not Evolved": 1}
+        assert get_type_combination_distribution(conn, scope) == {"Single Type": 2}
+
+    def test_evolution_and_stat_scope(self, conn):
+        """Test that evolution status and stat ranges combine"""
+        scope = analysis_scope(is_evolved=False, stat_ranges=[("speed", 60, None)])
+
+        assert get_type_distribution(conn, scope) == {"fire": 1, "electric": 1}
+
+        scope = analysis_scope(stat_ranges=[("hp", 40, 60), ("speed", None, 60)])
+        assert get_type_distribution(conn, scope) == {"grass": 2, "poison": 2}
+
+    def test_top_n(self, conn):
+        """Test that top_n limits the frequency graphs, scoped or not"""
+        assert get_moves_frequency(conn, top_n=1) == {"tackle": 3}
+        assert len(get_moves_frequency(conn, top_n=3, scope=analysis_scope("grass"))) == 3
+
+    def test_empty_scope(self, conn):
+        """Test that a scope matching nothing gives empty graphs"""
+        scope = analysis_scope("dragon")
+
+        assert get_type_distribution(conn, scope) == {}
+        assert get_pokemon_stats_average(conn, scope) == {}
+
+
+class TestLRUCache:
+    """Test suite for the size-bounded LRU cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the entry used longest ago is evicted first"""
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_zero_size_disables(self):
+        """Test that maxsize 0 stores nothing"""
+        cache = LRUCache(0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+
+
+class TestScopedAnalysisRouter:
+    """Test suite for filtered and top_n graph requests"""
+
+    @pytest.fixture
+    def client(self, conn, tmp_path):
+        pokemon_analysis._scoped_body_cache.clear()
+        with patch("routers.pokemon_analysis.DATABASE_FILE", str(tmp_path / "test.db")):
+            yield TestClient(app)
+        pokemon_analysis._scoped_body_cache.clear()
+
+    def test_filters(self, client):
+        """Test that filters and top_n shape the graph"""
+        response = client.get("/pokemon/analysis/moves_frequency?type_name=fire&top_n=2")
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {"ember": 2, "scratch": 2}
+        assert "server-timing" in response.headers
+
+    def test_stat_range(self, client):
+        """Test that repeated stat ranges are all applied"""
+        response = client.get(
+            "/pokemon/analysis/type_distribution?stat_range=hp:40:60&stat_range=speed::60"
+        )
+
+        assert response.json()["data"] == {"grass": 2, "poison": 2}
+
+    def test_cached_by_normalized_parameters(self, client):
+        """Test that equivalent parameters are served from one cache entry"""
+        first = client.get("/pokemon/analysis/type_distribution?type_name=Fire&is_evolved=true")
+        with patch("routers.pokemon_analysis.get_type_distribution") as mock_graph:
+            second = client.get("/pokemon/analysis/type_distribution?is_evolved=true&type_name=fire")
+
+        mock_graph.assert_not_called()
+        assert second.json() == first.json()
+        assert len(pokemon_analysis._scoped_body_cache) == 1
+
+    @pytest.mark.parametrize("query", [
+        "type_distribution?top_n=3",
+        "stat_histograms?type_name=fire",
+        "pokemon_stats?stat_range=luck:1:2",
+        "moves_frequency?top_n=0",
+    ])
+    def test_invalid_parameters(self, client, query):
+        """Test that unsupported or malformed parameters are rejected"""
+        response = client.get(f"/pokemon/analysis/{query}")
+
+        assert response.status_code in (400, 422)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
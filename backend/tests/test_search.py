@@ -0,0 +1,90 @@
+# tests/test_search.py
+import pytest
+from unittest.mock import patch
+from data_processing.load import create_connection, load_pokemons
+from data_processing.replica import read_database
+from data_processing.search import NameIndex, get_name_index
+
+ROWS = [
+    (25, "pikachu"),
+    (26, "raichu"),
+    (172, "pichu"),
+    (122, "mr-mime"),
+    (10080, "pikachu-rock-star"),
+    (1, "bulbasaur"),
+]
+
+
+@pytest.fixture
+def index():
+    return NameIndex(ROWS)
+
+
+class TestNameIndex:
+    """Test suite for the in-memory name index"""
+
+    def test_prefix_ranked_first(self, index):
+        """Test that prefix matches come first, shortest name first"""
+        results = index.search("pi")
+        assert [r["name"] for r in results[:3]] == ["pichu", "pikachu", "pikachu-rock-star"]
+        assert all(r["match"] == "prefix" for r in results[:3])
+
+    def test_substring(self, index):
+        """Test that substrings inside names are found after prefixes"""
+        results = index.search("chu")
+        assert {r["name"] for r in results} >= {"pikachu", "raichu", "pichu"}
+        assert all(r["match"] == "substring" for r in results)
+
+    def test_typo_tolerance(self, index):
+        """Test that misspelled names are matched"""
+        results = index.search("pikachoo")
+        assert results[0]["name"] == "pikachu"
+        assert results[0]["id"] == 25
+        assert results[0]["match"] == "fuzzy"
+
+        assert index.search("bulbasuar")[0]["name"] == "bulbasaur"
+
+    def test_normalization(self, index):
+        """Test case and whitespace normalization"""
+        assert index.search("  Mr Mime ")[0]["name"] == "mr-mime"
+
+    def test_limit_and_empty(self, index):
+        assert len(index.search("p", limit=2)) == 2
+        assert index.search("") == []
+        assert index.search("zzzzzz") == []
+
+
+class TestGetNameIndex:
+    """Test suite for generation-based index rebuilding"""
+
+    def test_rebuilt_per_generation(self, pokemon_db, make_pokemon):
+        db_file = pokemon_db([make_pokemon(25, "pikachu", types=[], is_evolved=True)])
+        conn = create_connection(db_file)
+
+        first = get_name_index(db_file, "gen-1")
+        assert get_name_index(db_file, "gen-1") is first
+
+        load_pokemons(conn, make_pokemon(26, "raichu", types=[], is_evolved=True))
+        conn.close()
+
+        second = get_name_index(db_file, "gen-2")
+        assert second is not first
+        assert len(second) == 2
+
+    def test_reads_replica(self, pokemon_db, make_pokemon):
+        """Test that replica mode builds the index from the in-memory copy"""
+        db_file = pokemon_db([make_pokemon(25, "pikachu")])
+
+        with patch('data_processing.replica.READ_REPLICA', True), \
+                patch('data_processing.replica.read_database', wraps=read_database) as mock_read:
+            index = get_name_index(db_file, "gen-replica")
+
+        mock_read.assert_called_once_with(db_file)
+        assert len(index) == 1
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database yields an empty index without creating the file"""
+        path = tmp_path / "missing.db"
+
+        assert get_name_index(str(path), "gen-missing").search("pikachu") == []
+        assert not path.exists()
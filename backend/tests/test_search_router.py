@@ -0,0 +1,25 @@
+# tests/test_search_router.py
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+
+client = TestClient(app)
+
+
+class TestSearchRouter:
+    """Test suite for the name search endpoint"""
+
+    def test_search(self, pokemon_db_file):
+        """Test the name search endpoint"""
+        response = client.get("/pokemon/search?q=charmandr")
+
+        assert response.status_code == 200
+        assert response.json()["results"][0]["name"] == "charmander"
+
+    def test_search_requires_query(self, pokemon_db_file):
+        """Test that a search without q is rejected"""
+        assert client.get("/pokemon/search").status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,31 @@
+# tests/test_server_timing_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock
+from app import app
+
+client = TestClient(app)
+
+
+class TestServerTimingRouter:
+    """Test suite for per-graph Server-Timing on the analysis endpoint"""
+
+    @patch('routers.pokemon_analysis.generate_all_analysis')
+    @patch('routers.pokemon_analysis.create_connection')
+    def test_get_analysis_server_timing(self, mock_create_connection, mock_generate_analysis):
+        """Test that live computation reports per-graph timings in Server-Timing"""
+        mock_create_connection.return_value = MagicMock()
+
+        def generate(conn, pokemon_db_file, timings):
+            timings.update({"pokemon_stats": 1.5, "moves_frequency": 30.0})
+            return {"pokemon_stats": {"hp": 50}}
+        mock_generate_analysis.side_effect = generate
+
+        response = client.get("/pokemon/analysis")
+
+        assert response.status_code == 200
+        assert response.headers["server-timing"] == "pokemon_stats;dur=1.5, moves_frequency;dur=30.0"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,115 @@
+# tests/test_shared_cache.py
+import json
+import os
+import numpy as np
+import pytest
+from unittest.mock import patch
+from data_processing.load import create_connection, load_pokemons
+from data_processing.distributions import load_stats_rows
+from data_processing.snapshots import start_etl_run, materialize_analysis_snapshot
+from data_processing.cache import get_dataset_generation
+from data_processing.shared_cache import (
+    SharedCache,
+    build_shared_cache,
+    get_shared_cache,
+    shared_cache_file_for,
+    write_shared_cache,
+)
+
+
+@pytest.fixture
+def pokemon(make_pokemon):
+    def build(pokemon_id, name, hp):
+        return make_pokemon(
+            pokemon_id, name, ["grass"], abilities=["overgrow"], moves=["tackle"], stats={"hp": hp, "speed": 45}
+        )
+
+    return build
+
+
+@pytest.fixture
+def db_file(pokemon_db, pokemon):
+    path = pokemon_db([pokemon(1, "bulbasaur", 45), pokemon(2, "ivysaur", 60)])
+    conn = create_connection(path)
+    materialize_analysis_snapshot(conn, start_etl_run(conn))
+    conn.close()
+    return path
+
+
+class TestSharedCacheFile:
+    """Test suite for writing and mapping the shared cache file"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that arrays, blobs and metadata read back unchanged"""
+        path = str(tmp_path / "x.cache")
+        matrix = np.arange(12, dtype=float).reshape(4, 3)
+        write_shared_cache(path, "gen-1", {"m": matrix, "empty": np.zeros((0, 3))}, {"b": b"hello"}, {"k": ["v"]})
+
+        cache = SharedCache(path)
+        assert cache.generation == "gen-1"
+        assert np.array_equal(cache.array("m"), matrix)
+        assert cache.array("empty").shape == (0, 3)
+        assert not cache.array("m").flags.writeable
+        assert cache.blob("b") == b"hello"
+        assert cache.blob("missing") is None
+        assert cache.meta == {"k": ["v"]}
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file without the cache header is refused"""
+        path = str(tmp_path / "bogus.cache")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            SharedCache(path)
+
+
+class TestBuildSharedCache:
+    """Test suite for build_shared_cache and get_shared_cache"""
+
+    def test_matches_database(self, db_file):
+        """Test that the cached data equals what the database returns"""
+        assert build_shared_cache(db_file)
+        cache = SharedCache(shared_cache_file_for(db_file))
+
+        conn = create_connection(db_file)
+        expected = load_stats_rows(conn)
+        conn.close()
+        for cached, live in zip(cache.stats_rows(), expected):
+            assert np.array_equal(np.asarray(cached), np.asarray(live))
+        assert cache.name_rows() == [(1, "bulbasaur"), (2, "ivysaur")]
+        assert json.loads(cache.analysis_body())["status"] == "success"
+        assert json.loads(cache.analysis_body("type_distribution"))["data"] == {"grass": 2}
+        assert cache.generation == get_dataset_generation(db_file)
+
+    def test_disabled(self, db_file):
+        """Test that nothing is built when shared caching is off"""
+        assert get_shared_cache(db_file, get_dataset_generation(db_file)) is None
+        assert not os.path.exists(shared_cache_file_for(db_file))
+
+    def test_stale_cache_is_rebuilt(self, db_file, pokemon):
+        """Test that a write to the database makes the leader rebuild the cache"""
+        build_shared_cache(db_file)
+        conn = create_connection(db_file)
+        load_pokemons(conn, pokemon(3, "venusaur", 80))
+        conn.close()
+        os.utime(db_file, ns=(1, 1))  # mtime resolution may hide back-to-back writes
+
+        with patch('data_processing.shared_cache.SHARED_CACHE', True):
+            cache = get_shared_cache(db_file, get_dataset_generation(db_file))
+
+        assert [name for _, name in cache.name_rows()] == ["bulbasaur", "ivysaur", "venusaur"]
+
+    def test_follower_falls_back_while_leader_builds(self, db_file):
+        """Test that workers that lose the build lock get None instead of waiting"""
+        fcntl = pytest.importorskip("fcntl")
+        path = shared_cache_file_for(db_file)
+        with open(path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with patch('data_processing.shared_cache.SHARED_CACHE', True):
+                assert get_shared_cache(db_file, get_dataset_generation(db_file)) is None
+        assert not os.path.exists(path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
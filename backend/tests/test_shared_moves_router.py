@@ -0,0 +1,23 @@
+# tests/test_shared_moves_router.py
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+
+client = TestClient(app)
+
+
+class TestSharedMovesRouter:
+    """Test suite for the shares-the-most-moves endpoint"""
+
+    def test_shared_moves(self, pokemon_db_file):
+        """Test the shares-the-most-moves endpoint"""
+        response = client.get("/pokemon/bulbasaur/shared-moves")
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results == [{"id": 4, "name": "charmander", "shared_moves": 1, "jaccard": 1.0}]
+
+        assert client.get("/pokemon/missingno/shared-moves").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,34 @@
+# tests/test_similar_router.py
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app import app
+
+client = TestClient(app)
+
+
+class TestSimilarRouter:
+    """Test suite for the similar Pokémon endpoint"""
+
+    def test_similar(self, pokemon_db_file):
+        """Test the similar Pokémon endpoint"""
+        response = client.get("/pokemon/bulbasaur/similar?k=5")
+        assert response.status_code == 200
+        assert [p["name"] for p in response.json()["results"]] == ["charmander"]
+
+        assert client.get("/pokemon/bulbasaur/similar?metric=chebyshev").status_code == 422
+        assert client.get("/pokemon/missingno/similar").status_code == 404
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database answers 404 instead of creating an empty one"""
+        path = tmp_path / "missing.db"
+
+        with patch('routers.pokemon.DATABASE_FILE', str(path)):
+            assert client.get("/pokemon/bulbasaur/similar").status_code == 404
+            assert client.get("/pokemon/bulbasaur/shared-moves").status_code == 404
+            assert client.get("/pokemon/search?q=bulba").json()["results"] == []
+        assert not path.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
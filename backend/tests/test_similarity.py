@@ -0,0 +1,80 @@
+# tests/test_similarity.py
+import numpy as np
+import pytest
+from data_processing.similarity import build_stat_index, get_stat_index
+
+STAT_NAMES = ["hp", "attack", "defense"]
+POKEMON = [
+    (1, "tank", ["water"], [100, 50, 100]),
+    (2, "tank-jr", ["water"], [95, 55, 95]),
+    (3, "tank-fire", ["fire"], [98, 52, 98]),
+    (4, "glass-cannon", ["fire"], [40, 130, 35]),
+    (5, "mini-tank", ["water"], [50, 25, 50]),
+]
+
+
+@pytest.fixture
+def conn(pokemon_conn, make_pokemon):
+    return pokemon_conn([
+        make_pokemon(pokemon_id, name, types, stats=dict(zip(STAT_NAMES, values)))
+        for pokemon_id, name, types, values in POKEMON
+    ])
+
+
+class TestStatIndex:
+    """Test suite for the stat-vector nearest-neighbour search"""
+
+    def test_nearest_neighbours(self, conn):
+        """Test that the closest stat profiles come first and the query is excluded"""
+        index = build_stat_index(conn)
+        results = index.similar("tank", k=2)
+
+        assert [r["name"] for r in results] == ["tank-fire", "tank-jr"]
+        assert results[0]["distance"] <= results[1]["distance"]
+        assert results[0]["stats"] == {"hp": 98, "attack": 52, "defense": 98}
+
+    def test_matches_brute_force(self, conn):
+        """Test that argpartition top-k equals a full sort of the distances"""
+        index = build_stat_index(conn)
+        vectors = index.vectors
+        expected = np.argsort(np.linalg.norm(vectors - vectors[3], axis=1))[1:4]
+
+        results = index.similar("4", k=3)
+        assert [r["id"] for r in results] == index.ids[expected].tolist()
+
+    def test_type_filter(self, conn):
+        """Test restricting candidates to one type"""
+        index = build_stat_index(conn)
+        results = index.similar("tank", k=5, type_name="Water")
+
+        assert [r["name"] for r in results] == ["tank-jr", "mini-tank"]
+        assert index.similar("tank", type_name="dragon") == []
+
+    def test_cosine_metric(self, conn):
+        """Test that cosine distance compares stat shape, not magnitude"""
+        index = build_stat_index(conn)
+        results = index.similar("mini-tank", k=1, metric="cosine", type_name="water")
+        assert results[0]["name"] in {"tank", "tank-jr"}
+
+        with pytest.raises(ValueError):
+            index.similar("tank", metric="chebyshev")
+
+    def test_unknown_pokemon(self, conn):
+        """Test that unknown Pokémon return None"""
+        assert build_stat_index(conn).similar("missingno") is None
+
+    def test_cached_per_generation(self, tmp_path, conn):
+        """Test that the index is rebuilt only for a new generation"""
+        db_file = str(tmp_path / "test.db")
+        index = get_stat_index(db_file, "gen-a")
+        assert get_stat_index(db_file, "gen-a") is index
+        assert len(index) == 5
+
+    def test_missing_database(self, tmp_path):
+        """Test that a missing database yields an empty index without creating the file"""
+        path = tmp_path / "missing.db"
+
+        index = get_stat_index(str(path), "gen-missing")
+        assert len(index) == 0
+        assert index.similar("tank") is None
+        assert not path.exists()
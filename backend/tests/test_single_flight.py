@@ -0,0 +1,130 @@
+# tests/test_single_flight.py
+import asyncio
+import threading
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from app import app
+from routers.single_flight import SingleFlight, request_key
+
+
+def make_request(query_string: bytes) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/pokemon/filter_pokemons",
+        "query_string": query_string,
+        "headers": [],
+    })
+
+
+async def gather_with_release(calls, release: threading.Event):
+    async def releaser():
+        # Let every caller join the flight before the computation returns
+        await asyncio.sleep(0.05)
+        release.set()
+
+    results = await asyncio.gather(*calls, releaser(), return_exceptions=True)
+    return results[:-1]
+
+
+class TestSingleFlight:
+    """Test suite for coalescing concurrent identical computations"""
+
+    def test_coalesces_identical_calls(self):
+        """Test that concurrent callers with one key share one computation"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute(value):
+            calls.append(value)
+            release.wait(5)
+            return value * 2
+
+        async def run():
+            return await gather_with_release([flight.do("ep", "k", compute, 21) for _ in range(5)], release)
+
+        assert asyncio.run(run()) == [42] * 5
+        assert calls == [21]
+        assert flight.metrics() == {"ep": {"executed": 1, "coalesced": 4}}
+        assert flight.in_flight() == 0
+
+    def test_different_keys_run_separately(self):
+        """Test that only calls with the same endpoint and key are coalesced"""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute(value):
+            release.wait(5)
+            return value
+
+        async def run():
+            return await gather_with_release([
+                flight.do("ep", "a", compute, 1),
+                flight.do("ep", "b", compute, 2),
+                flight.do("other", "a", compute, 3),
+            ], release)
+
+        assert asyncio.run(run()) == [1, 2, 3]
+        assert flight.metrics() == {"ep": {"executed": 2, "coalesced": 0}, "other": {"executed": 1, "coalesced": 0}}
+
+    def test_exception_reaches_every_caller(self):
+        """Test that a failing computation raises in each coalesced caller"""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(5)
+            raise ValueError("boom")
+
+        async def run():
+            return await gather_with_release([flight.do("ep", "k", compute) for _ in range(3)], release)
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight() == 0
+
+    def test_key_released_after_completion(self):
+        """Test that results are not reused once the computation finished"""
+        flight = SingleFlight()
+        calls = []
+
+        async def run():
+            await flight.do("ep", "k", calls.append, 1)
+            await flight.do("ep", "k", calls.append, 2)
+
+        asyncio.run(run())
+        assert calls == [1, 2]
+        assert flight.metrics()["ep"] == {"executed": 2, "coalesced": 0}
+
+
+class TestRequestKey:
+    """Test suite for normalized coalescing keys"""
+
+    def test_parameter_order_ignored(self):
+        """Test that reordered query parameters give the same key"""
+        assert request_key(make_request(b"hp_min=50&type_name=fire"), "g") == \
+            request_key(make_request(b"type_name=fire&hp_min=50"), "g")
+
+    def test_generation_and_params_distinguish(self):
+        """Test that other parameters or another generation give another key"""
+        key = request_key(make_request(b"hp_min=50"), "g1")
+        assert key != request_key(make_request(b"hp_min=60"), "g1")
+        assert key != request_key(make_request(b"hp_min=50"), "g2")
+
+
+class TestSingleFlightMetricsEndpoint:
+    """Test suite for the coalescing metrics endpoint"""
+
+    def test_metrics_endpoint(self):
+        """Test that the endpoint reports counters and in-flight computations"""
+        response = TestClient(app).get("/metrics/single-flight")
+
+        assert response.status_code == 200
+        assert response.json()["in_flight"] == 0
+        assert isinstance(response.json()["endpoints"], dict)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,331 @@
+# tests/test_sketches.py
+import random
+import pytest
+from collections import Counter
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app import app
+from data_processing.load import create_connection, load_pokemons
+from data_processing.etl import run_etl_pipeline
+from data_processing.sketches import (
+    CountMinSketch,
+    HyperLogLog,
+    SpaceSaving,
+    approximate_distinct_counts,
+    approximate_frequency,
+    empty_sketches,
+    load_sketches,
+    rebuild_sketches,
+    save_sketches,
+    sketches_current,
+)
+from routers import pokemon_analysis
+
+POKEMON = (
+    (1, "bulbasaur", ["overgrow", "chlorophyll"], ["tackle", "growl", "vine-whip"]),
+    (4, "charmander", ["blaze", "solar-power"], ["scratch", "growl", "ember"]),
+    (7, "squirtle", ["torrent", "rain-dish"], ["tackle", "tail-whip", "bubble"]),
+    (25, "pikachu", ["static"], ["tackle", "growl", "thunder-shock"]),
+)
+
+
+@pytest.fixture
+def transformed(make_pokemon):
+    def build(pokemon_id, name, abilities, moves):
+        return make_pokemon(pokemon_id, name, abilities=abilities, moves=moves, stats={"hp": 50})
+
+    return build
+
+
+@pytest.fixture
+def load(transformed):
+    def add(conn, pokemon_id, name, abilities, moves, sketches=None):
+        return load_pokemons(conn, transformed(pokemon_id, name, abilities, moves), sketches)
+
+    return add
+
+
+@pytest.fixture
+def db_file(pokemon_db, load):
+    path = pokemon_db([])
+    conn = create_connection(path)
+    sketches = empty_sketches()
+    for row in POKEMON:
+        assert load(conn, *row, sketches=sketches)
+    assert save_sketches(conn, sketches)
+    conn.close()
+    return path
+
+
+class TestCountMinSketch:
+    """Test suite for the Count-Min sketch"""
+
+    def test_never_undercounts(self):
+        """Test that estimates are at least the true count and within the bound"""
+        rng = random.Random(1)
+        stream = [f"item-{int(rng.paretovariate(1.2))}" for _ in range(5000)]
+        sketch = CountMinSketch(width=256, depth=4)
+        for item in stream:
+            sketch.add(item)
+
+        counts = Counter(stream)
+        assert sketch.total == 5000
+        for item, count in counts.items():
+            assert count <= sketch.estimate(item) <= count + 3 * sketch.epsilon * sketch.total
+
+    def test_round_trip(self):
+        """Test that a serialized sketch estimates the same"""
+        sketch = CountMinSketch(width=64, depth=3)
+        sketch.add("tackle", 5)
+
+        restored = CountMinSketch.from_bytes(sketch.to_bytes())
+        assert restored.estimate("tackle") == 5
+        assert restored.width == 64 and restored.depth == 3
+
+
+class TestSpaceSaving:
+    """Test suite for the Space-Saving top-k summary"""
+
+    def test_exact_under_capacity(self):
+        """Test that counts are exact while every item fits"""
+        summary = SpaceSaving(capacity=10)
+        for item in "aaabbc":
+            summary.add(item)
+
+        assert summary.top(2) == [("a", 3, 0), ("b", 2, 0)]
+
+    def test_bounds_bracket_true_counts(self):
+        """Test that heavy hitters are kept and count - error <= true <= count"""
+        rng = random.Random(2)
+        stream = [f"item-{int(rng.paretovariate(1.0))}" for _ in range(5000)]
+        summary = SpaceSaving(capacity=20)
+        for item in stream:
+            summary.add(item)
+
+        counts = Counter(stream)
+        kept = {item: (count, error) for item, count, error in summary.top(20)}
+        for item, true_count in counts.items():
+            if true_count > summary.max_error:
+                assert item in kept
+        for item, (count, error) in kept.items():
+            assert count - error <= counts[item] <= count
+
+    def test_evicts_smallest_counter(self):
+        """Test that eviction always replaces the smallest counter, ties by name"""
+        rng = random.Random(3)
+        summary = SpaceSaving(capacity=8)
+        reference = {}
+        for _ in range(2000):
+            item = f"item-{int(rng.paretovariate(0.8))}"
+            summary.add(item)
+            if item in reference:
+                reference[item][0] += 1
+            elif len(reference) < 8:
+                reference[item] = [1, 0]
+            else:
+                evicted = min(reference, key=lambda key: (reference[key][0], key))
+                floor = reference.pop(evicted)[0]
+                reference[item] = [floor + 1, floor]
+
+        assert summary.counters == reference
+
+    def test_round_trip(self):
+        """Test that a serialized summary keeps its counters"""
+        summary = SpaceSaving(capacity=3)
+        for item in "abcd":
+            summary.add(item)
+
+        restored = SpaceSaving.from_bytes(summary.to_bytes())
+        assert restored.top(3) == summary.top(3)
+        assert restored.total == 4
+
+
+class TestHyperLogLog:
+    """Test suite for the HyperLogLog distinct counter"""
+
+    def test_estimate_within_error(self):
+        """Test that a large cardinality is estimated within three standard errors"""
+        counter = HyperLogLog(precision=10)
+        for i in range(20000):
+            counter.add(f"pokemon-{i}")
+
+        assert abs(counter.estimate() - 20000) <= 3 * counter.relative_error * 20000
+
+    def test_duplicates_ignored(self):
+        """Test that adding the same items again leaves the estimate unchanged"""
+        counter = HyperLogLog()
+        for _ in range(3):
+            for i in range(50):
+                counter.add(str(i))
+
+        assert counter.estimate() == 50
+
+    def test_round_trip(self):
+        """Test that a serialized counter estimates the same"""
+        counter = HyperLogLog(precision=8)
+        for i in range(100):
+            counter.add(str(i))
+
+        assert HyperLogLog.from_bytes(counter.to_bytes()).estimate() == counter.estimate()
+
+
+class TestLoaderSketches:
+    """Test suite for the sketches maintained by the loader"""
+
+    def test_frequencies_match_exact_counts(self, db_file):
+        """Test that small data is estimated exactly, with bounds"""
+        conn = create_connection(db_file)
+        try:
+            sketches = load_sketches(conn)
+        finally:
+            conn.close()
+
+        moves = approximate_frequency(sketches, "moves_frequency", 2)
+        assert moves["data"] == {"growl": 3, "tackle": 3}
+        assert moves["error_bounds"]["items"]["tackle"] == {"low": 3, "high": 3}
+        assert moves["distinct_items"]["estimate"] == 8
+        assert approximate_distinct_counts(sketches)["pokemon"]["estimate"] == 4
+        assert approximate_distinct_counts(sketches)["abilities"]["estimate"] == 7
+
+    def test_reload_not_counted_twice(self, db_file, load):
+        """Test that reloading a Pokémon only counts its new rows"""
+        conn = create_connection(db_file)
+        try:
+            sketches = load_sketches(conn)
+            load(conn, 1, "bulbasaur", ["overgrow", "chlorophyll"], ["tackle", "growl", "vine-whip", "growl"], sketches)
+            load(conn, 4, "charmander", ["blaze", "solar-power"], ["scratch", "growl", "ember", "tackle"], sketches)
+        finally:
+            conn.close()
+
+        assert approximate_frequency(sketches, "moves_frequency", 1)["data"] == {"tackle": 4}
+        assert approximate_distinct_counts(sketches)["pokemon"]["estimate"] == 4
+
+    def test_rolled_back_load_not_counted(self, db_file, transformed):
+        """Test that a load that fails and rolls back leaves the sketches alone"""
+        conn = create_connection(db_file)
+        try:
+            sketches = load_sketches(conn)
+            data = transformed(150, "mewtwo", ["pressure"], ["psychic"])
+            data["stats"] = [{"stat_name": "hp"}]
+
+            assert not load_pokemons(conn, data, sketches)
+        finally:
+            conn.close()
+
+        assert sketches["moves_frequency/count_min"].estimate("psychic") == 0
+        assert approximate_distinct_counts(sketches)["pokemon"]["estimate"] == 4
+
+    def test_rebuild_matches_loader(self, db_file):
+        """Test that rebuilding from the tables gives the loader's sketches"""
+        conn = create_connection(db_file)
+        try:
+            maintained = load_sketches(conn)
+            assert rebuild_sketches(conn)
+            rebuilt = load_sketches(conn)
+        finally:
+            conn.close()
+
+        for graph_name in ("moves_frequency", "abilities_frequency"):
+            assert approximate_frequency(rebuilt, graph_name, 10) == approximate_frequency(maintained, graph_name, 10)
+
+    def test_loader_writes_nothing(self, pokemon_conn, load):
+        """Test that the loader alone never stores sketches"""
+        conn = pokemon_conn([], "plain.db")
+        load(conn, *POKEMON[0], sketches=empty_sketches())
+        assert load_sketches(conn) is None
+        assert not sketches_current(conn)
+
+    def test_stale_after_load_without_sketches(self, db_file, load):
+        """Test that rows loaded while analytics were off make the sketches stale"""
+        conn = create_connection(db_file)
+        try:
+            assert sketches_current(conn)
+            load(conn, 1, "bulbasaur", ["overgrow", "chlorophyll"], ["tackle", "growl", "vine-whip", "cut"])
+            assert not sketches_current(conn)
+
+            assert rebuild_sketches(conn)
+            assert sketches_current(conn)
+        finally:
+            conn.close()
+
+
+class TestETLSketches:
+    """Test suite for the sketches kept by an ETL run"""
+
+    def run_etl(self, db_file, pokemon, transformed):
+        with patch("data_processing.etl.SKETCH_ANALYTICS", True), \
+                patch("data_processing.etl.SHARED_CACHE", False), \
+                patch("data_processing.etl.STATS_SNAPSHOT", False), \
+                patch("data_processing.etl.POKEMON_TO_FETCH", len(pokemon)), \
+                patch("data_processing.etl.sleep"), \
+                patch("data_processing.etl.extract_type_relations", return_value={}), \
+                patch("data_processing.etl.extract_resource_details", return_value={}), \
+                patch("data_processing.etl.extract_pokemons", side_effect=[{"name": row[1]} for row in pokemon]), \
+                patch("data_processing.etl.transform_pokemons", side_effect=[transformed(*row) for row in pokemon]):
+            return run_etl_pipeline(db_file)
+
+    def test_rebuilds_stale_and_saves_once(self, db_file, load, transformed):
+        """Test that stale sketches are rebuilt and the run's loads saved at the end"""
+        conn = create_connection(db_file)
+        load(conn, 133, "eevee", ["run-away"], ["tackle", "covet"])
+        conn.close()
+
+        with patch("data_processing.etl.save_sketches", wraps=save_sketches) as mock_save:
+            assert self.run_etl(db_file, [(150, "mewtwo", ["pressure"], ["psychic", "tackle"])], transformed)
+
+        mock_save.assert_called_once()
+        conn = create_connection(db_file)
+        try:
+            assert sketches_current(conn)
+            sketches = load_sketches(conn)
+        finally:
+            conn.close()
+        assert approximate_frequency(sketches, "moves_frequency", 1)["data"] == {"tackle": 5}
+        assert approximate_distinct_counts(sketches)["pokemon"]["estimate"] == 6
+
+
+class TestApproximateAnalysisRouter:
+    """Test suite for approx=true analysis requests"""
+
+    @pytest.fixture
+    def client(self):
+        pokemon_analysis._scoped_body_cache.clear()
+        yield TestClient(app)
+        pokemon_analysis._scoped_body_cache.clear()
+
+    def test_graph(self, client, db_file):
+        """Test that a frequency graph is estimated with error bounds"""
+        with patch("routers.pokemon_analysis.DATABASE_FILE", db_file):
+            response = client.get("/pokemon/analysis/moves_frequency?approx=true&top_n=2")
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["approximate"] is True
+        assert body["data"] == {"growl": 3, "tackle": 3}
+        assert set(body["error_bounds"]) == {"items", "count_min", "space_saving"}
+
+    def test_overview(self, client, db_file):
+        """Test that the overview returns the sketched graphs and distinct counts"""
+        with patch("routers.pokemon_analysis.DATABASE_FILE", db_file):
+            body = client.get("/pokemon/analysis?approx=true").json()
+
+        assert set(body["data"]) == {"moves_frequency", "abilities_frequency"}
+        assert body["distinct_counts"]["pokemon"]["estimate"] == 4
+
+    def test_without_sketches(self, client, pokemon_db):
+        """Test that a database without sketches answers 404"""
+        path = pokemon_db([], "plain.db")
+
+        with patch("routers.pokemon_analysis.DATABASE_FILE", path):
+            response = client.get("/pokemon/analysis/abilities_frequency?approx=true")
+
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize("query", ["type_distribution?approx=true", "moves_frequency?approx=true&type_name=fire"])
+    def test_unsupported(self, client, query):
+        """Test that approx is refused where no sketch applies"""
+        assert client.get(f"/pokemon/analysis/{query}").status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
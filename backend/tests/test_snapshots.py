@@ -0,0 +1,122 @@
+# tests/test_snapshots.py
+import pytest
+import json
+from data_processing.load import load_pokemons
+from data_processing.analysis import generate_all_analysis
+from data_processing.snapshots import (
+    start_etl_run,
+    finish_etl_run,
+    materialize_analysis_snapshot,
+    load_analysis_snapshot,
+    render_analysis_snapshot,
+    render_graph_snapshot,
+)
+
+
+@pytest.fixture
+def loaded_conn(pokemon_conn, make_pokemon):
+    """Database with two loaded Pokémon"""
+    return pokemon_conn([
+        make_pokemon(
+            pokemon_id, name, types,
+            abilities=["overgrow"],
+            moves=["tackle", "growl"],
+            stats={"hp": 45, "attack": 49},
+        )
+        for pokemon_id, name, types in [(1, "bulbasaur", ["grass", "poison"]), (4, "charmander", ["fire"])]
+    ])
+
+
+class TestETLRuns:
+    """Test suite for ETL run bookkeeping"""
+
+    def test_start_and_finish_run(self, loaded_conn):
+        """Test that runs get increasing ids and record their outcome"""
+        first = start_etl_run(loaded_conn)
+        second = start_etl_run(loaded_conn)
+        assert second > first
+
+        assert finish_etl_run(loaded_conn, second, 5, 1) is True
+        row = loaded_conn.execute(
+            "SELECT success_count, failure_count, finished_at FROM etl_runs WHERE id = ?", (second,)
+        ).fetchone()
+        assert row[0] == 5
+        assert row[1] == 1
+        assert row[2] is not None
+
+    def test_none_connection(self):
+        """Test that None connection is handled"""
+        assert start_etl_run(None) is None
+        assert finish_etl_run(None, 1, 0, 0) is False
+        assert materialize_analysis_snapshot(None, 1) is False
+        assert load_analysis_snapshot(None) == {}
+
+
+class TestAnalysisSnapshots:
+    """Test suite for materialized analysis snapshots"""
+
+    def test_no_snapshot(self, loaded_conn):
+        """Test that an empty snapshot table yields no snapshot"""
+        assert load_analysis_snapshot(loaded_conn) == {}
+
+    def test_snapshot_matches_live_analysis(self, loaded_conn):
+        """Test that the rendered snapshot equals the live computation"""
+        run_id = start_etl_run(loaded_conn)
+        assert materialize_analysis_snapshot(loaded_conn, run_id) is True
+
+        snapshot = load_analysis_snapshot(loaded_conn)
+        body = json.loads(render_analysis_snapshot(snapshot))
+
+        assert body["status"] == "success"
+        assert body["data"] == generate_all_analysis(loaded_conn)
+
+    def test_cooccurrence_graphs_are_stored(self, loaded_conn):
+        """Test that the co-occurrence graphs are materialized with the run"""
+        materialize_analysis_snapshot(loaded_conn, start_etl_run(loaded_conn))
+
+        snapshot = load_analysis_snapshot(loaded_conn)
+        pairs = json.loads(snapshot["move_cooccurrence"]["payload"])["pairs"]
+        assert pairs[0]["items"] == ["growl", "tackle"]
+        assert pairs[0]["count"] == 2
+
+    def test_latest_run_is_served(self, loaded_conn, make_pokemon):
+        """Test that the newest run's snapshot wins"""
+        materialize_analysis_snapshot(loaded_conn, start_etl_run(loaded_conn))
+
+        load_pokemons(loaded_conn, make_pokemon(7, "squirtle", ["water"]))
+        materialize_analysis_snapshot(loaded_conn, start_etl_run(loaded_conn))
+
+        snapshot = load_analysis_snapshot(loaded_conn)
+        assert "water" in json.loads(snapshot["type_distribution"]["payload"])
+
+    def test_snapshot_of_earlier_run_is_ignored(self, loaded_conn, make_pokemon):
+        """Test that a run which loaded data but wrote no snapshot is not served the old one"""
+        run_id = start_etl_run(loaded_conn)
+        finish_etl_run(loaded_conn, run_id, 2, 0)
+        materialize_analysis_snapshot(loaded_conn, run_id)
+
+        start_etl_run(loaded_conn)
+        load_pokemons(loaded_conn, make_pokemon(7, "squirtle", ["water"]))
+
+        assert load_analysis_snapshot(loaded_conn) == {}
+
+    def test_partial_snapshot_is_ignored(self, loaded_conn):
+        """Test that a snapshot missing graphs is not served"""
+        run_id = start_etl_run(loaded_conn)
+        materialize_analysis_snapshot(loaded_conn, run_id)
+        loaded_conn.execute(
+            "DELETE FROM analysis_snapshots WHERE graph_name = 'moves_frequency'"
+        )
+
+        assert load_analysis_snapshot(loaded_conn) == {}
+
+    def test_render_graph_snapshot(self, loaded_conn):
+        """Test rendering a single graph from the snapshot"""
+        materialize_analysis_snapshot(loaded_conn, start_etl_run(loaded_conn))
+        snapshot = load_analysis_snapshot(loaded_conn)
+
+        body = json.loads(render_graph_snapshot("moves_frequency", snapshot["moves_frequency"]))
+
+        assert body["graph_name"] == "moves_frequency"
+        assert body["chart_type"] == "bar"
+        assert body["data"] == {"tackle": 2, "growl": 2}
@@ -0,0 +1,172 @@
+# tests/test_stale_while_revalidate.py
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app import app
+from data_processing.cache import StaleWhileRevalidateCache, get_dataset_generation
+from data_processing.load import create_connection
+from data_processing.snapshots import start_etl_run, materialize_analysis_snapshot
+from routers import pokemon_analysis
+from routers.pokemon_analysis import VALID_GRAPHS, warm_analysis_cache
+
+
+@pytest.fixture
+def run_etl(pokemon_db, make_pokemon):
+    def run(db_file, pokemon):
+        pokemon_db([
+            make_pokemon(
+                pokemon_id, name, ["grass"], abilities=["overgrow"], moves=["tackle"], stats={"hp": hp, "speed": 45}
+            )
+            for pokemon_id, name, hp in pokemon
+        ], db_file)
+        conn = create_connection(db_file)
+        materialize_analysis_snapshot(conn, start_etl_run(conn))
+        conn.close()
+
+    return run
+
+
+@pytest.fixture
+def db_file(run_etl, tmp_path):
+    path = str(tmp_path / "test.db")
+    run_etl(path, [(1, "bulbasaur", 45)])
+    pokemon_analysis._snapshot_body_cache.clear()
+    with patch("routers.pokemon_analysis.DATABASE_FILE", path):
+        yield path
+    pokemon_analysis._snapshot_body_cache.clear()
+
+
+class TestStaleWhileRevalidateCache:
+    """Test suite for serving superseded cache entries"""
+
+    def test_fresh_entry_is_not_stale(self):
+        """Test that an entry of the current generation is no stale hit"""
+        cache = StaleWhileRevalidateCache(60)
+        cache.set("k", "gen-1", "v1")
+
+        assert cache.get("k", "gen-1") == "v1"
+        assert cache.get_stale("k", "gen-1") is None
+
+    def test_superseded_entry_served_stale(self):
+        """Test that the previous generation's value is served stale"""
+        cache = StaleWhileRevalidateCache(60)
+        cache.set("k", "gen-1", "v1")
+
+        assert cache.get("k", "gen-2") is None
+        assert cache.get_stale("k", "gen-2") == "v1"
+        assert cache.get_stale("missing", "gen-2") is None
+
+    def test_staleness_cap(self):
+        """Test that a stale entry expires max_stale seconds after it was superseded"""
+        cache = StaleWhileRevalidateCache(60)
+        cache.set("k", "gen-1", "v1")
+
+        with patch("data_processing.cache.monotonic", return_value=1000.0):
+            assert cache.get_stale("k", "gen-2") == "v1"
+        with patch("data_processing.cache.monotonic", return_value=1059.0):
+            assert cache.get_stale("k", "gen-2") == "v1"
+        with patch("data_processing.cache.monotonic", return_value=1061.0):
+            assert cache.get_stale("k", "gen-2") is None
+
+    def test_staleness_counts_from_supersession(self):
+        """Test that the cap runs from when a newer generation was first seen, not from the first stale lookup"""
+        cache = StaleWhileRevalidateCache(60)
+        cache.set("a", "gen-1", "a1")
+        cache.set("b", "gen-1", "b1")
+
+        # Another key is refreshed for the new generation; b is not asked for until later
+        with patch("data_processing.cache.monotonic", return_value=1000.0):
+            assert cache.get("a", "gen-2") is None
+            cache.set("a", "gen-2", "a2")
+        with patch("data_processing.cache.monotonic", return_value=1061.0):
+            assert cache.get_stale("b", "gen-2") is None
+
+    def test_set_resets_staleness(self):
+        """Test that storing a fresh value restarts the staleness clock"""
+        cache = StaleWhileRevalidateCache(60)
+        cache.set("k", "gen-1", "v1")
+        with patch("data_processing.cache.monotonic", return_value=1000.0):
+            cache.get_stale("k", "gen-2")
+        cache.set("k", "gen-2", "v2")
+
+        with patch("data_processing.cache.monotonic", return_value=2000.0):
+            assert cache.get_stale("k", "gen-3") == "v2"
+
+    def test_disabled(self):
+        """Test that max_stale=0 never serves stale values"""
+        cache = StaleWhileRevalidateCache(0)
+        cache.set("k", "gen-1", "v1")
+
+        assert cache.get_stale("k", "gen-2") is None
+
+
+class TestAnalysisStaleWhileRevalidate:
+    """Test suite for stale-while-revalidate on the analysis endpoints"""
+
+    def test_serves_previous_snapshot_then_refreshes(self, db_file, run_etl):
+        """Test that after an ETL run the old body is served while the new one renders"""
+        with TestClient(app) as client:
+            first = client.get("/pokemon/analysis")
+            assert first.status_code == 200
+            assert "etag" in first.headers
+
+            run_etl(db_file, [(2, "ivysaur", 60)])
+
+            stale = client.get("/pokemon/analysis")
+            assert stale.status_code == 200
+            assert stale.content == first.content
+            assert "etag" not in stale.headers
+            assert stale.headers["warning"].startswith("110")
+
+            # The background render lands shortly; later requests get it fresh
+            deadline = time.monotonic() + 5
+            while True:
+                fresh = client.get("/pokemon/analysis")
+                if "etag" in fresh.headers or time.monotonic() > deadline:
+                    break
+                time.sleep(0.01)
+
+        assert "etag" in fresh.headers
+        assert fresh.content != first.content
+
+    def test_past_cap_waits_for_fresh_body(self, db_file, run_etl):
+        """Test that a body stale for longer than the cap is not served"""
+        with TestClient(app) as client:
+            first = client.get("/pokemon/analysis/type_distribution")
+            run_etl(db_file, [(2, "ivysaur", 60)])
+
+            with patch.object(pokemon_analysis._snapshot_body_cache, "max_stale", 0):
+                response = client.get("/pokemon/analysis/type_distribution")
+
+        assert "etag" in response.headers
+        assert response.content != first.content
+
+
+class TestWarmAnalysisCache:
+    """Test suite for warming every analysis graph after an ETL run"""
+
+    def test_warms_every_graph(self, db_file):
+        """Test that the overview and every snapshot graph body are cached for the current generation"""
+        asyncio.run(warm_analysis_cache())
+
+        generation = get_dataset_generation(db_file)
+        cache = pokemon_analysis._snapshot_body_cache
+        assert cache.get("/pokemon/analysis", generation) is not None
+        # stat_clusters is read live from its own table on every request
+        for graph_name in set(VALID_GRAPHS) - {"stat_clusters"}:
+            assert cache.get(f"/pokemon/analysis/{graph_name}", generation) is not None, graph_name
+
+    def test_failures_do_not_raise(self, tmp_path):
+        """Test that warming a missing database only logs"""
+        try:
+            with patch("routers.pokemon_analysis.DATABASE_FILE", str(tmp_path / "missing" / "x.db")):
+                asyncio.run(warm_analysis_cache())
+        finally:
+            # Bodies rendered for the missing file must not leak into other tests
+            pokemon_analysis._snapshot_body_cache.clear()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,132 @@
+# tests/test_stats_snapshot.py
+import json
+import os
+import numpy as np
+import pytest
+from data_processing.load import create_connection
+from data_processing.stats_snapshot import (
+    FLAG_EVOLVED,
+    SNAPSHOT_DTYPE,
+    STATS_SNAPSHOT_SCHEMA_VERSION,
+    load_stats_snapshot,
+    move_stats_snapshot,
+    snapshot_paths,
+    write_stats_snapshot,
+)
+
+
+@pytest.fixture
+def db_file(pokemon_db, make_pokemon):
+    return pokemon_db([
+        make_pokemon(
+            pokemon_id, name, types, abilities=["overgrow"], moves=["tackle"], stats=stats, is_evolved=is_evolved
+        )
+        for pokemon_id, name, types, stats, is_evolved in [
+            (1, "bulbasaur", ["grass", "poison"],
+             {"hp": 45, "attack": 49, "defense": 49, "special-attack": 65, "special-defense": 65, "speed": 45}, False),
+            (2, "ivysaur", ["grass", "poison"], {"hp": 60, "speed": 60}, True),
+            (25, "pikachu", ["electric"], {"hp": 35}, False),
+            (29, "nidoran♀", ["poison"], {"hp": 55}, False),
+        ]
+    ])
+
+
+def write_snapshot(db_file):
+    conn = create_connection(db_file)
+    try:
+        assert write_stats_snapshot(conn, db_file)
+    finally:
+        conn.close()
+
+
+class TestWriteStatsSnapshot:
+    """Test suite for writing the binary stats snapshot"""
+
+    def test_plain_npy_loadable_with_mmap(self, db_file):
+        """Test that the records file is a plain .npy numpy can memory-map"""
+        write_snapshot(db_file)
+        records_path, _, _ = snapshot_paths(db_file)
+
+        records = np.load(records_path, mmap_mode="r")
+        assert isinstance(records, np.memmap)
+        assert records.dtype == SNAPSHOT_DTYPE
+        assert records["id"].tolist() == [1, 2, 25, 29]
+
+    def test_manifest(self, db_file):
+        """Test that the manifest carries the schema version and checksums"""
+        write_snapshot(db_file)
+        _, _, manifest_path = snapshot_paths(db_file)
+
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        assert manifest["schema_version"] == STATS_SNAPSHOT_SCHEMA_VERSION
+        assert manifest["count"] == 4
+        assert manifest["types"] == ["electric", "grass", "poison"]
+        assert set(manifest["sha256"]) == {"records", "names"}
+        assert all(len(digest) == 64 for digest in manifest["sha256"].values())
+
+    def test_no_connection(self, tmp_path):
+        """Test that nothing is written without a connection"""
+        db_file = str(tmp_path / "none.db")
+        assert not write_stats_snapshot(None, db_file)
+        assert not any(os.path.exists(path) for path in snapshot_paths(db_file))
+
+
+class TestLoadStatsSnapshot:
+    """Test suite for loading the binary stats snapshot"""
+
+    def test_round_trip(self, db_file):
+        """Test that stats, types, flags and names read back"""
+        write_snapshot(db_file)
+        snapshot = load_stats_snapshot(db_file)
+
+        assert len(snapshot) == 4
+        assert snapshot.names() == ["bulbasaur", "ivysaur", "pikachu", "nidoran♀"]
+        assert snapshot.stats_matrix()[0].tolist() == [45, 49, 49, 65, 65, 45]
+        # Stats that were not loaded are -1
+        assert snapshot.stats_matrix()[1].tolist() == [60, -1, -1, -1, -1, 60]
+
+        records = snapshot.records
+        assert [snapshot.types[i] for i in (records["type1"][0], records["type2"][0])] == ["grass", "poison"]
+        assert records["type2"][2] == -1
+        assert records["flags"].tolist() == [0, FLAG_EVOLVED, 0, 0]
+
+    def test_missing(self, tmp_path):
+        """Test that a database without a snapshot loads None"""
+        assert load_stats_snapshot(str(tmp_path / "absent.db")) is None
+
+    def test_checksum_mismatch(self, db_file):
+        """Test that a modified records file fails verification"""
+        write_snapshot(db_file)
+        records_path, _, _ = snapshot_paths(db_file)
+        with open(records_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+
+        assert load_stats_snapshot(db_file) is None
+        assert load_stats_snapshot(db_file, verify=False) is not None
+
+    def test_schema_version_mismatch(self, db_file):
+        """Test that a snapshot of another schema version is refused"""
+        write_snapshot(db_file)
+        _, _, manifest_path = snapshot_paths(db_file)
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["schema_version"] = STATS_SNAPSHOT_SCHEMA_VERSION + 1
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        assert load_stats_snapshot(db_file, verify=False) is None
+
+    def test_move(self, db_file, tmp_path):
+        """Test that a snapshot moved to another database path still loads"""
+        write_snapshot(db_file)
+        target = str(tmp_path / "live.db")
+
+        assert move_stats_snapshot(db_file, target)
+        assert load_stats_snapshot(db_file) is None
+        assert load_stats_snapshot(target).names()[0] == "bulbasaur"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,6 +1,11 @@
 # tests/test_transform.py
 import pytest
-from data_processing.transform import transform_pokemons
+from data_processing.transform import (
+    transform_pokemons,
+    transform_type_relations,
+    transform_move_details,
+    transform_ability_details,
+)
 
 
 class TestTransformPokemons:
@@ -314,5 +319,65 @@ class TestTransformPokemons:
         assert result is not None  # This should succeed
 
 
+class TestTransformTypeRelations:
+    """Test suite for transform_type_relations function"""
+
+    def test_multipliers(self):
+        """Test that damage relations become multiplier rows"""
+        rows = transform_type_relations({
+            "electric": {
+                "double_damage_to": ["water"],
+                "half_damage_to": ["grass"],
+                "no_damage_to": ["ground"],
+            }
+        })
+
+        assert sorted(rows) == [
+            ("electric", "grass", 0.5),
+            ("electric", "ground", 0.0),
+            ("electric", "water", 2.0),
+        ]
+
+    def test_invalid_input(self):
+        """Test that invalid input returns None"""
+        assert transform_type_relations(None) is None
+        assert transform_type_relations({"fire": None}) == []
+
+
+class TestTransformResourceDetails:
+    """Test suite for transform_move_details and transform_ability_details"""
+
+    def test_move_details(self):
+        """Test that a move resource maps onto the moves columns"""
+        row = transform_move_details({
+            "name": "growl", "power": None, "accuracy": 100, "pp": 40,
+            "type": {"name": "normal", "url": "..."},
+            "damage_class": {"name": "status", "url": "..."},
+        })
+
+        assert row == {
+            "name": "growl", "power": None, "accuracy": 100, "pp": 40,
+            "type_name": "normal", "damage_class": "status",
+        }
+
+    def test_ability_details(self):
+        """Test that the English short effect is kept"""
+        row = transform_ability_details({
+            "name": "overgrow",
+            "generation": {"name": "generation-iii"},
+            "effect_entries": [
+                {"short_effect": "Stärkt Pflanzen-Attacken.", "language": {"name": "de"}},
+                {"short_effect": "Strengthens grass moves.", "language": {"name": "en"}},
+            ],
+        })
+
+        assert row == {"name": "overgrow", "short_effect": "Strengthens grass moves.", "generation": "generation-iii"}
+
+    def test_invalid_input(self):
+        """Test that invalid input returns None"""
+        assert transform_move_details(None) is None
+        assert transform_ability_details({"effect_entries": []}) is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
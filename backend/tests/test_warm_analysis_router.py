@@ -0,0 +1,28 @@
+# tests/test_warm_analysis_router.py
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app import app
+
+client = TestClient(app)
+
+
+class TestWarmAnalysisRouter:
+    """Test suite for warming the analysis cache after an ETL run"""
+
+    @patch('routers.etl_pipeline.warm_analysis_cache')
+    @patch('routers.etl_pipeline.run_etl_pipeline')
+    def test_run_pipeline_warms_analysis(self, mock_run_etl, mock_warm):
+        """Test that analysis graphs are warmed in the background unless disabled"""
+        mock_run_etl.return_value = True
+
+        client.post("/pokemon/etl/run-pipeline?warm_analysis=true")
+        mock_warm.assert_called_once()
+
+        mock_warm.reset_mock()
+        client.post("/pokemon/etl/run-pipeline?warm_analysis=false")
+        mock_warm.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])